@@ -0,0 +1,120 @@
+"""
+관리용 명령줄 도구입니다.
+
+사용 예:
+    python -m app.cli gc --max-age-days 14 --max-mb 500
+    python -m app.cli build-snapshot
+    python -m app.cli prefetch B10 C10
+    python -m app.cli pregen --concurrency 8 --processes 4
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+def _run_gc(args: argparse.Namespace):
+    from app.services.cache_gc import cache_gc
+
+    if args.max_age_days is not None:
+        cache_gc.max_age_days = args.max_age_days
+    if args.max_mb is not None:
+        cache_gc.max_total_mb = args.max_mb
+    report = cache_gc.collect(dry_run=args.dry_run)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+def _run_build_snapshot(args: argparse.Namespace):
+    from app.services.school_search import DATA_FILE_PATH, SNAPSHOT_FILE_PATH, SchoolSearchService, school_search_service
+    from app.services.school_snapshot import write_snapshot
+
+    csv_path = Path(args.csv) if args.csv else DATA_FILE_PATH
+    output = Path(args.output) if args.output else SNAPSHOT_FILE_PATH
+    backend = args.backend or school_search_service.backend
+    # 스냅샷 없이 CSV에서 색인을 새로 만듭니다.
+    service = SchoolSearchService(csv_path, backend=backend)
+    if len(service.index) == 0:
+        raise SystemExit(f"학교 정보를 읽지 못했습니다: {csv_path}")
+    write_snapshot(service.index, output, csv_path, backend)
+    print(json.dumps({"snapshot": str(output), "schools": len(service.index), "bytes": output.stat().st_size}, ensure_ascii=False, indent=2))
+
+def _run_prefetch(args: argparse.Namespace):
+    from app.controllers.school_controller import prefetch_region
+    from app.services import neis
+    from app.services.school_search import school_search_service
+
+    regions = args.regions or sorted(code for code in school_search_service.index.regions if code)
+
+    async def prefetch_all() -> list[dict]:
+        reports = []
+        try:
+            # NEIS 호출량을 늘리지 않도록 지역은 하나씩 처리합니다.
+            for region in regions:
+                reports.append(await prefetch_region(region))
+        finally:
+            await neis.close_client()
+        return reports
+
+    print(json.dumps(asyncio.run(prefetch_all()), ensure_ascii=False, indent=2))
+
+def _run_pregen(args: argparse.Namespace):
+    from app.controllers.school_controller import load_schedule_dump, pregenerate_calendars
+    from app.services import neis
+    from app.services.cache_service import cache_service
+    from app.services.school_search import school_search_service
+
+    if args.cache_dir:
+        cache_service.base_dir = Path(args.cache_dir)
+    # 한 번씩만 쓰는 캘린더로 메모리 계층을 채우지 않습니다.
+    cache_service.memory = None
+    dump = load_schedule_dump(Path(args.dump)) if args.dump else None
+    schools = school_search_service.iter_schools(args.regions or None)
+
+    async def pregen_all() -> dict:
+        try:
+            return await pregenerate_calendars(
+                schools, concurrency=args.concurrency, processes=args.processes, dump=dump, force=args.force
+            )
+        finally:
+            await neis.close_client()
+
+    report = asyncio.run(pregen_all())
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if report["failed"]:
+        raise SystemExit(1)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="나이스 학사일정 ICS 변환기 관리 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gc_parser = subparsers.add_parser("gc", help="오래되었거나 용량 예산을 넘는 캐시 파일을 삭제합니다.")
+    gc_parser.add_argument("--max-age-days", type=float, help="이 기간(일)보다 오래된 캐시를 삭제합니다. (기본값: cache_day + max_stale_day)")
+    gc_parser.add_argument("--max-mb", type=float, help="캐시 전체 크기 예산(MB). 넘으면 오래된 항목부터 삭제합니다.")
+    gc_parser.add_argument("--dry-run", action="store_true", help="실제로 삭제하지 않고 결과만 보고합니다.")
+    gc_parser.set_defaults(func=_run_gc)
+
+    snapshot_parser = subparsers.add_parser("build-snapshot", help="학교 정보 CSV로 빠른 시작용 검색 색인 스냅샷을 만듭니다.")
+    snapshot_parser.add_argument("--csv", help="원본 학교 정보 CSV 경로 (기본값: data/ 아래의 학교기본정보 CSV)")
+    snapshot_parser.add_argument("--output", help="스냅샷 파일 경로 (기본값: CSV와 같은 위치의 .snapshot 파일)")
+    snapshot_parser.add_argument("--backend", choices=["pandas", "compact"], help="레코드 저장 방식 (기본값: 설정의 school_backend)")
+    snapshot_parser.set_defaults(func=_run_build_snapshot)
+
+    prefetch_parser = subparsers.add_parser("prefetch", help="시도교육청 단위로 학사일정을 한 번에 받아 지역 내 모든 학교의 캐시를 채웁니다.")
+    prefetch_parser.add_argument("regions", nargs="*", help="시도교육청코드 (예: B10). 생략하면 모든 지역")
+    prefetch_parser.set_defaults(func=_run_prefetch)
+
+    pregen_parser = subparsers.add_parser("pregen", help="모든 학교의 캘린더를 미리 만들어 캐시 디렉토리에 씁니다. (정적 파일 배포용)")
+    pregen_parser.add_argument("regions", nargs="*", help="시도교육청코드 (예: B10). 생략하면 모든 지역")
+    pregen_parser.add_argument("--concurrency", type=int, default=8, help="동시에 처리하는 최대 학교 수 (NEIS 동시 요청 수)")
+    pregen_parser.add_argument("--processes", type=int, help="ICS 변환에 사용할 프로세스 수 (기본값: CPU 수)")
+    pregen_parser.add_argument("--dump", help="NEIS 대신 사용할 로컬 학사일정 파일 (한 줄에 행 하나 또는 SchoolSchedule 응답 하나인 NDJSON)")
+    pregen_parser.add_argument("--cache-dir", help="캘린더를 쓸 캐시 디렉토리 (기본값: cache/)")
+    pregen_parser.add_argument("--force", action="store_true", help="유효한 캐시가 있는 학교도 다시 만듭니다. (기본값: 건너뛰고 이어서 진행)")
+    pregen_parser.set_defaults(func=_run_pregen)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.services.school_search import school_search_service
+
+def verify_admin_token(token: Optional[str]):
+    """
+    관리용 토큰을 확인합니다.
+    설정에 admin_token이 없으면 관리 엔드포인트를 사용하지 않는 것으로 보고 404를 반환합니다.
+    """
+    expected = settings.get('admin_token')
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not secrets.compare_digest(token.encode("utf-8"), str(expected).encode("utf-8")):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+
+async def reload_school_data(token: Optional[str]) -> JSONResponse:
+    """
+    학교 정보 데이터를 다시 불러옵니다.
+    새 색인은 별도 스레드에서 만들고 완성된 뒤 교체하므로, 그동안의 검색 요청은 이전 데이터로 처리됩니다.
+    (이 요청을 받은 워커만 다시 불러옵니다. 여러 워커는 school_watch_interval로 파일 감시를 사용하세요.)
+    """
+    verify_admin_token(token)
+    try:
+        version = await asyncio.to_thread(school_search_service.reload)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return JSONResponse(content=version)
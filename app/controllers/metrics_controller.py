@@ -0,0 +1,27 @@
+from fastapi.responses import JSONResponse
+
+from app.services.single_flight import calendar_single_flight
+from app.services.refresh_worker import refresh_worker
+from app.services.cache_service import cache_service
+from app.services.cache_gc import cache_gc
+from app.services.cache_warmer import cache_warmer
+from app.services.school_search import school_search_service
+from app.services.school_reloader import school_data_watcher
+from app.services.neis_guard import neis_circuit_breaker, neis_rate_limiter, neis_retry_policy
+
+async def get_metrics() -> JSONResponse:
+    """
+    서버 내부 상태(요청 병합 카운터 등)를 JSON으로 반환합니다.
+    """
+    return JSONResponse(content={
+        "calendar_single_flight": calendar_single_flight.stats(),
+        "refresh_worker": refresh_worker.stats(),
+        "memory_cache": cache_service.memory.stats() if cache_service.memory else None,
+        "cache_gc": cache_gc.stats(),
+        "cache_warmer": cache_warmer.stats(),
+        "school_data": school_search_service.version,
+        "school_data_watcher": school_data_watcher.stats(),
+        "neis_rate_limiter": neis_rate_limiter.stats(),
+        "neis_retry": neis_retry_policy.stats(),
+        "neis_circuit_breaker": neis_circuit_breaker.stats(),
+    })
@@ -1,11 +1,29 @@
-from fastapi import HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Union
 
-from app.models.school import SchoolSearch
-from app.services.neis import get_school_schedule
-from app.services.ics_converter import convert_to_ics
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+
+from app.core.config import settings
+from app.models.school import ScheduleBatch, SchoolSearch
+from app.services.neis import get_school_schedule, iter_region_schedule_pages
+from app.services.ics_converter import (
+    CalendarVariant, ScheduleRows, SchoolEvents, _collect_rows, convert_to_ics, iter_merged_ics_lines, schedule_events,
+)
+from app.services.event_store import StoredSchedule
+from app.services.school_index import normalize_school_code
 from app.services.school_search import school_search_service
-from app.services.cache_service import cache_service
+from app.services.cache_service import cache_service, check_cache_key, compress_bodies
+from app.services.single_flight import calendar_single_flight
+from app.services.refresh_worker import refresh_worker
+from app.services.cache_warmer import cache_warmer
+from app.utils.http_utils import choose_encoding, format_http_date, is_not_modified
 
 async def search_school(school_search: SchoolSearch) -> JSONResponse:
     """
@@ -13,15 +31,88 @@ async def search_school(school_search: SchoolSearch) -> JSONResponse:
     """
     result = school_search_service.search(
         atpt_ofcdc_sc_code=school_search.ATPT_OFCDC_SC_CODE,
-        schul_nm=school_search.SCHUL_NM
+        schul_nm=school_search.SCHUL_NM,
+        match_mode=school_search.MATCH_MODE,
     )
     return JSONResponse(content=result)
 
+async def autocomplete_school(atpt_ofcdc_sc_code: str, query: str, limit: int, cursor: Optional[str],
+                              match_mode: str = "contains") -> JSONResponse:
+    """
+    학교명 자동완성 결과를 반환합니다.
+    cursor는 이전 응답의 next_cursor 값이며, 마지막 페이지이면 next_cursor가 null입니다.
+    """
+    offset = 0
+    if cursor:
+        if not cursor.isdigit():
+            raise HTTPException(status_code=400, detail="cursor 값이 올바르지 않습니다.")
+        offset = int(cursor)
+
+    items, next_offset = school_search_service.autocomplete(
+        atpt_ofcdc_sc_code, query, limit=limit, offset=offset, match_mode=match_mode
+    )
+    return JSONResponse(content={
+        "items": items,
+        "next_cursor": str(next_offset) if next_offset is not None else None,
+    })
+
+def _calendar_response(request: Optional[Request], atpt_ofcdc_sc_code: str, sd_schul_code: int, file_path: Path) -> Response:
+    """
+    캐시된 ICS 파일을 응답으로 만듭니다.
+    인덱스의 메타데이터로 ETag, Last-Modified, Cache-Control 헤더를 설정하고,
+    클라이언트가 가진 버전이 최신이면 본문 없이 304 Not Modified를 반환합니다.
+    Accept-Encoding에 맞는 미리 압축된 변형이 있으면 그 파일을 그대로 보냅니다.
+    """
+    entry = cache_service.get_entry(atpt_ofcdc_sc_code, sd_schul_code)
+    if entry is None:
+        return FileResponse(file_path, media_type='text/calendar', filename='school_schedule.ics')
+
+    # 압축 변형을 고릅니다. 요청 시점에 압축하지 않고 set() 때 만들어 둔 파일을 사용합니다.
+    encoding, body_path = None, file_path
+    if request is not None:
+        encoding = choose_encoding(request.headers.get("accept-encoding"), cache_service.encodings)
+        encoded_path = cache_service.get_encoded_path(atpt_ofcdc_sc_code, sd_schul_code, encoding) if encoding else None
+        if encoded_path is None:
+            encoding = None
+        else:
+            body_path = encoded_path
 
-async def get_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> FileResponse:
+    # 표현(representation)마다 바이트가 다르므로 강한 ETag도 인코딩별로 구분합니다.
+    etag = f'"{entry.sha256[:32]}-{encoding}"' if encoding else f'"{entry.sha256[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={cache_service.max_age(entry)}",
+        "Vary": "Accept-Encoding",
+    }
+    if entry.created_time is not None:
+        headers["Last-Modified"] = format_http_date(entry.created_time)
+
+    if request is not None and is_not_modified(request.headers, etag, entry.created_time):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    # 메모리 계층이 켜져 있으면 자주 요청되는 캘린더를 파일 시스템을 거치지 않고 바로 보냅니다.
+    if cache_service.memory is not None:
+        body = cache_service.read_bytes(atpt_ofcdc_sc_code, sd_schul_code, entry, encoding)
+        if body is not None:
+            headers["Content-Disposition"] = 'attachment; filename="school_schedule.ics"'
+            return Response(content=body, media_type='text/calendar', headers=headers)
+    return FileResponse(body_path, media_type='text/calendar', filename='school_schedule.ics', headers=headers)
+
+
+def variant_cache_code(sd_schul_code: Union[int, str], variant: CalendarVariant) -> Union[int, str]:
+    """변형 캘린더의 캐시 키(학교 코드 자리)를 만듭니다. 기본 캘린더는 학교 코드 그대로입니다. (예: "7010057.noholiday")"""
+    return f"{sd_schul_code}.{variant.key}" if variant.key else sd_schul_code
+
+
+async def get_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int, request: Optional[Request] = None,
+                              variant: CalendarVariant = CalendarVariant()) -> Response:
     """
     지정된 학교의 학사일정을 ICS 파일로 반환합니다.
-    캐시 서비스를 사용하여 결과를 캐시합니다.
+    캐시 서비스를 사용하여 결과를 캐시하며, 조건부 요청(If-None-Match, If-Modified-Since)을 지원합니다.
+    variant가 주어지면 공휴일 제외, 알림 끄기, 학년별 캘린더 등의 변형을 반환합니다.
     """
     if not atpt_ofcdc_sc_code or not sd_schul_code:
         raise HTTPException(
@@ -29,35 +120,568 @@ async def get_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> Fi
             detail="ATPT_OFCDC_SC_CODE and SD_SCHUL_CODE are required."
         )
 
+    # 교육청 코드는 캐시 경로에 쓰이므로 경로 구분자나 ".." 같은 값은 캐시를 보기 전에 거부합니다.
+    try:
+        check_cache_key(atpt_ofcdc_sc_code, sd_schul_code)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ATPT_OFCDC_SC_CODE.")
+
+    response = await _serve_school_calendar(atpt_ofcdc_sc_code, sd_schul_code, request, variant)
+    # 캐시 예열 대상을 고르기 위해, 응답에 성공한 학교만 요청된 학교로 기록합니다.
+    # (없는 학교 코드 요청이 추적 목록을 채워 실제 학교가 기록되지 못하는 일이 없도록 합니다.
+    # 변형 캘린더도 같은 학사일정을 사용하므로 학교 단위로 기록합니다.)
+    cache_warmer.record(atpt_ofcdc_sc_code, sd_schul_code)
+    return response
+
+
+async def _serve_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int, request: Optional[Request],
+                                 variant: CalendarVariant) -> Response:
+    """캐시, stale-while-revalidate, NEIS 조회 순서로 학교 캘린더 응답을 만듭니다."""
+    if variant.key:
+        return await _get_variant_calendar(atpt_ofcdc_sc_code, sd_schul_code, request, variant)
+
     # 1. 캐시 확인
     cached_path = cache_service.get(atpt_ofcdc_sc_code, sd_schul_code)
     if cached_path:
-        return FileResponse(cached_path, media_type='text/calendar', filename='school_schedule.ics')
+        return _calendar_response(request, atpt_ofcdc_sc_code, sd_schul_code, cached_path)
+
+    # 2. stale-while-revalidate 모드: 만료된 캐시를 즉시 반환하고 백그라운드에서 갱신합니다.
+    if settings.get('stale_while_revalidate', False):
+        stale_path = cache_service.get_stale(atpt_ofcdc_sc_code, sd_schul_code)
+        if stale_path:
+            refresh_worker.enqueue(atpt_ofcdc_sc_code, sd_schul_code)
+            return _calendar_response(request, atpt_ofcdc_sc_code, sd_schul_code, stale_path)
 
-    # 2. 캐시 미스: 데이터 생성
+    # 3. 캐시 미스: 데이터 생성
     print(f"Cache miss for {atpt_ofcdc_sc_code}/{sd_schul_code}. Fetching from NEIS API.")
+    try:
+        newly_cached_path = await refresh_school_calendar(atpt_ofcdc_sc_code, sd_schul_code)
+    except HTTPException as e:
+        # NEIS 장애(5xx, 시간 초과 등) 시에는 오래된 캐시라도 있으면 그것을 반환합니다.
+        if e.status_code < 500 or not settings.get('stale_if_error', True):
+            raise
+        stale_path = cache_service.get_stale(atpt_ofcdc_sc_code, sd_schul_code)
+        if not stale_path:
+            raise
+        print(f"NEIS request failed ({e.detail}). Falling back to stale cache.")
+        return _calendar_response(request, atpt_ofcdc_sc_code, sd_schul_code, stale_path)
+
+    # 4. 새로 캐시된 파일 반환
+    return _calendar_response(request, atpt_ofcdc_sc_code, sd_schul_code, newly_cached_path)
+
+
+async def _get_variant_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int, request: Optional[Request],
+                                variant: CalendarVariant) -> Response:
+    """
+    변형 캘린더를 반환합니다. 변형은 이벤트 저장소에 보관된 학사일정으로 만들므로,
+    저장된 학사일정이 유효 기간 안이면 NEIS를 호출하지 않습니다.
+    """
+    cache_code = variant_cache_code(sd_schul_code, variant)
+    cached_path = cache_service.get(atpt_ofcdc_sc_code, cache_code)
+    if cached_path:
+        return _calendar_response(request, atpt_ofcdc_sc_code, cache_code, cached_path)
+
+    stored = await load_school_events(atpt_ofcdc_sc_code, sd_schul_code)
+    path = await render_calendar_variant(stored, variant)
+    return _calendar_response(request, atpt_ofcdc_sc_code, cache_code, path)
+
+
+async def load_school_events(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> StoredSchedule:
+    """
+    이벤트 저장소에서 학교의 학사일정을 가져옵니다.
+    저장된 학사일정이 없거나 만료되었으면 기본 캘린더를 갱신(NEIS 조회)하여 저장소를 채웁니다.
+    NEIS 장애 시에는 만료된 학사일정이라도 있으면 그것을 반환합니다. (stale_if_error)
+    """
+    get_known_school(atpt_ofcdc_sc_code, sd_schul_code)
+    if not _has_fresh_events(atpt_ofcdc_sc_code, sd_schul_code):
+        print(f"Stored events for {atpt_ofcdc_sc_code}/{sd_schul_code} are missing or expired. Fetching from NEIS API.")
+        try:
+            await refresh_school_calendar(atpt_ofcdc_sc_code, sd_schul_code)
+        except HTTPException as e:
+            stored = cache_service.events.get(atpt_ofcdc_sc_code, sd_schul_code)
+            if e.status_code < 500 or not settings.get('stale_if_error', True) or stored is None:
+                raise
+            print(f"NEIS request failed ({e.detail}). Falling back to stored events.")
+            return stored
+
+    stored = cache_service.events.get(atpt_ofcdc_sc_code, sd_schul_code)
+    if stored is None:
+        # 다른 워커가 처음으로 학사일정을 받는 중인 경우
+        raise HTTPException(status_code=503, detail="The calendar is being built by another worker. Please retry.")
+    return stored
 
-    # 학교 정보 조회 (학교 이름을 ICS 파일에 사용하기 위함)
-    school_info_list = school_search_service.search(atpt_ofcdc_sc_code, "")
-    target_school = next((s for s in school_info_list if s.get('행정표준코드') == str(sd_schul_code)), None)
 
+def _has_fresh_events(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> bool:
+    """이벤트 저장소의 학사일정이 캐시 유지 기간 안에 받은 것인지 확인합니다."""
+    fetched_time = cache_service.events.fetched_time(atpt_ofcdc_sc_code, sd_schul_code)
+    return fetched_time is not None and datetime.now(timezone.utc) - fetched_time < cache_service.duration
+
+
+async def render_calendar_variant(stored: StoredSchedule, variant: CalendarVariant) -> Path:
+    """
+    저장된 학사일정으로 변형 캘린더를 만들어 캐시에 저장하고 경로를 반환합니다. NEIS를 호출하지 않습니다.
+    생성 시각을 원본을 받은 시각으로 두어, 변형이 원본 학사일정보다 오래 유효하지 않도록 합니다.
+    원본 데이터가 이미 저장된 변형을 만들 때와 같으면 다시 만들지 않고 유효 기간만 연장하여 ETag를 유지합니다.
+    """
+    cache_code = variant_cache_code(stored.school_code, variant)
+    previous = cache_service.get_entry(stored.atpt_code, cache_code)
+    if previous is not None and previous.fingerprint == stored.fingerprint:
+        path = await cache_service.touch_async(stored.atpt_code, cache_code, now_func=lambda: stored.fetched_time)
+        if path is not None:
+            return path
+
+    ics_data = convert_to_ics(
+        {"SchoolSchedule": [{"row": stored.rows}]}, stored.school_name,
+        generated_at=stored.fetched_time, variant=variant,
+    )
+    return await cache_service.set_async(stored.atpt_code, cache_code, ics_data, fingerprint=stored.fingerprint)
+
+
+async def refresh_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> Path:
+    """
+    학교 캘린더를 다시 생성합니다.
+    같은 학교에 대한 동시 요청은 하나의 생성 작업으로 합쳐서 처리합니다.
+    """
+    return await calendar_single_flight.do(
+        (atpt_ofcdc_sc_code, sd_schul_code),
+        lambda: _refresh_with_lock(atpt_ofcdc_sc_code, sd_schul_code),
+    )
+
+
+async def _refresh_with_lock(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> Path:
+    """
+    프로세스 간 잠금을 잡고 캘린더를 생성합니다.
+    다른 워커 프로세스가 이미 생성 중이면 이전 버전(stale)이 있을 경우 그것을 반환하고,
+    없으면 그 워커의 결과를 기다렸다가 사용합니다.
+    """
+    # 잠금 파일을 만들기 전에 학교를 확인합니다.
+    get_known_school(atpt_ofcdc_sc_code, sd_schul_code)
+    lock = cache_service.lock(atpt_ofcdc_sc_code, sd_schul_code)
+    if not lock.acquire(blocking=False):
+        stale_path = cache_service.get_stale(atpt_ofcdc_sc_code, sd_schul_code)
+        if stale_path:
+            print(f"Calendar {atpt_ofcdc_sc_code}/{sd_schul_code} is being regenerated by another worker. Serving previous version.")
+            return stale_path
+        if not await lock.acquire_async(timeout=settings.get('cache_lock_timeout', 30)):
+            raise HTTPException(status_code=503, detail="Timed out waiting for another worker to build the calendar.")
+
+    try:
+        # 잠금을 기다리는 동안 다른 워커가 이미 새로 만들었다면 그 결과를 그대로 사용합니다.
+        # (변형 캘린더를 위해 갱신하는 경우에는 이벤트 저장소의 학사일정도 유효해야 합니다.)
+        cached_path = cache_service.get(atpt_ofcdc_sc_code, sd_schul_code)
+        if cached_path and _has_fresh_events(atpt_ofcdc_sc_code, sd_schul_code):
+            return cached_path
+        return await build_school_calendar(atpt_ofcdc_sc_code, sd_schul_code)
+    finally:
+        lock.release()
+
+
+async def warm_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> Optional[Path]:
+    """
+    만료되기 전의 캘린더를 미리 다시 만듭니다. (cache_warmer가 호출합니다.)
+    캐시가 아직 유효해도 NEIS에서 다시 받습니다. 이 워커나 다른 워커가 이미 생성 중이면(잠금) 건너뛰고 None을 반환합니다.
+    잠금을 잡고 있는 동안의 사용자 요청은 _refresh_with_lock에 따라 기존 캐시로 응답합니다.
+    """
+    get_known_school(atpt_ofcdc_sc_code, sd_schul_code)
+    lock = cache_service.lock(atpt_ofcdc_sc_code, sd_schul_code)
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        return await build_school_calendar(atpt_ofcdc_sc_code, sd_schul_code)
+    finally:
+        lock.release()
+
+
+def get_known_school(atpt_ofcdc_sc_code: str, sd_schul_code) -> dict:
+    """로컬 학교 정보에서 학교를 찾습니다. 없으면 404 HTTPException을 발생시킵니다."""
+    target_school = school_search_service.get_school(atpt_ofcdc_sc_code, sd_schul_code)
     if not target_school:
         raise HTTPException(status_code=404, detail=f"School with code {sd_schul_code} not found in local data for region {atpt_ofcdc_sc_code}.")
+    return target_school
 
-    school_name = target_school.get('학교명', 'Unknown School')
 
-    # NEIS API에서 학사일정 데이터 가져오기
-    json_data = await get_school_schedule(atpt_ofcdc_sc_code, sd_schul_code)
+def school_display_name(school: dict) -> str:
+    """ICS 파일에 쓸 학교 이름을 반환합니다. 요청, 지역 일괄 조회, 일괄 생성이 모두 같은 이름을 쓰도록 합니다."""
+    return school.get('학교명') or 'Unknown School'
+
+
+async def build_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> Path:
+    """
+    NEIS API에서 학사일정을 가져와 ICS로 변환하고 캐시에 저장합니다.
+    저장된 캐시 파일의 경로를 반환합니다.
+    """
+    # 학교 정보 조회 (학교 이름을 ICS 파일에 사용하기 위함)
+    target_school = get_known_school(atpt_ofcdc_sc_code, sd_schul_code)
+    school_name = school_display_name(target_school)
+
+    # NEIS API에서 학사일정 데이터 가져오기 (모든 페이지)
+    schedule = await get_school_schedule(atpt_ofcdc_sc_code, sd_schul_code)
 
     # NEIS API가 데이터 없음을 반환하는 경우 처리 ("INFO-200"은 데이터 없음을 의미)
-    if "RESULT" in json_data and json_data["RESULT"]["CODE"] == "INFO-200":
+    if len(schedule) == 0:
         raise HTTPException(status_code=404, detail="No schedule data found for the given school on NEIS.")
 
+    path, _ = await store_school_calendar(atpt_ofcdc_sc_code, sd_schul_code, school_name, schedule)
+    return path
+
+
+async def store_school_calendar(atpt_ofcdc_sc_code: str, sd_schul_code: int, school_name: str, schedule: ScheduleRows) -> tuple[Path, bool]:
+    """
+    NEIS 학사일정 행을 이벤트 저장소에 보관하고, 저장된 학사일정으로 만든 ICS를 캐시에 저장합니다.
+    (캐시 파일 경로, 내용이 바뀌었는지 여부)를 반환합니다.
+    """
+    now = datetime.now(timezone.utc)
+    # 이벤트 저장소와 캐시 인덱스(SQLite) 작업은 이벤트 루프를 막지 않도록 별도 스레드에서 실행합니다.
+    stored = await asyncio.to_thread(save_school_events, atpt_ofcdc_sc_code, sd_schul_code, school_name, schedule, now)
+    if stored is None:
+        return await cache_service.touch_async(atpt_ofcdc_sc_code, sd_schul_code), False
+
     # ICS 형식으로 변환
-    ics_data = convert_to_ics(json_data, school_name)
+    ics_data = convert_to_ics({"SchoolSchedule": [{"row": stored.rows}]}, school_name, generated_at=now)
 
-    # 3. 생성된 데이터를 캐시에 저장
-    newly_cached_path = cache_service.set(atpt_ofcdc_sc_code, sd_schul_code, ics_data)
+    # 생성된 데이터를 캐시에 저장
+    return await cache_service.set_async(atpt_ofcdc_sc_code, sd_schul_code, ics_data, fingerprint=stored.fingerprint), True
 
-    # 4. 새로 캐시된 파일 반환
-    return FileResponse(newly_cached_path, media_type='text/calendar', filename='school_schedule.ics')
+
+def save_school_events(atpt_ofcdc_sc_code: str, sd_schul_code: int, school_name: str, schedule: ScheduleRows,
+                       now: datetime) -> Optional[StoredSchedule]:
+    """
+    NEIS 학사일정 행을 이벤트 저장소에 보관하고, 캘린더를 만들 저장된 학사일정을 반환합니다.
+    원본 데이터가 캐시된 캘린더를 만들 때와 같으면 유효 기간만 연장하고 None을 반환합니다.
+    """
+    events = cache_service.events
+    # 원본 데이터가 이전과 같으면 다시 변환하지 않습니다.
+    # 파일이 바뀌지 않으므로 ETag도 그대로 유지되어 클라이언트는 304를 받게 됩니다.
+    fingerprint = schedule.fingerprint()
+    previous = cache_service.get_entry(atpt_ofcdc_sc_code, sd_schul_code)
+    if previous is not None and previous.fingerprint == fingerprint:
+        if not events.touch(atpt_ofcdc_sc_code, sd_schul_code, now):
+            # 이벤트 저장소가 생기기 전에 만들어진 캐시인 경우
+            events.put(atpt_ofcdc_sc_code, sd_schul_code, school_name, schedule.rows, fingerprint, now)
+        return None
+
+    events.put(atpt_ofcdc_sc_code, sd_schul_code, school_name, schedule.rows, fingerprint, now)
+    return events.get(atpt_ofcdc_sc_code, sd_schul_code)
+
+
+async def prefetch_region(atpt_ofcdc_sc_code: str) -> dict:
+    """
+    한 시도교육청의 학사일정을 교육청 단위로 한 번에(페이지 단위로) 가져와 학교별로 나누고,
+    그 지역 모든 학교의 캐시를 새로 채웁니다. 학교마다 NEIS를 호출하는 것보다 요청 수가 훨씬 적습니다.
+    다른 워커가 생성 중인 학교는 건너뜁니다. 결과 요약을 반환합니다.
+    """
+    # 페이지를 받는 대로 SD_SCHUL_CODE별로 나눠, 변환에 필요한 값만 남깁니다.
+    schedules: dict[str, ScheduleRows] = {}
+    requests = rows = 0
+    async for page in iter_region_schedule_pages(atpt_ofcdc_sc_code):
+        requests += 1
+        rows += len(page)
+        for row in page:
+            school_code = normalize_school_code(row.get('SD_SCHUL_CODE', ''))
+            schedules.setdefault(school_code, ScheduleRows()).add(row)
+
+    report = {
+        "region": atpt_ofcdc_sc_code,
+        "requests": requests,
+        "rows": rows,
+        "schools": len(schedules),
+        "written": 0,
+        "unchanged": 0,
+        "unknown": 0,
+        "locked": 0,
+    }
+    for school_code, schedule in schedules.items():
+        target_school = school_search_service.get_school(atpt_ofcdc_sc_code, school_code)
+        if not target_school or not school_code.isdigit():
+            # 로컬 학교 정보에 없는 학교는 개별 조회와 마찬가지로 캐시하지 않습니다.
+            report["unknown"] += 1
+            continue
+
+        sd_schul_code = int(school_code)
+        lock = cache_service.lock(atpt_ofcdc_sc_code, sd_schul_code)
+        if not lock.acquire(blocking=False):
+            report["locked"] += 1
+            continue
+        try:
+            # 학교 하나를 개별 조회했을 때와 같은 행이므로 같은 ICS와 지문이 나옵니다.
+            _, changed = await store_school_calendar(
+                atpt_ofcdc_sc_code, sd_schul_code, school_display_name(target_school), schedule
+            )
+        finally:
+            lock.release()
+        report["written" if changed else "unchanged"] += 1
+
+    return report
+
+
+# 일괄 생성 결과에 자세히 남길 최대 실패 수
+PREGEN_MAX_REPORTED_FAILURES = 20
+
+
+def load_schedule_dump(path: Path) -> dict[tuple[str, str], ScheduleRows]:
+    """
+    로컬에 저장해 둔 NEIS 학사일정을 (교육청 코드, 행정표준코드)별로 읽습니다.
+    파일의 각 줄은 NEIS 학사일정 행 하나이거나, SchoolSchedule 응답 전체입니다. (NDJSON)
+    """
+    schedules: dict[tuple[str, str], ScheduleRows] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            rows = _collect_rows(item) if 'SchoolSchedule' in item else [item]
+            for row in rows:
+                key = (row.get('ATPT_OFCDC_SC_CODE', ''), normalize_school_code(row.get('SD_SCHUL_CODE', '')))
+                schedules.setdefault(key, ScheduleRows()).add(row)
+    return schedules
+
+
+async def pregenerate_calendars(schools: Iterable[tuple[str, str, dict]], concurrency: int = 8,
+                                processes: Optional[int] = None,
+                                dump: Optional[dict[tuple[str, str], ScheduleRows]] = None,
+                                force: bool = False) -> dict:
+    """
+    여러 학교의 캘린더를 미리 만들어 캐시에 저장합니다. (정적 파일로 배포하기 위한 일괄 생성)
+    학사일정은 concurrency개까지 동시에 NEIS에서 받거나(dump가 있으면 그 데이터를 사용),
+    ICS 변환은 processes개의 프로세스에서 나눠 처리합니다. 파일은 cache_service.set으로 원자적으로 씁니다.
+    중단 후 다시 실행하면 이미 유효한 캐시가 있는 학교는 건너뜁니다. (force이면 모두 다시 만듭니다.)
+    처리량과 실패 학교를 담은 결과 요약을 반환합니다.
+    """
+    started = time.monotonic()
+    report = {
+        "schools": 0,
+        "written": 0,
+        "unchanged": 0,
+        "skipped": 0,
+        "empty": 0,
+        "locked": 0,
+        "failed": 0,
+    }
+    failures = []
+    pending = iter(schools)
+    loop = asyncio.get_running_loop()
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        async def worker():
+            # 작업자들이 같은 이터레이터에서 학교를 하나씩 꺼내 처리합니다.
+            for atpt_ofcdc_sc_code, school_code, school in pending:
+                report["schools"] += 1
+                try:
+                    outcome = await _pregenerate_school(
+                        loop, pool, atpt_ofcdc_sc_code, int(school_code), school_display_name(school),
+                        dump, force,
+                    )
+                except Exception as e:
+                    # 학교 하나의 실패로 전체 작업이 멈추지 않도록 기록만 하고 계속합니다.
+                    outcome = "failed"
+                    if len(failures) < PREGEN_MAX_REPORTED_FAILURES:
+                        detail = e.detail if isinstance(e, HTTPException) else repr(e)
+                        failures.append({"school": f"{atpt_ofcdc_sc_code}:{school_code}", "error": detail})
+                report[outcome] += 1
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    elapsed = time.monotonic() - started
+    report["elapsed_seconds"] = round(elapsed, 2)
+    report["schools_per_second"] = round(report["schools"] / elapsed, 1) if elapsed > 0 else None
+    report["failures"] = failures
+    return report
+
+
+def _render_compressed_calendar(rows: list[dict], school_name: str, generated_at: datetime,
+                                encodings: tuple[str, ...]) -> tuple[str, dict[str, bytes]]:
+    """
+    ICS로 변환하고 캐시에 저장할 압축 변형까지 만듭니다. (ProcessPoolExecutor에서 실행합니다.)
+    store_school_calendar와 같은 인자로 변환하므로 요청 시 만든 캘린더와 같은 파일이 됩니다.
+    """
+    ics_data = convert_to_ics({"SchoolSchedule": [{"row": rows}]}, school_name, generated_at=generated_at)
+    return ics_data, compress_bodies(ics_data, encodings)
+
+
+async def _pregenerate_school(loop: asyncio.AbstractEventLoop, pool: ProcessPoolExecutor, atpt_ofcdc_sc_code: str,
+                              sd_schul_code: int, school_name: str,
+                              dump: Optional[dict[tuple[str, str], ScheduleRows]], force: bool) -> str:
+    """학교 하나의 캘린더를 만들어 저장하고, 결과 종류(report의 키)를 반환합니다."""
+    if not force and cache_service.get(atpt_ofcdc_sc_code, sd_schul_code):
+        return "skipped"
+
+    if dump is not None:
+        schedule = dump.get((atpt_ofcdc_sc_code, str(sd_schul_code)))
+    else:
+        schedule = await get_school_schedule(atpt_ofcdc_sc_code, sd_schul_code)
+    if not schedule:
+        return "empty"
+
+    lock = cache_service.lock(atpt_ofcdc_sc_code, sd_schul_code)
+    if not lock.acquire(blocking=False):
+        return "locked"
+    try:
+        now = datetime.now(timezone.utc)
+        stored = await asyncio.to_thread(save_school_events, atpt_ofcdc_sc_code, sd_schul_code, school_name, schedule, now)
+        if stored is None:
+            await cache_service.touch_async(atpt_ofcdc_sc_code, sd_schul_code)
+            return "unchanged"
+        # 변환과 압축(저장 시간의 대부분)을 모두 작업 프로세스에서 처리합니다.
+        ics_data, compressed = await loop.run_in_executor(
+            pool, _render_compressed_calendar, stored.rows, school_name, now, cache_service.encodings
+        )
+        await cache_service.set_async(
+            atpt_ofcdc_sc_code, sd_schul_code, ics_data, fingerprint=stored.fingerprint, compressed=compressed
+        )
+    finally:
+        lock.release()
+    return "written"
+
+
+# 여러 학교를 합친 캘린더를 캐시하는 디렉토리 (캐시 키의 교육청 코드 자리)
+MERGED_CALENDAR_ATPT = "merged"
+
+
+def parse_school_list(value: str) -> list[tuple[str, int]]:
+    """
+    "B10:7010057,C10:7150658" 형식의 학교 목록을 (교육청 코드, 학교 코드) 목록으로 바꿉니다.
+    순서와 중복에 관계없이 같은 학교들이면 같은 목록이 되도록 중복을 없애고 정렬합니다.
+    """
+    return parse_school_codes(value.split(","), settings.get('merged_calendar_max_schools', 20))
+
+
+def parse_school_codes(items: Iterable[str], max_schools: int) -> list[tuple[str, int]]:
+    """"B10:7010057" 형식의 학교 코드들을 중복 없이 정렬된 (교육청 코드, 학교 코드) 목록으로 바꿉니다."""
+    schools = set()
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        atpt_ofcdc_sc_code, _, sd_schul_code = item.partition(":")
+        if not atpt_ofcdc_sc_code or not sd_schul_code.isdigit():
+            raise HTTPException(status_code=400, detail=f"Invalid school '{item}'. Use ATPT_OFCDC_SC_CODE:SD_SCHUL_CODE.")
+        schools.add((atpt_ofcdc_sc_code, int(sd_schul_code)))
+
+    if not schools:
+        raise HTTPException(status_code=400, detail="At least one school is required.")
+    if len(schools) > max_schools:
+        raise HTTPException(status_code=400, detail=f"At most {max_schools} schools can be requested at once.")
+    return sorted(schools)
+
+
+def merged_cache_code(schools: list[tuple[str, int]], variant: CalendarVariant) -> str:
+    """합친 캘린더의 캐시 키를 학교 목록의 해시로 만듭니다. (parse_school_list로 정렬된 목록을 넘겨야 합니다.)"""
+    key = ",".join(f"{atpt_ofcdc_sc_code}:{sd_schul_code}" for atpt_ofcdc_sc_code, sd_schul_code in schools)
+    return variant_cache_code(hashlib.sha256(key.encode("utf-8")).hexdigest()[:32], variant)
+
+
+async def get_merged_calendar(schools: list[tuple[str, int]], request: Optional[Request] = None,
+                              variant: CalendarVariant = CalendarVariant()) -> Response:
+    """
+    여러 학교의 학사일정을 하나로 합친 ICS 파일을 반환합니다.
+    각 학교의 학사일정은 이벤트 저장소에서 가져오며, 없거나 만료된 학교만 NEIS에서 동시에 받습니다.
+    합친 결과는 학교 목록으로 만든 키로 캐시합니다.
+    """
+    cache_code = merged_cache_code(schools, variant)
+    path = cache_service.get(MERGED_CALENDAR_ATPT, cache_code)
+    if not path:
+        path = await calendar_single_flight.do(
+            (MERGED_CALENDAR_ATPT, cache_code),
+            lambda: _build_merged_calendar(schools, variant, cache_code),
+        )
+    # 합친 캘린더를 만드는 데 성공한 학교들만 캐시 예열 대상으로 기록합니다.
+    for school in schools:
+        cache_warmer.record(*school)
+    return _calendar_response(request, MERGED_CALENDAR_ATPT, cache_code, path)
+
+
+async def _build_merged_calendar(schools: list[tuple[str, int]], variant: CalendarVariant, cache_code: str) -> Path:
+    """학교별 학사일정을 merged_calendar_concurrency개까지 동시에 가져와 합친 캘린더를 캐시에 저장합니다."""
+    semaphore = asyncio.Semaphore(settings.get('merged_calendar_concurrency', 4))
+
+    async def load(atpt_ofcdc_sc_code: str, sd_schul_code: int) -> StoredSchedule:
+        async with semaphore:
+            return await load_school_events(atpt_ofcdc_sc_code, sd_schul_code)
+
+    stored_schedules = await asyncio.gather(*(load(*school) for school in schools))
+
+    # 가장 오래전에 받은 학교의 학사일정이 만료될 때 합친 캘린더도 만료되도록 합니다.
+    generated_at = min(stored.fetched_time for stored in stored_schedules)
+    ics_data = "".join(iter_merged_ics_lines(
+        [SchoolEvents(stored.atpt_code, stored.school_code, stored.school_name, stored.rows) for stored in stored_schedules],
+        generated_at, variant,
+    ))
+    fingerprint = hashlib.sha256(
+        ",".join(stored.fingerprint or "" for stored in stored_schedules).encode("utf-8")
+    ).hexdigest()
+    path = await cache_service.set_async(MERGED_CALENDAR_ATPT, cache_code, ics_data, fingerprint=fingerprint)
+    # 학교 조합마다 새 항목이 생기므로 합친 캘린더는 최근에 쓰인 merged_calendar_max_entries개만 남깁니다.
+    await asyncio.to_thread(cache_service.trim, MERGED_CALENDAR_ATPT, settings.get('merged_calendar_max_entries', 1000))
+    return path
+
+
+def _schedule_json(stored: StoredSchedule, variant: CalendarVariant) -> dict:
+    """저장된 학사일정을 연속된 날짜의 같은 행사를 하나로 묶은 JSON 객체로 만듭니다."""
+    return {
+        "ATPT_OFCDC_SC_CODE": stored.atpt_code,
+        "SD_SCHUL_CODE": stored.school_code,
+        "SCHUL_NM": stored.school_name,
+        "fetched_time": stored.fetched_time.isoformat(),
+        "events": [
+            {
+                "name": event['name'],
+                "start_date": event['start_date'].strftime('%Y-%m-%d'),
+                "end_date": event['end_date'].strftime('%Y-%m-%d'),
+                "description": event['description'],
+                "location": event['location'],
+            }
+            for event in schedule_events(stored.rows, variant)
+        ],
+    }
+
+
+async def _load_schedule_json(atpt_ofcdc_sc_code: str, sd_schul_code: int, variant: CalendarVariant,
+                              semaphore: asyncio.Semaphore) -> dict:
+    """
+    학교 하나의 학사일정을 JSON 객체로 가져옵니다.
+    한 학교의 실패가 묶음 전체를 실패시키지 않도록 오류도 객체로 반환합니다.
+    """
+    async with semaphore:
+        try:
+            stored = await load_school_events(atpt_ofcdc_sc_code, sd_schul_code)
+        except HTTPException as e:
+            return {
+                "ATPT_OFCDC_SC_CODE": atpt_ofcdc_sc_code,
+                "SD_SCHUL_CODE": str(sd_schul_code),
+                "error": {"status_code": e.status_code, "detail": e.detail},
+            }
+    # 학사일정을 가져온 학교만 캐시 예열 대상으로 기록합니다.
+    cache_warmer.record(atpt_ofcdc_sc_code, sd_schul_code)
+    return _schedule_json(stored, variant)
+
+
+async def get_school_schedules(batch: ScheduleBatch) -> Response:
+    """
+    여러 학교의 학사일정을 ICS 대신 JSON으로 한 번에 반환합니다.
+    각 학교는 이벤트 저장소(/school과 같은 캐시)에서 읽고, 없거나 만료된 학교만
+    schedule_batch_concurrency개까지 동시에 NEIS에서 받습니다.
+    FORMAT이 "ndjson"이면 학교별 결과를 끝나는 순서대로 한 줄씩 스트리밍합니다.
+    """
+    schools = parse_school_codes(batch.SCHOOLS, settings.get('schedule_batch_max_schools', 500))
+    variant = CalendarVariant(exclude_holidays=batch.EXCLUDE_HOLIDAYS, grade=batch.GRADE)
+    semaphore = asyncio.Semaphore(settings.get('schedule_batch_concurrency', 8))
+
+    if batch.FORMAT == "ndjson":
+        return StreamingResponse(_iter_schedule_ndjson(schools, variant, semaphore), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*(_load_schedule_json(*school, variant, semaphore) for school in schools))
+    return JSONResponse(content={"schools": results})
+
+
+async def _iter_schedule_ndjson(schools: list[tuple[str, int]], variant: CalendarVariant,
+                                semaphore: asyncio.Semaphore) -> AsyncIterator[bytes]:
+    """학교별 학사일정 JSON을 먼저 끝난 학교부터 한 줄씩 만듭니다. 응답이 끊기면 남은 작업을 취소합니다."""
+    tasks = [asyncio.create_task(_load_schedule_json(*school, variant, semaphore)) for school in schools]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            yield json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,14 +1,44 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 # 라우터 모듈들을 가져옵니다.
-from app.routers import root_router, school_router, search_router
+from app.routers import admin_router, metrics_router, root_router, school_router, search_router
+from app.controllers import school_controller
+from app.services import neis
+from app.services.refresh_worker import refresh_worker
+from app.services.cache_gc import cache_gc
+from app.services.cache_warmer import cache_warmer
+from app.services.school_reloader import school_data_watcher
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 시점에 공유 자원을 관리합니다.
+    NEIS API 호출에 사용하는 커넥션 풀, 백그라운드 캐시 갱신 작업자,
+    주기적 캐시 가비지 컬렉션, 요청된 학교의 캐시 예열, 학교 정보 파일 감시를 시작 시 생성하고 종료 시 정리합니다.
+    """
+    await neis.start_client()
+    refresh_worker.start(school_controller.refresh_school_calendar)
+    cache_gc.start()
+    cache_warmer.start(school_controller.warm_school_calendar)
+    school_data_watcher.start()
+    try:
+        yield
+    finally:
+        await school_data_watcher.stop()
+        await cache_warmer.stop()
+        await cache_gc.stop()
+        await refresh_worker.stop()
+        await neis.close_client()
 
 # FastAPI 앱 인스턴스 생성
 app = FastAPI(
     title="나이스 학사일정 ICS 변환기",
     description="나이스(NEIS) 학사일정 정보를 조회하여 iCalendar(.ics) 파일로 변환하는 API 서버입니다.",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # 정적 파일 마운트 ("static" 폴더)
@@ -20,6 +50,8 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(root_router.router)
 app.include_router(school_router.router)
 app.include_router(search_router.router)
+app.include_router(metrics_router.router)
+app.include_router(admin_router.router)
 
 # 참고: 이제 이 파일에는 더 이상 @app.get, @app.post와 같은
 # 개별 엔드포인트 데코레이터가 존재하지 않습니다.
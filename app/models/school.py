@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
 
 class SchoolSearch(BaseModel):
   """
@@ -6,3 +8,16 @@ class SchoolSearch(BaseModel):
   """
   ATPT_OFCDC_SC_CODE: str
   SCHUL_NM: str
+  # 검색 방식: contains(부분 문자열), choseong(초성, 예: "ㅅㅇㄱ"), jamo(자모, 입력 중인 음절 포함)
+  MATCH_MODE: Literal["contains", "choseong", "jamo"] = "contains"
+
+class ScheduleBatch(BaseModel):
+  """
+  여러 학교의 학사일정을 JSON으로 한 번에 가져오는 API의 요청 본문입니다.
+  """
+  # "ATPT_OFCDC_SC_CODE:SD_SCHUL_CODE" 형식의 학교 목록 (예: ["B10:7010057", "C10:7150658"])
+  SCHOOLS: list[str]
+  EXCLUDE_HOLIDAYS: bool = False
+  GRADE: Optional[int] = Field(default=None, ge=1, le=6)
+  # json: 하나의 JSON 객체, ndjson: 학교별 결과를 한 줄씩 스트리밍 (학교가 많을 때)
+  FORMAT: Literal["json", "ndjson"] = "json"
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header
+from app.controllers import admin_controller
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+)
+
+@router.post("/reload-schools")
+async def reload_school_data_route(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    학교 정보 데이터를 다시 불러옵니다. `X-Admin-Token` 헤더에 설정의 `admin_token` 값이 필요합니다.
+    `admin_controller.reload_school_data`를 호출합니다.
+    """
+    return await admin_controller.reload_school_data(x_admin_token)
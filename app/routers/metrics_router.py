@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from app.controllers import metrics_controller
+
+router = APIRouter(
+    tags=["Monitoring"],
+)
+
+@router.get("/metrics")
+async def get_metrics_route():
+    """
+    모니터링용 내부 지표를 가져옵니다. `metrics_controller.get_metrics`를 호출합니다.
+    """
+    return await metrics_controller.get_metrics()
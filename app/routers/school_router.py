@@ -1,5 +1,9 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request
 from app.controllers import school_controller
+from app.models.school import ScheduleBatch
+from app.services.ics_converter import CalendarVariant
 
 router = APIRouter(
     prefix="/school",
@@ -7,11 +11,47 @@ router = APIRouter(
 )
 
 @router.get("")
-async def get_school_calendar_route(ATPT_OFCDC_SC_CODE: str, SD_SCHUL_CODE: int):
+async def get_school_calendar_route(
+    request: Request,
+    ATPT_OFCDC_SC_CODE: str,
+    SD_SCHUL_CODE: int,
+    EXCLUDE_HOLIDAYS: bool = False,
+    ALARM: bool = True,
+    GRADE: Optional[int] = Query(default=None, ge=1, le=6),
+):
     """
     학교 코드를 사용하여 학사일정 ICS 파일을 가져옵니다.
+    EXCLUDE_HOLIDAYS, ALARM, GRADE로 공휴일 제외, 알림 끄기, 학년별 캘린더 변형을 요청할 수 있습니다.
     `school_controller.get_school_calendar`를 호출합니다.
 
     (참고: prefix가 /school이므로 이 엔드포인트의 전체 경로는 /school이 됩니다.)
     """
-    return await school_controller.get_school_calendar(ATPT_OFCDC_SC_CODE, SD_SCHUL_CODE)
+    variant = CalendarVariant(exclude_holidays=EXCLUDE_HOLIDAYS, alarms=ALARM, grade=GRADE)
+    return await school_controller.get_school_calendar(ATPT_OFCDC_SC_CODE, SD_SCHUL_CODE, request, variant)
+
+
+@router.get("/merged")
+async def get_merged_calendar_route(
+    request: Request,
+    SCHOOLS: str,
+    EXCLUDE_HOLIDAYS: bool = False,
+    ALARM: bool = True,
+):
+    """
+    여러 학교의 학사일정을 하나로 합친 ICS 파일을 가져옵니다.
+    SCHOOLS는 "ATPT_OFCDC_SC_CODE:SD_SCHUL_CODE"를 쉼표로 이은 목록입니다. (예: B10:7010057,C10:7150658)
+    `school_controller.get_merged_calendar`를 호출합니다.
+    """
+    schools = school_controller.parse_school_list(SCHOOLS)
+    variant = CalendarVariant(exclude_holidays=EXCLUDE_HOLIDAYS, alarms=ALARM)
+    return await school_controller.get_merged_calendar(schools, request, variant)
+
+
+@router.post("/schedules")
+async def get_school_schedules_route(batch: ScheduleBatch):
+    """
+    여러 학교의 학사일정을 연속된 행사를 묶은 JSON으로 한 번에 가져옵니다. (ICS를 다시 파싱할 필요가 없습니다.)
+    FORMAT이 "ndjson"이면 학교별 결과를 한 줄씩 스트리밍합니다.
+    `school_controller.get_school_schedules`를 호출합니다.
+    """
+    return await school_controller.get_school_schedules(batch)
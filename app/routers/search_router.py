@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query
 from app.controllers import school_controller
 from app.models.school import SchoolSearch
 
@@ -12,3 +14,17 @@ async def search_school_route(school_search: SchoolSearch):
     학교를 검색합니다. `school_controller.search_school`를 호출합니다.
     """
     return await school_controller.search_school(school_search)
+
+@router.get("/search/autocomplete")
+async def autocomplete_school_route(
+    ATPT_OFCDC_SC_CODE: str,
+    q: str,
+    limit: int = Query(default=10, ge=1, le=50),
+    cursor: Optional[str] = None,
+    MATCH_MODE: Literal["contains", "choseong", "jamo"] = "contains",
+):
+    """
+    입력 중인 학교명으로 자동완성 후보를 가져옵니다. (키 입력마다 호출할 수 있도록 가볍게 응답합니다.)
+    `school_controller.autocomplete_school`를 호출합니다.
+    """
+    return await school_controller.autocomplete_school(ATPT_OFCDC_SC_CODE, q, limit, cursor, MATCH_MODE)
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.services.cache_service import CacheService, cache_service
+
+class CacheGarbageCollector:
+    """
+    캐시 가비지 컬렉션을 주기적으로 실행하는 백그라운드 작업입니다.
+    파일 삭제는 이벤트 루프를 막지 않도록 별도 스레드에서 수행합니다.
+    """
+    def __init__(self, cache: CacheService, interval_minutes: float,
+                 max_age_days: Optional[float] = None, max_total_mb: Optional[float] = None):
+        self.cache = cache
+        self.interval_minutes = interval_minutes
+        self.max_age_days = max_age_days
+        self.max_total_mb = max_total_mb
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.last_report: Optional[dict] = None
+
+    def collect(self, dry_run: bool = False) -> dict:
+        """설정된 기준으로 가비지 컬렉션을 한 번 실행하고 결과를 반환합니다."""
+        report = self.cache.collect_garbage(
+            max_age=timedelta(days=self.max_age_days) if self.max_age_days else None,
+            max_total_bytes=int(self.max_total_mb * 1024 * 1024) if self.max_total_mb else None,
+            dry_run=dry_run,
+        )
+        self.runs += 1
+        self.last_report = report
+        return report
+
+    def start(self):
+        """주기적 실행을 시작합니다. interval_minutes가 0 이하이면 시작하지 않습니다."""
+        if self._task is None and self.interval_minutes > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 실행을 중단합니다."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_minutes * 60)
+            try:
+                await asyncio.to_thread(self.collect)
+            except Exception as e:
+                print(f"Cache GC failed: {e}")
+
+    def stats(self) -> dict:
+        """모니터링을 위한 값을 반환합니다."""
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "last_report": self.last_report,
+        }
+
+# 애플리케이션 전역에서 사용할 단일 가비지 컬렉터 인스턴스입니다.
+cache_gc = CacheGarbageCollector(
+    cache_service,
+    interval_minutes=settings.get('gc_interval_minutes', 60),
+    max_age_days=settings.get('gc_max_age_day'),
+    max_total_mb=settings.get('cache_max_mb'),
+)
@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """캐시 파일 하나에 대한 메타데이터입니다."""
+    atpt_code: str
+    school_code: str
+    created_time: Optional[datetime]  # 캐시 생성 시각 (X-CREATED-TIME), 알 수 없으면 None
+    size: int                         # 파일 크기 (바이트)
+    mtime_ns: int                     # 기록 당시 파일의 수정 시각, 외부 변경 감지용
+    sha256: str                       # 파일 내용의 해시
+    fingerprint: Optional[str] = None # 캘린더를 만든 원본 NEIS 데이터의 지문
+    checked_time: Optional[datetime] = None  # 내용 변경 없이 NEIS와 다시 확인한 마지막 시각
+
+class CacheIndex:
+    """
+    캐시 파일의 메타데이터를 SQLite 테이블에 보관하는 인덱스입니다.
+    캐시 적중 여부를 파일을 읽지 않고 기본 키 조회 한 번으로 판단할 수 있게 합니다.
+    WAL 모드를 사용하므로 여러 워커 프로세스가 동시에 읽고 써도 안전하며,
+    디스크에 남기 때문에 재시작 후에도 그대로 유지됩니다.
+    """
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """
+        DB 연결을 반환합니다. create가 False이고 DB 파일이 아직 없으면
+        불필요하게 파일을 만들지 않도록 None을 반환합니다.
+        """
+        if self._conn is not None:
+            return self._conn
+        if not create and not self.db_path.exists():
+            return None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                atpt_code TEXT NOT NULL,
+                school_code TEXT NOT NULL,
+                created_time TEXT,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                fingerprint TEXT,
+                checked_time TEXT,
+                PRIMARY KEY (atpt_code, school_code)
+            )
+            """
+        )
+        # 이전 버전에서 만들어진 인덱스에는 없는 컬럼을 추가합니다.
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+        if "checked_time" not in columns:
+            conn.execute("ALTER TABLE cache_entries ADD COLUMN checked_time TEXT")
+        self._conn = conn
+        return conn
+
+    _COLUMNS = "atpt_code, school_code, created_time, size, mtime_ns, sha256, fingerprint, checked_time"
+
+    def get(self, atpt_code: str, school_code) -> Optional[CacheEntry]:
+        """키에 해당하는 메타데이터를 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                f"SELECT {self._COLUMNS} FROM cache_entries WHERE atpt_code = ? AND school_code = ?",
+                (atpt_code, str(school_code)),
+            ).fetchone()
+        if row is None:
+            return None
+        return self._row_to_entry(row)
+
+    def all(self, atpt_code: Optional[str] = None) -> list[CacheEntry]:
+        """
+        인덱스에 기록된 모든 메타데이터를 반환합니다. (가비지 컬렉션 등 관리 작업용)
+        atpt_code를 주면 그 교육청 코드(디렉토리)의 항목만 반환합니다.
+        """
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return []
+            if atpt_code is None:
+                rows = conn.execute(f"SELECT {self._COLUMNS} FROM cache_entries").fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {self._COLUMNS} FROM cache_entries WHERE atpt_code = ?", (atpt_code,)
+                ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    @staticmethod
+    def _row_to_entry(row) -> CacheEntry:
+        return CacheEntry(
+            atpt_code=row[0],
+            school_code=row[1],
+            created_time=datetime.fromisoformat(row[2]) if row[2] else None,
+            size=row[3],
+            mtime_ns=row[4],
+            sha256=row[5],
+            fingerprint=row[6],
+            checked_time=datetime.fromisoformat(row[7]) if row[7] else None,
+        )
+
+    def put(self, entry: CacheEntry):
+        """메타데이터를 저장하거나 갱신합니다."""
+        with self._lock:
+            conn = self._connect(create=True)
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (atpt_code, school_code, created_time, size, mtime_ns, sha256, fingerprint, checked_time)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.atpt_code,
+                    str(entry.school_code),
+                    entry.created_time.isoformat() if entry.created_time else None,
+                    entry.size,
+                    entry.mtime_ns,
+                    entry.sha256,
+                    entry.fingerprint,
+                    entry.checked_time.isoformat() if entry.checked_time else None,
+                ),
+            )
+
+    def delete(self, atpt_code: str, school_code):
+        """키에 해당하는 메타데이터를 삭제합니다."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return
+            conn.execute(
+                "DELETE FROM cache_entries WHERE atpt_code = ? AND school_code = ?",
+                (atpt_code, str(school_code)),
+            )
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
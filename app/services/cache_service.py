@@ -1,77 +1,527 @@
+import asyncio
+import dataclasses
+import gzip
+import hashlib
 import os
 import re
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성입니다. 설치되지 않았으면 gzip만 사용합니다.
+    brotli = None
 
 from app.core.config import settings
-from app.utils.file_utils import ensure_directory_existence
+from app.services.cache_index import CacheEntry, CacheIndex
+from app.services.event_store import EventStore
+from app.services.memory_cache import MemoryCache
+from app.utils.file_utils import FileLock, atomic_write_bytes, ensure_directory_existence
+
+# 캐시 메타데이터 인덱스 파일 이름 (base_dir 바로 아래에 생성됩니다)
+INDEX_FILE_NAME = "index.sqlite3"
+# 캘린더를 만드는 원본 학사일정 행을 보관하는 이벤트 저장소 파일 이름 (base_dir 바로 아래에 생성됩니다)
+EVENTS_FILE_NAME = "events.sqlite3"
+
+CREATED_TIME_PATTERN = re.compile(r'X-CREATED-TIME:(.+)')
+
+# 이 시간(초)보다 오래된 임시 파일은 중단된 쓰기의 잔여물로 보고 가비지 컬렉션에서 삭제합니다.
+STALE_TEMP_FILE_SECONDS = 3600
+
+# 미리 압축해 두는 변형 파일의 인코딩(Content-Encoding 값)과 확장자
+COMPRESSED_SUFFIXES = {
+    "br": ".br",
+    "gzip": ".gz",
+}
+
+# brotli 압축 수준. 11(최고)은 한 해 캘린더 하나에 수백 ms가 걸려 저장이 느려지므로,
+# 압축률 차이가 작고 수 ms 안에 끝나는 수준을 사용합니다.
+BROTLI_QUALITY = 5
+
+def compress(encoding: str, data: bytes) -> bytes:
+    """
+    주어진 인코딩으로 데이터를 압축합니다.
+    같은 입력에 대해 항상 같은 바이트가 나오도록 gzip 헤더의 mtime은 0으로 고정합니다.
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+def compress_bodies(content: str, encodings: Iterable[str]) -> dict[str, bytes]:
+    """
+    캐시에 저장할 압축 변형을 인코딩별로 만듭니다. CacheService.set(compressed=...)에 넘길 수 있으며,
+    모듈 수준 함수이므로 다른 프로세스(ProcessPoolExecutor)에서 실행할 수 있습니다.
+    """
+    data = content.encode("utf8")
+    return {encoding: compress(encoding, data) for encoding in encodings}
+
+def available_encodings(requested: Iterable[str]) -> tuple[str, ...]:
+    """설정된 인코딩 중 현재 환경에서 사용 가능한 것만 선호 순서대로 반환합니다."""
+    encodings = []
+    for encoding in requested:
+        if encoding not in COMPRESSED_SUFFIXES:
+            print(f"Ignoring unknown cache compression encoding: {encoding}")
+            continue
+        if encoding == "br" and brotli is None:
+            continue
+        encodings.append(encoding)
+    return tuple(encodings)
+
+def check_cache_key(atpt_code: str, school_code) -> None:
+    """
+    캐시 키가 base_dir 아래의 경로로만 쓰일 수 있는지 확인합니다.
+    경로 구분자나 "..", 빈 값이 들어 있으면 캐시 디렉토리 밖에 파일을 만들 수 있으므로 ValueError를 발생시킵니다.
+    """
+    for part in (str(atpt_code), str(school_code)):
+        if not part or part in (".", "..") or "/" in part or "\\" in part or "\0" in part:
+            raise ValueError(f"Invalid cache key: {atpt_code!r}/{school_code!r}")
+
+def parse_created_time(content: str) -> Optional[datetime]:
+    """ICS 문자열에서 X-CREATED-TIME 값을 찾아 datetime으로 반환합니다. 없으면 None을 반환합니다."""
+    # icalendar 라이브러리가 생성하는 실제 포맷(YYYY-MM-DD HH:MM:SS.ffffff+zz:zz)을 파싱합니다.
+    match = CREATED_TIME_PATTERN.search(content)
+    if not match:
+        return None
+    # fromisoformat는 이 포맷을 직접 처리할 수 있습니다.
+    return datetime.fromisoformat(match.group(1).strip())
 
 class CacheService:
     """
     파일 기반 캐시를 관리하는 서비스 클래스입니다.
     ICS 파일을 지정된 기간 동안 저장하고 재사용합니다.
+    캐시의 생성 시각, 크기, 해시 등의 메타데이터는 SQLite 인덱스에 따로 보관하여
+    캐시 적중 여부를 파일을 읽지 않고 판단합니다.
+    memory가 주어지면 자주 요청되는 캘린더의 본문과 메타데이터를 메모리에도 보관하여
+    파일 시스템을 거치지 않고 응답합니다. (cache/<atpt>/<code>.ics 파일이 영구 저장소입니다.)
     """
-    def __init__(self, base_dir: str, duration_days: int):
+    def __init__(self, base_dir: str, duration_days: int, max_stale_days: int = 0,
+                 encodings: Iterable[str] = ("br", "gzip"), memory: Optional[MemoryCache] = None):
         self.base_dir = Path(base_dir)
         self.duration = timedelta(days=duration_days)
+        # 만료 이후에도 오래된(stale) 캐시를 제공할 수 있는 최대 기간
+        self.max_stale = timedelta(days=max_stale_days)
+        # set() 시 함께 저장할 미리 압축된 변형의 인코딩 (선호 순서)
+        self.encodings = available_encodings(encodings)
+        self.memory = memory
+        self._index: Optional[CacheIndex] = None
+        self._events: Optional[EventStore] = None
+
+    @property
+    def index(self) -> CacheIndex:
+        """base_dir에 해당하는 메타데이터 인덱스를 반환합니다. base_dir이 바뀌면 새로 엽니다."""
+        index_path = self.base_dir / INDEX_FILE_NAME
+        if self._index is None or self._index.db_path != index_path:
+            if self._index is not None:
+                self._index.close()
+            self._index = CacheIndex(index_path)
+        return self._index
+
+    @property
+    def events(self) -> EventStore:
+        """base_dir에 해당하는 이벤트 저장소를 반환합니다. base_dir이 바뀌면 새로 엽니다."""
+        events_path = self.base_dir / EVENTS_FILE_NAME
+        if self._events is None or self._events.db_path != events_path:
+            if self._events is not None:
+                self._events.close()
+            self._events = EventStore(events_path)
+        return self._events
 
     def _get_file_path(self, atpt_code: str, school_code: int) -> Path:
         """캐시 키에 해당하는 파일 경로를 생성합니다."""
+        check_cache_key(atpt_code, school_code)
         return self.base_dir / atpt_code / f"{school_code}.ics"
 
+    def lock(self, atpt_code: str, school_code) -> FileLock:
+        """
+        키별 프로세스 간 잠금을 반환합니다. 여러 워커 중 한 프로세스만 같은 캘린더를 다시 생성하도록 합니다.
+        잠금 파일은 키를 삭제할 때 잠금을 가진 상태에서만 지웁니다. (FileLock.unlink 참고)
+        """
+        check_cache_key(atpt_code, school_code)
+        return FileLock(self.base_dir / atpt_code / f".{school_code}.lock")
+
+    def _get_encoded_path(self, atpt_code: str, school_code: int, encoding: str) -> Path:
+        """미리 압축된 변형 파일의 경로를 생성합니다. (예: cache/B10/1234.ics.gz)"""
+        file_path = self._get_file_path(atpt_code, school_code)
+        return file_path.with_name(file_path.name + COMPRESSED_SUFFIXES[encoding])
+
+    def get_encoded_path(self, atpt_code: str, school_code: int, encoding: str) -> Optional[Path]:
+        """미리 압축된 변형 파일이 있으면 그 경로를, 없으면 None을 반환합니다."""
+        if encoding not in COMPRESSED_SUFFIXES:
+            return None
+        encoded_path = self._get_encoded_path(atpt_code, school_code, encoding)
+        return encoded_path if encoded_path.exists() else None
+
+    def _index_from_file(self, atpt_code: str, school_code: int, file_path: Path) -> Optional[CacheEntry]:
+        """
+        인덱스에 없거나 인덱스와 다른 캐시 파일을 한 번 읽어 메타데이터를 채웁니다.
+        (인덱스 도입 전에 만들어진 캐시 파일이나 외부에서 바뀐 파일을 위한 경로입니다.)
+        """
+        try:
+            data = file_path.read_bytes()
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+
+        try:
+            created_time = parse_created_time(data.decode("utf8"))
+        except ValueError as e:
+            # 파일 읽기 또는 파싱 중 오류 발생 시 생성 시각을 알 수 없는 항목으로 기록합니다.
+            print(f"Error reading cache file '{file_path}', treating as miss: {e}")
+            created_time = None
+
+        entry = CacheEntry(
+            atpt_code=atpt_code,
+            school_code=str(school_code),
+            created_time=created_time,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+        self.index.put(entry)
+        return entry
+
+    def _memory_key(self, atpt_code: str, school_code: int) -> tuple:
+        return (str(self.base_dir), atpt_code, str(school_code))
+
+    def get_entry(self, atpt_code: str, school_code: int, use_memory: bool = True) -> Optional[CacheEntry]:
+        """
+        캐시 항목의 메타데이터를 반환합니다. 캐시 파일이 없으면 None을 반환합니다.
+        메모리 계층에 있으면 그 값을, 없으면 인덱스 조회와 stat 한 번으로 판단합니다.
+        """
+        if use_memory and self.memory is not None:
+            item = self.memory.get(self._memory_key(atpt_code, school_code))
+            if item is not None:
+                return item.entry
+
+        file_path = self._get_file_path(atpt_code, school_code)
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+
+        entry = self.index.get(atpt_code, school_code)
+        if entry is None or entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns:
+            # 인덱스에 없거나 파일이 인덱스 기록 이후 바뀐 경우에만 파일을 읽습니다.
+            entry = self._index_from_file(atpt_code, school_code, file_path)
+        if entry is not None and self.memory is not None:
+            self.memory.revalidate(self._memory_key(atpt_code, school_code), entry)
+        return entry
+
+    def _age(self, entry: Optional[CacheEntry], now_func) -> Optional[timedelta]:
+        """
+        캐시 항목의 경과 시간을 반환합니다. 생성 시각을 알 수 없으면 None을 반환합니다.
+        내용 변경 없이 다시 확인(touch)된 항목은 마지막 확인 시각부터 계산합니다.
+        """
+        if entry is None or entry.created_time is None:
+            return None
+        validated_time = entry.created_time
+        if entry.checked_time is not None and entry.checked_time > validated_time:
+            validated_time = entry.checked_time
+        # UTC 기준으로 비교하기 위해 모든 시간을 aware datetime으로 통일합니다.
+        return now_func() - validated_time
+
+    def max_age(self, entry: CacheEntry, now_func=lambda: datetime.now(timezone.utc)) -> int:
+        """캐시 항목이 만료되기까지 남은 시간(초)을 반환합니다. Cache-Control: max-age에 사용합니다."""
+        age = self._age(entry, now_func)
+        if age is None:
+            return 0
+        return max(0, int((self.duration - age).total_seconds()))
+
     def get(self, atpt_code: str, school_code: int, now_func=lambda: datetime.now(timezone.utc)) -> Optional[Path]:
         """
         유효한 캐시 항목을 확인하고, 존재할 경우 파일 경로를 반환합니다.
         캐시가 없거나 만료된 경우 None을 반환합니다.
         테스트를 위해 현재 시간을 주입할 수 있도록 now_func 파라미터를 추가합니다.
         """
-        file_path = self._get_file_path(atpt_code, school_code)
+        age = self._age(self.get_entry(atpt_code, school_code), now_func)
+        if age is not None and age >= self.duration and self.memory is not None:
+            # 다른 워커가 갱신했을 수 있으므로 만료로 판단하기 전에 인덱스를 다시 확인합니다.
+            age = self._age(self.get_entry(atpt_code, school_code, use_memory=False), now_func)
+        if age is None:
+            return None
 
-        if not file_path.exists():
+        if age < self.duration:
+            print(f"Cache hit for {atpt_code}/{school_code}.")
+            return self._get_file_path(atpt_code, school_code)
+        else:
+            print(f"Cache expired for {atpt_code}/{school_code}.")
             return None
 
+    def get_stale(self, atpt_code: str, school_code: int, now_func=lambda: datetime.now(timezone.utc)) -> Optional[Path]:
+        """
+        만료되었더라도 허용된 기간(유지 기간 + max_stale) 안에 있는 캐시 파일 경로를 반환합니다.
+        stale-while-revalidate 응답이나 NEIS 장애 시의 대체 응답에 사용합니다.
+        """
+        age = self._age(self.get_entry(atpt_code, school_code), now_func)
+        if age is None:
+            return None
+
+        if age < self.duration + self.max_stale:
+            print(f"Serving stale cache for {atpt_code}/{school_code}.")
+            return self._get_file_path(atpt_code, school_code)
+        return None
+
+    def read_bytes(self, atpt_code: str, school_code: int, entry: CacheEntry,
+                   encoding: Optional[str] = None) -> Optional[bytes]:
+        """
+        캐시 본문(encoding이 주어지면 압축 변형)을 바이트로 반환합니다.
+        메모리 계층에 같은 버전(entry.sha256)이 있으면 파일을 읽지 않고, 없으면 파일을 읽어 메모리에 올립니다.
+        파일이 없으면 None을 반환합니다.
+        """
+        key = self._memory_key(atpt_code, school_code)
+        if self.memory is not None:
+            item = self.memory.get(key)
+            if item is not None and item.entry.sha256 == entry.sha256 and encoding in item.bodies:
+                return item.bodies[encoding]
+
+        path = self._get_encoded_path(atpt_code, school_code, encoding) if encoding else self._get_file_path(atpt_code, school_code)
         try:
-            content = file_path.read_text(encoding="utf8")
-            # icalendar 라이브러리가 생성하는 실제 포맷(YYYY-MM-DD HH:MM:SS.ffffff+zz:zz)을 파싱합니다.
-            match = re.search(r'X-CREATED-TIME:(.+)', content)
-
-            if not match:
-                return None
-
-            created_time_str = match.group(1).strip()
-            # fromisoformat는 이 포맷을 직접 처리할 수 있습니다.
-            created_time_aware = datetime.fromisoformat(created_time_str)
-
-            # UTC 기준으로 비교하기 위해 모든 시간을 aware datetime으로 통일합니다.
-            now_aware = now_func()
-            if now_aware - created_time_aware < self.duration:
-                print(f"Cache hit for {atpt_code}/{school_code}.")
-                return file_path
-            else:
-                print(f"Cache expired for {atpt_code}/{school_code}.")
-                return None
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return None
 
-        except (ValueError, IndexError, FileNotFoundError) as e:
-            # 파일 읽기 또는 파싱 중 오류 발생 시 캐시 미스로 처리합니다.
-            print(f"Error reading cache file '{file_path}', treating as miss: {e}")
+        if self.memory is not None:
+            self.memory.add_body(key, entry, encoding, body)
+        return body
+
+    def touch(self, atpt_code: str, school_code: int, now_func=lambda: datetime.now(timezone.utc)) -> Optional[Path]:
+        """
+        캐시 내용을 다시 쓰지 않고 유효 기간만 연장합니다.
+        원본 데이터가 바뀌지 않았을 때 사용하여 파일의 바이트(그리고 ETag)를 그대로 유지합니다.
+        """
+        entry = self.get_entry(atpt_code, school_code)
+        if entry is None:
             return None
+        touched = dataclasses.replace(entry, checked_time=now_func())
+        self.index.put(touched)
+        if self.memory is not None:
+            item = self.memory.get(self._memory_key(atpt_code, school_code))
+            if item is not None and item.entry.sha256 == touched.sha256:
+                self.memory.put(self._memory_key(atpt_code, school_code), touched, item.bodies)
+        print(f"Cache revalidated for {atpt_code}/{school_code}.")
+        return self._get_file_path(atpt_code, school_code)
 
-    def set(self, atpt_code: str, school_code: int, content: str) -> Path:
+    def set(self, atpt_code: str, school_code: int, content: str, fingerprint: Optional[str] = None,
+            compressed: Optional[dict[str, bytes]] = None) -> Path:
         """
-        주어진 콘텐츠를 캐시 파일에 저장합니다.
+        주어진 콘텐츠를 캐시 파일에 저장하고, 메타데이터를 인덱스에 기록합니다.
+        fingerprint에는 캘린더를 만든 원본 데이터의 지문을 함께 기록할 수 있습니다.
+        compressed에 compress_bodies()로 미리 압축한 변형을 주면 그 인코딩은 다시 압축하지 않습니다.
         """
         file_path = self._get_file_path(atpt_code, school_code)
         # 파일 경로의 디렉토리가 존재하는지 확인하고 없으면 생성합니다.
         ensure_directory_existence(str(file_path))
 
-        file_path.write_text(content, encoding="utf8")
+        data = content.encode("utf8")
+        try:
+            created_time = parse_created_time(content)
+        except ValueError:
+            created_time = None
+
+        bodies = {None: data}
+        for encoding in self.encodings:
+            bodies[encoding] = compressed[encoding] if compressed and encoding in compressed else compress(encoding, data)
+
+        # 미리 압축된 변형을 먼저 쓰고 원본을 마지막에 써서,
+        # 인덱스가 새 원본을 가리킬 때는 변형도 이미 새 내용이 되도록 합니다.
+        for encoding in self.encodings:
+            atomic_write_bytes(self._get_encoded_path(atpt_code, school_code, encoding), bodies[encoding])
+        for encoding in COMPRESSED_SUFFIXES:
+            if encoding not in self.encodings:
+                # 설정에서 빠진 인코딩의 예전 변형이 남아 오래된 내용을 제공하지 않도록 지웁니다.
+                self._get_encoded_path(atpt_code, school_code, encoding).unlink(missing_ok=True)
+
+        # 임시 파일에 쓴 뒤 rename하므로 다른 워커가 쓰다 만 파일을 읽는 일이 없습니다.
+        atomic_write_bytes(file_path, data)
+        stat = file_path.stat()
+        entry = CacheEntry(
+            atpt_code=atpt_code,
+            school_code=str(school_code),
+            created_time=created_time,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=hashlib.sha256(data).hexdigest(),
+            fingerprint=fingerprint,
+        )
+        self.index.put(entry)
+        if self.memory is not None:
+            self.memory.put(self._memory_key(atpt_code, school_code), entry, bodies)
         print(f"Cache created/updated for {atpt_code}/{school_code}.")
         return file_path
 
+    async def set_async(self, atpt_code: str, school_code: int, content: str, fingerprint: Optional[str] = None,
+                        compressed: Optional[dict[str, bytes]] = None) -> Path:
+        """
+        set()을 별도 스레드에서 실행합니다. 압축과 파일 쓰기가 이벤트 루프를 막지 않도록
+        요청 처리 중에 캐시를 저장할 때는 이 메서드를 사용합니다.
+        """
+        return await asyncio.to_thread(self.set, atpt_code, school_code, content, fingerprint, compressed)
+
+    async def touch_async(self, atpt_code: str, school_code: int,
+                          now_func=lambda: datetime.now(timezone.utc)) -> Optional[Path]:
+        """touch()를 별도 스레드에서 실행합니다. 인덱스 갱신이 이벤트 루프를 막지 않도록 합니다."""
+        return await asyncio.to_thread(self.touch, atpt_code, school_code, now_func)
+
+    def _key_paths(self, atpt_code: str, school_code) -> list[Path]:
+        """키에 속한 모든 파일(원본과 압축 변형)의 경로를 반환합니다."""
+        file_path = self._get_file_path(atpt_code, school_code)
+        return [file_path] + [
+            file_path.with_name(file_path.name + suffix) for suffix in COMPRESSED_SUFFIXES.values()
+        ]
+
+    def delete(self, atpt_code: str, school_code) -> int:
+        """
+        캐시 항목(원본, 압축 변형, 인덱스, 메모리)을 삭제하고 회수한 바이트 수를 반환합니다.
+        파일을 먼저 지우고 인덱스를 나중에 지우므로, 동시에 들어온 요청은 캐시 미스로 처리됩니다.
+        """
+        reclaimed = 0
+        for path in self._key_paths(atpt_code, school_code):
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                reclaimed += size
+            except FileNotFoundError:
+                pass
+        self.index.delete(atpt_code, school_code)
+        if self.memory is not None:
+            self.memory.invalidate(self._memory_key(atpt_code, school_code))
+        return reclaimed
+
+    def _delete_unlocked(self, atpt_code: str, school_code) -> Optional[int]:
+        """
+        다른 프로세스가 다시 생성 중이 아니면 키를 잠금 파일까지 삭제하고 회수한 바이트 수를 반환합니다.
+        생성 중인 키는 건너뛰고 None을 반환합니다.
+        """
+        lock = self.lock(atpt_code, school_code)
+        if not lock.acquire(blocking=False):
+            return None
+        try:
+            reclaimed = self.delete(atpt_code, school_code)
+            lock.unlink()
+        finally:
+            lock.release()
+        return reclaimed
+
+    def trim(self, atpt_code: str, max_entries: int) -> int:
+        """
+        교육청 코드(디렉토리) 하나의 항목이 max_entries개를 넘으면 가장 오래 확인되지 않은 항목부터 삭제하고,
+        삭제한 항목 수를 반환합니다. 요청마다 새 키가 생길 수 있는 캐시(합친 캘린더 등)의 크기를 제한합니다.
+        """
+        entries = self.index.all(atpt_code)
+        if len(entries) <= max_entries:
+            return 0
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        entries.sort(key=lambda entry: max(entry.created_time or oldest, entry.checked_time or oldest))
+        removed = 0
+        for entry in entries[:len(entries) - max_entries]:
+            if self._delete_unlocked(entry.atpt_code, entry.school_code) is not None:
+                removed += 1
+        if removed:
+            print(f"Cache trimmed {removed} entries from {atpt_code}.")
+        return removed
+
+    def collect_garbage(self, max_age: Optional[timedelta] = None, max_total_bytes: Optional[int] = None,
+                        dry_run: bool = False, now_func=lambda: datetime.now(timezone.utc)) -> dict:
+        """
+        오래되었거나 용량 예산을 넘는 캐시 파일을 삭제하고 결과를 보고합니다.
+        1. 마지막 확인 시각으로부터 max_age가 지난 항목(기본값: 유지 기간 + max_stale)을 삭제합니다.
+        2. 남은 전체 크기가 max_total_bytes를 넘으면 가장 오래된 항목부터 삭제합니다.
+        3. 파일이 없어진 인덱스 항목을 정리합니다.
+        4. 이벤트 저장소에서 max_age 동안 다시 받지 않은 학교의 학사일정을 삭제합니다.
+        dry_run이면 실제로 삭제하지 않고 삭제될 양만 계산합니다.
+        """
+        if max_age is None:
+            max_age = self.duration + self.max_stale
+
+        report = {
+            "scanned": 0,
+            "removed_expired": 0,
+            "removed_for_budget": 0,
+            "removed_orphans": 0,
+            "removed_event_schools": 0,
+            "reclaimed_bytes": 0,
+            "remaining_bytes": 0,
+            "dry_run": dry_run,
+        }
+
+        def _remove(atpt_code, school_code, size) -> bool:
+            if dry_run:
+                report["reclaimed_bytes"] += size
+                return True
+            reclaimed = self._delete_unlocked(atpt_code, school_code)
+            if reclaimed is None:
+                return False
+            report["reclaimed_bytes"] += reclaimed
+            return True
+
+        survivors = []
+        for file_path in sorted(self.base_dir.glob("*/*.ics")):
+            atpt_code, school_code = file_path.parent.name, file_path.stem
+            report["scanned"] += 1
+            size = sum(path.stat().st_size for path in self._key_paths(atpt_code, school_code) if path.exists())
+            age = self._age(self.get_entry(atpt_code, school_code, use_memory=False), now_func)
+
+            if age is None or age >= max_age:
+                if _remove(atpt_code, school_code, size):
+                    report["removed_expired"] += 1
+                    continue
+                # 다시 생성 중이므로 곧 새 항목이 됩니다.
+                survivors.append((timedelta(0), atpt_code, school_code, size))
+            else:
+                survivors.append((age, atpt_code, school_code, size))
+
+        total = sum(item[3] for item in survivors)
+        if max_total_bytes is not None:
+            # 가장 오래된(나이가 많은) 항목부터 삭제합니다.
+            survivors.sort(key=lambda item: item[0], reverse=True)
+            while survivors and total > max_total_bytes:
+                _, atpt_code, school_code, size = survivors.pop(0)
+                if _remove(atpt_code, school_code, size):
+                    report["removed_for_budget"] += 1
+                    total -= size
+
+        # 쓰기 도중 프로세스가 종료되어 남은 임시 파일을 정리합니다.
+        for tmp_path in self.base_dir.glob("*/.*.tmp"):
+            try:
+                stat = tmp_path.stat()
+                if time.time() - stat.st_mtime > STALE_TEMP_FILE_SECONDS:
+                    if not dry_run:
+                        tmp_path.unlink()
+                    report["reclaimed_bytes"] += stat.st_size
+            except FileNotFoundError:
+                pass
+
+        for entry in self.index.all():
+            if not self._get_file_path(entry.atpt_code, entry.school_code).exists():
+                report["removed_orphans"] += 1
+                if not dry_run:
+                    self.index.delete(entry.atpt_code, entry.school_code)
+
+        # 오랫동안 요청되지 않아 다시 받지 않은 학교의 원본 학사일정도 정리합니다.
+        if not dry_run:
+            report["removed_event_schools"] = self.events.delete_older_than(now_func() - max_age)
+
+        report["remaining_bytes"] = total
+        print(
+            f"Cache GC: scanned {report['scanned']}, removed {report['removed_expired']} expired"
+            f" and {report['removed_for_budget']} over budget, reclaimed {report['reclaimed_bytes']} bytes."
+        )
+        return report
+
 # 애플리케이션 전역에서 사용할 단일 캐시 서비스 인스턴스를 생성합니다.
 # 설정 파일에서 캐시 유지 기간을 가져와 초기화합니다.
 cache_service = CacheService(
     base_dir="cache",
-    duration_days=settings.get('cache_day', 7)
+    duration_days=settings.get('cache_day', 7),
+    max_stale_days=settings.get('max_stale_day', 7),
+    encodings=settings.get('cache_compression', ["br", "gzip"]),
+    # memory_cache_mb가 0이면 메모리 계층을 사용하지 않습니다.
+    memory=MemoryCache(
+        max_bytes=settings.get('memory_cache_mb', 64) * 1024 * 1024,
+        ttl_seconds=settings.get('memory_cache_ttl', 60),
+    ) if settings.get('memory_cache_mb', 64) > 0 else None
 )
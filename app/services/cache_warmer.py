@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.services.cache_service import CacheService, cache_service
+from app.services.neis_guard import TokenBucket
+
+WARM_MODES = ("top_k", "all")
+
+class CacheWarmer:
+    """
+    실제로 요청된 학교의 캘린더를 만료되기 조금 전에 백그라운드에서 미리 다시 만드는 작업자입니다.
+    사용자 요청이 만료된 캐시를 만나 NEIS 응답을 기다리는 일이 거의 없도록 합니다.
+    mode가 "top_k"이면 가장 많이 요청된 top_k개 학교만, "all"이면 요청된 모든 학교를 갱신합니다.
+    같은 시각에 만들어진 캐시가 한꺼번에 갱신되지 않도록 학교마다 갱신 시점을 lead 구간 안에서 나누고,
+    동시 갱신 수(concurrency)와 초당 갱신 수(rate)를 제한합니다.
+    """
+    def __init__(self, cache: CacheService, interval_seconds: float, lead_minutes: float = 60,
+                 mode: str = "top_k", top_k: int = 100, concurrency: int = 2, rate: float = 1,
+                 max_tracked: int = 10000, forget_after: Optional[timedelta] = None):
+        if mode not in WARM_MODES:
+            raise ValueError(f"cache_warm_mode must be one of {WARM_MODES}, got {mode!r}")
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.lead_minutes = lead_minutes
+        self.mode = mode
+        self.top_k = top_k
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate, burst=1)
+        self.max_tracked = max_tracked
+        # 이 기간 동안 요청되지 않은 학교는 더 이상 갱신하지 않습니다.
+        self.forget_after = forget_after if forget_after is not None else cache.duration * 2
+        # (교육청 코드, 학교 코드) → [요청 수, 마지막 요청 시각(monotonic)]
+        self._demand: dict[tuple[str, int], list] = {}
+        # 갱신에 실패한 학교는 lead 구간 동안 다시 시도하지 않습니다.
+        self._retry_after: dict[tuple[str, int], float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._handler: Optional[Callable[[str, int], Awaitable]] = None
+        self.untracked = 0
+        self.passes = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    def record(self, atpt_code: str, school_code: int):
+        """학교 캘린더가 요청되었음을 기록합니다. 추적 중인 학교가 max_tracked개이면 새 학교는 기록하지 않습니다."""
+        key = (atpt_code, int(school_code))
+        demand = self._demand.get(key)
+        if demand is None:
+            if len(self._demand) >= self.max_tracked:
+                self.untracked += 1
+                return
+            demand = self._demand[key] = [0, 0.0]
+        demand[0] += 1
+        demand[1] = time.monotonic()
+
+    def _lead_seconds(self, key: tuple[str, int]) -> float:
+        """
+        만료 몇 초 전에 갱신할지 반환합니다. 학교마다 lead 구간의 절반에서 전체 사이로 다르게 두어,
+        한꺼번에 만들어진 캐시(일괄 생성, 재시작 직후 등)도 갱신은 시간에 고르게 나뉘도록 합니다.
+        """
+        digest = hashlib.sha1(f"{key[0]}:{key[1]}".encode("utf-8")).digest()
+        fraction = int.from_bytes(digest[:4], "big") / 0xFFFFFFFF
+        return self.lead_minutes * 60 * (0.5 + 0.5 * fraction)
+
+    def due_schools(self, now: Optional[datetime] = None) -> list[tuple[str, int]]:
+        """지금 갱신해야 하는 학교 목록을 요청이 많은 순서대로 반환합니다."""
+        return self._select_due(self._candidates(), now or datetime.now(timezone.utc))
+
+    def _candidates(self) -> list[tuple[str, int]]:
+        """
+        오래 요청되지 않은 학교를 잊고, 갱신을 검토할 학교 목록을 요청이 많은 순서대로 반환합니다.
+        요청 기록(_demand)을 다루므로 이벤트 루프에서 실행합니다.
+        """
+        clock = time.monotonic()
+        forget_seconds = self.forget_after.total_seconds()
+        for key in [key for key, (_, last_seen) in self._demand.items() if clock - last_seen > forget_seconds]:
+            del self._demand[key]
+            self._retry_after.pop(key, None)
+
+        candidates = sorted(self._demand, key=lambda key: self._demand[key][0], reverse=True)
+        if self.mode == "top_k":
+            candidates = candidates[:self.top_k]
+        return [key for key in candidates if self._retry_after.get(key, 0) <= clock]
+
+    def _select_due(self, candidates: list[tuple[str, int]], now: datetime) -> list[tuple[str, int]]:
+        """후보 중 만료가 lead 구간 안으로 다가온 학교를 고릅니다. 인덱스(SQLite)를 조회하므로 별도 스레드에서 실행할 수 있습니다."""
+        due = []
+        for key in candidates:
+            # 다른 워커가 이미 갱신했을 수 있으므로 메모리 계층이 아닌 인덱스를 확인합니다.
+            entry = self.cache.get_entry(*key, use_memory=False)
+            if entry is None or entry.created_time is None:
+                # 아직 한 번도 만들어지지 않았거나 만들 수 없는 학교(404 등)는 사용자 요청에 맡깁니다.
+                continue
+            if self.cache.max_age(entry, lambda: now) <= self._lead_seconds(key):
+                due.append(key)
+        return due
+
+    async def warm_due(self) -> int:
+        """갱신할 때가 된 학교들을 concurrency와 rate 제한 안에서 갱신하고, 갱신한 학교 수를 반환합니다."""
+        # 학교마다 인덱스를 조회하므로 이벤트 루프를 막지 않도록 별도 스레드에서 고릅니다.
+        due = await asyncio.to_thread(self._select_due, self._candidates(), datetime.now(timezone.utc))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        refreshed = 0
+
+        async def warm(key: tuple[str, int]):
+            nonlocal refreshed
+            async with semaphore:
+                await self.bucket.acquire()
+                try:
+                    await self._handler(*key)
+                    refreshed += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # 기존 캐시는 그대로 남아 있으므로 로그만 남기고 다음 lead 구간에 다시 시도합니다.
+                    self.failed += 1
+                    self._retry_after[key] = time.monotonic() + self.lead_minutes * 60
+                    print(f"Cache warming failed for {key[0]}/{key[1]}: {e}")
+
+        await asyncio.gather(*(warm(key) for key in due))
+        self.passes += 1
+        self.refreshed += refreshed
+        return refreshed
+
+    def start(self, handler: Callable[[str, int], Awaitable]):
+        """
+        갱신 작업을 처리할 handler를 등록하고 주기적 실행을 시작합니다.
+        interval_seconds가 0 이하이면 시작하지 않습니다. (요청 기록은 계속합니다.)
+        """
+        self._handler = handler
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 실행을 중단합니다."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.warm_due()
+            except Exception as e:
+                print(f"Cache warming pass failed: {e}")
+
+    def stats(self) -> dict:
+        """모니터링을 위한 값을 반환합니다."""
+        return {
+            "running": self._task is not None,
+            "mode": self.mode,
+            "tracked": len(self._demand),
+            "untracked": self.untracked,
+            "passes": self.passes,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+        }
+
+# 애플리케이션 전역에서 사용할 단일 캐시 예열 작업자 인스턴스입니다.
+cache_warmer = CacheWarmer(
+    cache_service,
+    interval_seconds=settings.get('cache_warm_interval', 60),
+    lead_minutes=settings.get('cache_warm_lead_minutes', 60),
+    mode=settings.get('cache_warm_mode', "top_k"),
+    top_k=settings.get('cache_warm_top_k', 100),
+    concurrency=settings.get('cache_warm_concurrency', 2),
+    rate=settings.get('cache_warm_rate', 1),
+    max_tracked=settings.get('cache_warm_max_tracked', 10000),
+)
@@ -0,0 +1,191 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.services.ics_converter import GRADE_EVENT_FIELDS
+
+@dataclass(frozen=True)
+class StoredSchedule:
+    """이벤트 저장소에 보관된 학교 하나의 학사일정입니다."""
+    atpt_code: str
+    school_code: str
+    school_name: str
+    fingerprint: Optional[str]  # 원본 NEIS 데이터의 지문 (ScheduleRows.fingerprint)
+    fetched_time: datetime      # NEIS에서 마지막으로 받은(또는 바뀌지 않았음을 확인한) 시각
+    rows: list[dict]            # NEIS 응답과 같은 열 이름의 학사일정 행
+
+# events 테이블의 열(event_date, event_name, description, location, day_type)에 대응하는 NEIS 열 이름
+EVENT_COLUMNS = ('AA_YMD', 'EVENT_NM', 'EVENT_CNTNT', 'SCHUL_NM', 'SBTR_DD_SC_NM')
+
+def _grade_mask(row: dict) -> int:
+    """학년별 행사 여부 열(ONE_GRADE_EVENT_YN 등)을 비트마스크로 바꿉니다. (1학년이 가장 낮은 비트)"""
+    return sum(1 << position for position, field in enumerate(GRADE_EVENT_FIELDS) if row.get(field) == 'Y')
+
+class EventStore:
+    """
+    NEIS에서 받은 학사일정 행을 학교별 이벤트 레코드로 SQLite에 보관하는 저장소입니다.
+    캘린더(ICS)는 이 레코드로부터 만들어지므로, 공휴일 제외나 학년별 캘린더 같은 변형을
+    NEIS를 다시 호출하지 않고 만들 수 있습니다.
+    CacheIndex와 같이 WAL 모드를 사용하여 여러 워커 프로세스가 함께 사용할 수 있습니다.
+    """
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """
+        DB 연결을 반환합니다. create가 False이고 DB 파일이 아직 없으면
+        불필요하게 파일을 만들지 않도록 None을 반환합니다.
+        """
+        if self._conn is not None:
+            return self._conn
+        if not create and not self.db_path.exists():
+            return None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schools (
+                atpt_code TEXT NOT NULL,
+                school_code TEXT NOT NULL,
+                school_name TEXT NOT NULL,
+                fingerprint TEXT,
+                fetched_time TEXT NOT NULL,
+                PRIMARY KEY (atpt_code, school_code)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                atpt_code TEXT NOT NULL,
+                school_code TEXT NOT NULL,
+                event_date TEXT,
+                event_name TEXT,
+                description TEXT,
+                location TEXT,
+                day_type TEXT,
+                grades INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS events_school ON events (atpt_code, school_code)")
+        self._conn = conn
+        return conn
+
+    def put(self, atpt_code: str, school_code, school_name: str, rows: Iterable[dict],
+            fingerprint: Optional[str], fetched_time: datetime):
+        """학교의 학사일정 행을 모두 새 행으로 바꿉니다. 하나의 트랜잭션으로 처리합니다."""
+        records = [
+            (atpt_code, str(school_code), *(row.get(field) for field in EVENT_COLUMNS), _grade_mask(row))
+            for row in rows
+        ]
+        with self._lock:
+            conn = self._connect(create=True)
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "DELETE FROM events WHERE atpt_code = ? AND school_code = ?",
+                    (atpt_code, str(school_code)),
+                )
+                conn.executemany(
+                    "INSERT INTO events"
+                    " (atpt_code, school_code, event_date, event_name, description, location, day_type, grades)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    records,
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO schools (atpt_code, school_code, school_name, fingerprint, fetched_time)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (atpt_code, str(school_code), school_name, fingerprint, fetched_time.isoformat()),
+                )
+
+    def touch(self, atpt_code: str, school_code, fetched_time: datetime) -> bool:
+        """
+        행을 다시 쓰지 않고 마지막으로 확인한 시각만 갱신합니다.
+        NEIS 데이터가 바뀌지 않았을 때 사용합니다. 저장된 학교가 없으면 False를 반환합니다.
+        """
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return False
+            cursor = conn.execute(
+                "UPDATE schools SET fetched_time = ? WHERE atpt_code = ? AND school_code = ?",
+                (fetched_time.isoformat(), atpt_code, str(school_code)),
+            )
+        return cursor.rowcount > 0
+
+    def fetched_time(self, atpt_code: str, school_code) -> Optional[datetime]:
+        """학교의 학사일정을 마지막으로 받은 시각을 반환합니다. 행을 읽지 않으므로 신선도 확인에 사용합니다."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT fetched_time FROM schools WHERE atpt_code = ? AND school_code = ?",
+                (atpt_code, str(school_code)),
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def get(self, atpt_code: str, school_code) -> Optional[StoredSchedule]:
+        """학교의 학사일정을 반환합니다. 저장된 적이 없으면 None을 반환합니다."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return None
+            school = conn.execute(
+                "SELECT school_name, fingerprint, fetched_time FROM schools WHERE atpt_code = ? AND school_code = ?",
+                (atpt_code, str(school_code)),
+            ).fetchone()
+            if school is None:
+                return None
+            records = conn.execute(
+                "SELECT event_date, event_name, description, location, day_type, grades FROM events"
+                " WHERE atpt_code = ? AND school_code = ? ORDER BY rowid",
+                (atpt_code, str(school_code)),
+            ).fetchall()
+
+        rows = []
+        for *values, grades in records:
+            # 원본 행에 없던 열은 다시 만들지 않습니다.
+            row = {field: value for field, value in zip(EVENT_COLUMNS, values) if value is not None}
+            for position, field in enumerate(GRADE_EVENT_FIELDS):
+                row[field] = 'Y' if grades & (1 << position) else 'N'
+            rows.append(row)
+        return StoredSchedule(
+            atpt_code=atpt_code,
+            school_code=str(school_code),
+            school_name=school[0],
+            fingerprint=school[1],
+            fetched_time=datetime.fromisoformat(school[2]),
+            rows=rows,
+        )
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """cutoff 이전에 마지막으로 확인한 학교의 학사일정을 삭제하고, 삭제한 학교 수를 반환합니다."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return 0
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                stale = conn.execute(
+                    "SELECT atpt_code, school_code FROM schools WHERE fetched_time < ?", (cutoff.isoformat(),)
+                ).fetchall()
+                conn.executemany("DELETE FROM events WHERE atpt_code = ? AND school_code = ?", stale)
+                conn.executemany("DELETE FROM schools WHERE atpt_code = ? AND school_code = ?", stale)
+        return len(stale)
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,7 +1,9 @@
+import hashlib
+import json
 import uuid
+from typing import Iterator, NamedTuple, Optional, Union
 from datetime import datetime, timezone, timedelta
 from app.utils.date_utils import parse_date
-from icalendar import Calendar, Event, Alarm
 
 # UID 생성을 위한 네임스페이스 정의
 ICS_NAMESPACE = uuid.NAMESPACE_DNS
@@ -24,7 +26,8 @@ def _group_consecutive_events(event_rows: list) -> list:
     current_group = None
 
     for event in sorted_events:
-        event_name = event.get('EVENT_NM')
+        # NEIS는 값이 없는 열을 null로 보내기도 하므로 None은 빈 문자열로 다룹니다.
+        event_name = event.get('EVENT_NM') or ''
         try:
             event_date = parse_date(event['AA_YMD'])
         except (KeyError, ValueError):
@@ -36,8 +39,8 @@ def _group_consecutive_events(event_rows: list) -> list:
                 'name': event_name,
                 'start_date': event_date,
                 'end_date': event_date,
-                'description': event.get('EVENT_CNTNT', ''),
-                'location': event.get('SCHUL_NM', '')
+                'description': event.get('EVENT_CNTNT') or '',
+                'location': event.get('SCHUL_NM') or ''
             }
         elif event_name == current_group['name'] and event_date == current_group['end_date'] + timedelta(days=1):
             # 그룹 확장
@@ -49,8 +52,8 @@ def _group_consecutive_events(event_rows: list) -> list:
                 'name': event_name,
                 'start_date': event_date,
                 'end_date': event_date,
-                'description': event.get('EVENT_CNTNT', ''),
-                'location': event.get('SCHUL_NM', '')
+                'description': event.get('EVENT_CNTNT') or '',
+                'location': event.get('SCHUL_NM') or ''
             }
 
     # 마지막 그룹 추가
@@ -59,68 +62,293 @@ def _group_consecutive_events(event_rows: list) -> list:
 
     return grouped_events
 
-def convert_to_ics(data: dict, school_name: str) -> str:
+def _collect_rows(data: dict) -> list:
+    """NEIS API 응답에서 학사일정 행(row) 목록을 모두 꺼냅니다."""
+    all_event_rows = []
+    for item in data.get('SchoolSchedule', []):
+        if 'row' in item:
+            all_event_rows.extend(item.get('row', []))
+    return all_event_rows
+
+# 학년별 행사 여부 열 (1~6학년, 값은 "Y"/"N")
+GRADE_EVENT_FIELDS = (
+    'ONE_GRADE_EVENT_YN', 'TW_GRADE_EVENT_YN', 'THREE_GRADE_EVENT_YN',
+    'FR_GRADE_EVENT_YN', 'FIV_GRADE_EVENT_YN', 'SIX_GRADE_EVENT_YN',
+)
+# ICS 변환과 변형(CalendarVariant) 선택에 사용하는 학사일정 행의 열
+# SBTR_DD_SC_NM은 수업공제일명으로 "해당없음", "휴업일", "공휴일" 중 하나입니다.
+ICS_ROW_FIELDS = ('AA_YMD', 'EVENT_NM', 'EVENT_CNTNT', 'SCHUL_NM', 'SBTR_DD_SC_NM') + GRADE_EVENT_FIELDS
+# exclude_holidays 변형에서 빼는 수업공제일명
+HOLIDAY_DAY_TYPES = frozenset({'공휴일'})
+
+class CalendarVariant(NamedTuple):
     """
-    NEIS API 응답 데이터를 icalendar 라이브러리를 사용하여 ICS 형식으로 변환합니다.
-    RFC 5545 표준을 완벽하게 준수합니다.
+    같은 학사일정 행으로 만드는 캘린더의 변형입니다. 기본값은 지금까지의 캘린더와 같습니다.
+    - exclude_holidays: 공휴일(SBTR_DD_SC_NM이 "공휴일"인 행)을 뺍니다.
+    - alarms: False이면 알림(VALARM)을 넣지 않습니다.
+    - grade: 주어지면 그 학년 행사와 학년 구분이 없는 행사만 넣습니다.
     """
-    cal = Calendar()
-    cal.add('prodid', '-//obtuse.kr//SchoolScheduleToICS//KO')
-    cal.add('version', '2.0')
-    cal.add('calscale', 'GREGORIAN')
-    cal.add('X-WR-CALNAME', f"{school_name} 학사일정")
-    cal.add('X-WR-TIMEZONE', 'Asia/Seoul')
-    # 캐시 확인을 위한 커스텀 생성 시간 속성 추가
-    cal.add('X-CREATED-TIME', datetime.now(timezone.utc))
+    exclude_holidays: bool = False
+    alarms: bool = True
+    grade: Optional[int] = None
 
-    if 'SchoolSchedule' in data:
-        all_event_rows = []
-        for item in data.get('SchoolSchedule', []):
-            if 'row' in item:
-                all_event_rows.extend(item.get('row', []))
+    @property
+    def key(self) -> str:
+        """캐시 키 등에 쓰는 변형 이름입니다. 기본 캘린더이면 빈 문자열입니다. (예: "noholiday-grade3")"""
+        parts = []
+        if self.exclude_holidays:
+            parts.append("noholiday")
+        if not self.alarms:
+            parts.append("noalarm")
+        if self.grade is not None:
+            parts.append(f"grade{self.grade}")
+        return "-".join(parts)
+
+    def select(self, rows: list[dict]) -> list[dict]:
+        """변형에 들어갈 행만 골라 반환합니다."""
+        if self.exclude_holidays:
+            rows = [row for row in rows if row.get('SBTR_DD_SC_NM') not in HOLIDAY_DAY_TYPES]
+        if self.grade is not None:
+            grade_field = GRADE_EVENT_FIELDS[self.grade - 1]
+            rows = [
+                row for row in rows
+                if row.get(grade_field) == 'Y' or not any(row.get(field) == 'Y' for field in GRADE_EVENT_FIELDS)
+            ]
+        return rows
+
+def _row_digest(row: dict) -> bytes:
+    """적재 시각(LOAD_DTM)을 제외한 행 내용의 해시를 반환합니다."""
+    content = {key: value for key, value in row.items() if key != 'LOAD_DTM'}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')).digest()
+
+class ScheduleRows:
+    """
+    NEIS 학사일정 행을 한 줄씩 받아 ICS 변환과 지문 계산에 필요한 값만 보관합니다.
+    페이지 응답 전체를 메모리에 두지 않고, 행마다 ICS_ROW_FIELDS 열과 행 해시만 남깁니다.
+    """
+    __slots__ = ("rows", "_digests")
+
+    def __init__(self):
+        self.rows: list[dict] = []
+        self._digests: list[bytes] = []
+
+    @classmethod
+    def from_response(cls, data: dict) -> "ScheduleRows":
+        """NEIS API 응답(JSON) 전체로부터 만듭니다."""
+        schedule = cls()
+        for row in _collect_rows(data):
+            schedule.add(row)
+        return schedule
+
+    def add(self, row: dict):
+        self._digests.append(_row_digest(row))
+        self.rows.append({field: row[field] for field in ICS_ROW_FIELDS if field in row})
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def fingerprint(self) -> str:
+        """행 순서와 무관한 원본 데이터의 지문(해시)을 반환합니다."""
+        return hashlib.sha256(b"".join(sorted(self._digests))).hexdigest()
+
+    def as_response(self) -> dict:
+        """convert_to_ics에 넘길 수 있는 NEIS API 응답 모양으로 반환합니다."""
+        return {"SchoolSchedule": [{"row": self.rows}]}
+
+def schedule_fingerprint(data: dict) -> str:
+    """
+    NEIS API 응답의 학사일정 행으로부터 원본 데이터의 지문(해시)을 계산합니다.
+    적재 시각(LOAD_DTM)처럼 캘린더 내용과 무관한 값은 제외하므로,
+    일정이 바뀌지 않았다면 같은 지문이 나옵니다.
+    """
+    return ScheduleRows.from_response(data).fingerprint()
+
+# RFC 5545: 한 줄은 75옥텟을 넘지 않도록 접습니다. (icalendar 라이브러리와 같이 74옥텟까지 씁니다.)
+ICS_LINE_LIMIT = 75
+ICS_FOLD = "\r\n "
+# 시작일 9시(KST 기준)에 알림
+ALARM_TRIGGER = timedelta(days=-1, hours=-15)
 
-        # "토요휴업일" 이벤트 필터링
-        filtered_events = [
-            event for event in all_event_rows
-            if event.get('EVENT_NM') != '토요휴업일'
-        ]
+def _escape_text(text: str) -> str:
+    """TEXT 값을 RFC 5545 규칙으로 이스케이프합니다. (icalendar 라이브러리와 같은 순서로 치환)"""
+    return (
+        text.replace("\\N", "\n")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+        .replace("\r", "\\n")
+    )
 
-        merged_events = _group_consecutive_events(filtered_events)
+def _x_property_text(text: str) -> str:
+    """
+    X- 속성 값을 씁니다. icalendar 라이브러리와 같이 쉼표, 세미콜론, 역슬래시는 이스케이프하지 않습니다.
+    줄바꿈은 내용 줄을 깨뜨리므로 \\n으로 바꿉니다. (icalendar는 이 경우 예외를 발생시킵니다.)
+    """
+    return text.replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n")
 
-        for merged_event in merged_events:
-            event = Event()
+def _fold(line: str) -> str:
+    """
+    긴 줄을 ICS_LINE_LIMIT 옥텟 안에서 접습니다. UTF-8 문자 중간에서 자르지 않으며,
+    이스케이프 문자열(\\, 등)이 두 줄로 나뉘지 않도록 합니다.
+    """
+    if len(line) * 3 < ICS_LINE_LIMIT or len(line.encode("utf-8")) < ICS_LINE_LIMIT:
+        return line
+    parts = []
+    current = []
+    byte_count = 0
+    for char in line:
+        char_bytes = 1 if char < "\x80" else len(char.encode("utf-8"))
+        if current and byte_count + char_bytes >= ICS_LINE_LIMIT:
+            if len(current) > 1 and current[-1] in "\\^":
+                escaped_prefix = current.pop()
+                parts.append("".join(current))
+                current = [escaped_prefix]
+                byte_count = len(escaped_prefix.encode("utf-8"))
+            else:
+                parts.append("".join(current))
+                current = []
+                byte_count = 0
+        current.append(char)
+        byte_count += char_bytes
+    if current:
+        parts.append("".join(current))
+    return ICS_FOLD.join(parts)
 
-            event_name = merged_event['name']
-            start_date = merged_event['start_date']
-            end_date = merged_event['end_date']
+def _format_duration(value: timedelta) -> str:
+    """timedelta를 RFC 5545 DURATION 값으로 바꿉니다. (예: -1일 15시간 → -P1DT15H)"""
+    sign = ""
+    if value < timedelta(0):
+        sign, value = "-", -value
+    time_part = ""
+    if value.seconds:
+        hours, rest = divmod(value.seconds, 3600)
+        minutes, seconds = divmod(rest, 60)
+        time_part = "T"
+        if hours:
+            time_part += f"{hours}H"
+        if minutes or (hours and seconds):
+            time_part += f"{minutes}M"
+        if seconds:
+            time_part += f"{seconds}S"
+    if value.days == 0 and time_part:
+        return f"{sign}P{time_part}"
+    return f"{sign}P{value.days}D{time_part}"
 
-            # UID는 이벤트 이름과 시작 날짜를 기반으로 생성하여 일관성 유지
-            uid_name = f"{school_name}-{start_date.strftime('%Y%m%d')}-{event_name}"
-            uid = uuid.uuid5(ICS_NAMESPACE, uid_name)
+def _format_timestamp(value: datetime) -> str:
+    """DTSTAMP 값으로 쓸 UTC 시각 문자열을 만듭니다. (시간대가 없는 값은 그대로 씁니다.)"""
+    if value.tzinfo is None:
+        return value.strftime("%Y%m%dT%H%M%S")
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
-            event.add('uid', uid)
-            event.add('summary', event_name)
-            event.add('description', merged_event['description'])
-            event.add('location', merged_event['location'])
+def _line(content: str) -> str:
+    return _fold(content) + "\r\n"
 
-            # 종일 이벤트 설정
-            event.add('dtstart', start_date.date())
-            if start_date != end_date:
-                # 여러 날 이벤트의 경우 DTEND는 마지막 날의 다음 날로 설정
-                event.add('dtend', end_date.date() + timedelta(days=1))
+def schedule_events(rows: list[dict], variant: CalendarVariant = CalendarVariant()) -> list[dict]:
+    """
+    학사일정 행에서 캘린더에 들어갈 이벤트를 만듭니다.
+    "토요휴업일"과 변형에서 빠지는 행을 걸러낸 뒤, 이름이 같고 날짜가 이어지는 행을 하나로 합칩니다.
+    """
+    # "토요휴업일" 이벤트 필터링
+    filtered_events = variant.select([event for event in rows if event.get('EVENT_NM') != '토요휴업일'])
+    return _group_consecutive_events(filtered_events)
+
+def _iter_calendar_header(calendar_name: str, generated_at: datetime) -> Iterator[str]:
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "PRODID:-//obtuse.kr//SchoolScheduleToICS//KO\r\n"
+    yield "CALSCALE:GREGORIAN\r\n"
+    yield _line(f"X-WR-CALNAME:{_x_property_text(calendar_name)}")
+    # 캐시 확인을 위한 커스텀 생성 시간 속성 (cache_service.parse_created_time이 읽는 포맷)
+    yield _line(f"X-CREATED-TIME:{_escape_text(str(generated_at))}")
+    yield "X-WR-TIMEZONE:Asia/Seoul\r\n"
 
-            event.add('dtstamp', datetime.now(timezone.utc))
-            event.add('transp', 'TRANSPARENT')
+def _iter_event_lines(rows: list[dict], uid_scope: str, generated_at: datetime, variant: CalendarVariant,
+                      summary_prefix: str = "") -> Iterator[str]:
+    """학사일정 행으로 만든 VEVENT 줄을 내보냅니다. UID는 uid_scope, 시작 날짜, 이벤트 이름으로 만듭니다."""
+    dtstamp = f"DTSTAMP:{_format_timestamp(generated_at)}\r\n"
+    trigger = f"TRIGGER:{_format_duration(ALARM_TRIGGER)}\r\n"
+    for merged_event in schedule_events(rows, variant):
+        event_name = merged_event['name']
+        start_date = merged_event['start_date']
+        end_date = merged_event['end_date']
+        summary = _escape_text(summary_prefix + event_name)
 
+        # UID는 이벤트 이름과 시작 날짜를 기반으로 생성하여 일관성 유지
+        uid_name = f"{uid_scope}-{start_date.strftime('%Y%m%d')}-{event_name}"
+        uid = uuid.uuid5(ICS_NAMESPACE, uid_name)
+
+        # 속성 순서는 icalendar 라이브러리와 같습니다. (정해진 속성 다음에 나머지를 이름순으로)
+        yield "BEGIN:VEVENT\r\n"
+        yield _line(f"SUMMARY:{summary}")
+        # 종일 이벤트 설정
+        yield f"DTSTART;VALUE=DATE:{start_date.strftime('%Y%m%d')}\r\n"
+        if start_date != end_date:
+            # 여러 날 이벤트의 경우 DTEND는 마지막 날의 다음 날로 설정
+            yield f"DTEND;VALUE=DATE:{(end_date + timedelta(days=1)).strftime('%Y%m%d')}\r\n"
+        yield dtstamp
+        yield f"UID:{uid}\r\n"
+        yield _line(f"DESCRIPTION:{_escape_text(merged_event['description'])}")
+        yield _line(f"LOCATION:{_escape_text(merged_event['location'])}")
+        yield "TRANSP:TRANSPARENT\r\n"
+        if variant.alarms:
             # 알람 추가 (시작일 하루 전)
-            alarm = Alarm()
-            alarm.add('action', 'DISPLAY')
-            alarm.add('description', event_name)
-            alarm.add('trigger', timedelta(days=-1, hours=-15)) # 시작일 9시 (KST 기준)
-            event.add_component(alarm)
+            yield "BEGIN:VALARM\r\n"
+            yield "ACTION:DISPLAY\r\n"
+            yield _line(f"DESCRIPTION:{summary}")
+            yield trigger
+            yield "END:VALARM\r\n"
+        yield "END:VEVENT\r\n"
+
+def iter_ics_lines(data: Union[dict, ScheduleRows], school_name: str, generated_at: Optional[datetime] = None,
+                   variant: CalendarVariant = CalendarVariant()) -> Iterator[str]:
+    """
+    NEIS API 응답 데이터를 RFC 5545 iCalendar 문서로 변환하여, 이스케이프하고 접은 줄을
+    줄바꿈(CRLF)과 함께 하나씩 내보냅니다. 문서 전체를 메모리에 만들지 않으므로
+    파일이나 응답에 바로 이어 쓸 수 있습니다.
+    출력은 icalendar 라이브러리(Calendar.to_ical)로 만든 문서와 바이트 단위로 같습니다.
+    """
+    if generated_at is None:
+        generated_at = datetime.now(timezone.utc)
+    if isinstance(data, ScheduleRows):
+        data = data.as_response()
 
-            cal.add_component(event)
+    yield from _iter_calendar_header(f"{school_name} 학사일정", generated_at)
+    if 'SchoolSchedule' in data:
+        yield from _iter_event_lines(_collect_rows(data), school_name, generated_at, variant)
+    yield "END:VCALENDAR\r\n"
 
-    # 라이브러리가 모든 이스케이프, 폴딩, 줄바꿈 처리를 하여 바이트 문자열로 반환
-    # 이를 다시 utf-8 문자열로 디코딩하여 반환
-    return cal.to_ical().decode('utf-8')
+class SchoolEvents(NamedTuple):
+    """여러 학교를 합친 캘린더에 들어가는 학교 하나의 학사일정 행입니다."""
+    atpt_code: str
+    school_code: str
+    school_name: str
+    rows: list[dict]
+
+def iter_merged_ics_lines(schools: list[SchoolEvents], generated_at: datetime,
+                          variant: CalendarVariant = CalendarVariant()) -> Iterator[str]:
+    """
+    여러 학교의 학사일정을 하나의 iCalendar 문서로 변환하여 줄 단위로 내보냅니다.
+    학교마다 이벤트 이름 앞에 [학교명]을 붙이고, UID는 교육청 코드와 학교 코드로 구분하여
+    이름이 같은 학교나 같은 날의 같은 행사도 서로 다른 이벤트가 되도록 합니다.
+    """
+    calendar_name = ", ".join(school.school_name for school in schools) + " 학사일정"
+    yield from _iter_calendar_header(calendar_name, generated_at)
+    for school in schools:
+        yield from _iter_event_lines(
+            school.rows, f"{school.atpt_code}-{school.school_code}", generated_at, variant,
+            summary_prefix=f"[{school.school_name}] ",
+        )
+    yield "END:VCALENDAR\r\n"
+
+def convert_to_ics(data: Union[dict, ScheduleRows], school_name: str, generated_at: Optional[datetime] = None,
+                   variant: CalendarVariant = CalendarVariant()) -> str:
+    """
+    NEIS API 응답 데이터를 RFC 5545 표준 ICS 형식으로 변환합니다.
+    generated_at은 X-CREATED-TIME과 DTSTAMP에 쓰이는 생성 시각으로, 생략하면 현재 시각을 사용합니다.
+    같은 데이터와 같은 generated_at으로 변환하면 항상 같은 바이트가 나옵니다.
+    data로 NEIS API 응답 대신 한 줄씩 모은 ScheduleRows를 넘길 수도 있습니다.
+    variant로 공휴일 제외, 알림 끄기, 학년별 캘린더 등의 변형을 만들 수 있습니다.
+    """
+    return "".join(iter_ics_lines(data, school_name, generated_at, variant))
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.services.cache_index import CacheEntry
+
+class MemoryCacheItem:
+    """메모리 계층에 보관하는 캐시 항목입니다. 메타데이터와 인코딩별 본문 바이트를 함께 가집니다."""
+    __slots__ = ("entry", "bodies", "loaded_at")
+
+    def __init__(self, entry: CacheEntry, bodies: dict, loaded_at: float):
+        self.entry = entry
+        self.bodies = bodies        # {None(원본) | "gzip" | "br": bytes}
+        self.loaded_at = loaded_at  # 디스크/인덱스와 마지막으로 맞춘 시각 (time.monotonic)
+
+    @property
+    def size(self) -> int:
+        return sum(len(body) for body in self.bodies.values())
+
+class MemoryCache:
+    """
+    자주 요청되는 캘린더를 메모리에 보관하는 LRU 캐시입니다.
+    전체 본문 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 내보냅니다.
+    다른 워커가 파일을 바꿨을 수 있으므로, 항목은 ttl_seconds 동안만 검증 없이 사용합니다.
+    """
+    def __init__(self, max_bytes: int, ttl_seconds: float = 60, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._items: OrderedDict[Hashable, MemoryCacheItem] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[MemoryCacheItem]:
+        """
+        검증 기간(ttl) 안에 있는 항목을 반환하고 최근 사용으로 표시합니다.
+        없거나 검증 기간이 지났으면 None을 반환합니다.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or self._clock() - item.loaded_at >= self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def put(self, key: Hashable, entry: CacheEntry, bodies: dict):
+        """항목을 저장(또는 교체)하고 용량을 넘으면 오래된 항목을 내보냅니다."""
+        item = MemoryCacheItem(entry, dict(bodies), self._clock())
+        with self._lock:
+            self._remove(key)
+            if item.size > self.max_bytes:
+                # 예산보다 큰 항목은 메모리에 두지 않고 디스크에서 제공합니다.
+                return
+            self._items[key] = item
+            self.current_bytes += item.size
+            self._evict()
+
+    def add_body(self, key: Hashable, entry: CacheEntry, encoding: Optional[str], body: bytes):
+        """
+        항목에 인코딩별 본문을 추가합니다. 메타데이터가 바뀌었으면(다른 버전) 항목을 새로 만듭니다.
+        """
+        with self._lock:
+            item = self._items.get(key)
+        if item is None or item.entry.sha256 != entry.sha256:
+            self.put(key, entry, {encoding: body})
+            return
+        bodies = dict(item.bodies)
+        bodies[encoding] = body
+        self.put(key, entry, bodies)
+
+    def revalidate(self, key: Hashable, entry: CacheEntry):
+        """
+        디스크/인덱스에서 확인한 최신 메타데이터로 항목을 다시 검증합니다.
+        같은 버전이면 본문은 그대로 두고 검증 시각만 갱신하고, 다른 버전이면 항목을 제거합니다.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return
+            if item.entry.sha256 == entry.sha256:
+                item.entry = entry
+                item.loaded_at = self._clock()
+            else:
+                self._remove(key)
+
+    def invalidate(self, key: Hashable):
+        """항목을 메모리에서 제거합니다."""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: Hashable):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.current_bytes -= item.size
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._items:
+            _, item = self._items.popitem(last=False)
+            self.current_bytes -= item.size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """모니터링을 위한 카운터 값을 반환합니다."""
+        return {
+            "items": len(self._items),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
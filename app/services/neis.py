@@ -1,12 +1,65 @@
-import requests
+import asyncio
+import math
+from collections import deque
+from typing import AsyncIterator, Optional
+
+import httpx
 from fastapi import HTTPException
 from datetime import datetime
 from app.core.config import settings
+from app.services.ics_converter import ScheduleRows
+from app.services.neis_guard import neis_circuit_breaker, neis_rate_limiter, neis_retry_policy
+
+# 테스트나 프록시를 위해 설정의 neis_base_url로 바꿀 수 있습니다.
+NEIS_SCHEDULE_URL = settings.get("neis_base_url", "https://open.neis.go.kr/hub").rstrip("/") + "/SchoolSchedule"
+# 한 번에 받을 수 있는 최대 행 수 (NEIS API의 pSize 상한)
+NEIS_PAGE_SIZE = 1000
+
+# 애플리케이션 전역에서 공유하는 비동기 HTTP 클라이언트입니다.
+# 앱 시작 시 start_client()로 생성하고, 종료 시 close_client()로 닫습니다.
+_client: Optional[httpx.AsyncClient] = None
+
+def _build_client() -> httpx.AsyncClient:
+    """설정값을 바탕으로 keep-alive 커넥션 풀을 사용하는 AsyncClient를 생성합니다."""
+    timeout = httpx.Timeout(
+        settings.get("neis_timeout", 10),
+        connect=settings.get("neis_connect_timeout", 5),
+    )
+    limits = httpx.Limits(
+        max_connections=settings.get("neis_max_connections", 20),
+        max_keepalive_connections=settings.get("neis_max_keepalive_connections", 10),
+        keepalive_expiry=settings.get("neis_keepalive_expiry", 30),
+    )
+    return httpx.AsyncClient(timeout=timeout, limits=limits)
+
+async def start_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트를 생성합니다. 이미 생성되어 있으면 그대로 반환합니다."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
 
-async def get_school_schedule(ATPT_OFCDC_SC_CODE: str, SD_SCHUL_CODE: int) -> dict:
+async def close_client():
+    """공유 HTTP 클라이언트를 닫고 커넥션 풀을 정리합니다."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def get_client() -> httpx.AsyncClient:
     """
-    NEIS API를 호출하여 학교 학사일정 정보를 가져옵니다.
-    API 키가 설정되지 않았거나, 응답에 실패하면 HTTPException을 발생시킵니다.
+    공유 HTTP 클라이언트를 반환합니다.
+    앱 수명주기 밖(테스트, 스크립트 등)에서 호출되면 클라이언트를 지연 생성합니다.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+def _schedule_params(**filters) -> dict:
+    """
+    학사일정 조회에 공통으로 사용하는 요청 파라미터를 만듭니다.
+    API 키가 설정되지 않았으면 HTTPException을 발생시킵니다.
     """
     api_key = settings.get("neisKey")
     if not api_key or api_key == "YOUR_API_KEY" or api_key == "YOUR_API_KEY_HERE":
@@ -21,44 +74,186 @@ async def get_school_schedule(ATPT_OFCDC_SC_CODE: str, SD_SCHUL_CODE: int) -> di
     start_date = f"{current_year}0101"
     end_date = f"{current_year + 1}0101"
 
-    url = (
-        f"https://open.neis.go.kr/hub/SchoolSchedule"
-        f"?KEY={api_key}"
-        f"&Type=json"
-        f"&ATPT_OFCDC_SC_CODE={ATPT_OFCDC_SC_CODE}"
-        f"&SD_SCHUL_CODE={SD_SCHUL_CODE}"
-        f"&MLSV_FROM_YMD={start_date}"
-        f"&MLSV_TO_YMD={end_date}"
-        f"&pSize=1000"
-    )
+    return {
+        "KEY": api_key,
+        "Type": "json",
+        **filters,
+        "MLSV_FROM_YMD": start_date,
+        "MLSV_TO_YMD": end_date,
+        "pSize": NEIS_PAGE_SIZE,
+    }
 
-    print(f"Requesting NEIS API URL: {url}")
+# 다시 시도하면 성공할 수 있는 HTTP 상태 코드
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
 
-    try:
-        response = requests.get(url, timeout=10) # 타임아웃 10초로 증가
-        response.raise_for_status()
-        json_data = response.json()
-
-        # NEIS API는 200 OK와 함께 에러 코드를 반환할 수 있음
-        if "RESULT" in json_data:
-            result_code = json_data["RESULT"]["CODE"]
-            if result_code != "INFO-000":
-                raise HTTPException(
-                    status_code=400, # 클라이언트 요청이 잘못되었을 가능성이 높음 (e.g., 잘못된 학교 코드)
-                    detail=f"NEIS API Error: {json_data['RESULT']['MESSAGE']} (Code: {result_code})"
-                )
+def _is_transient(error: httpx.HTTPError) -> bool:
+    """연결 실패, 시간 초과, 429/5xx 응답처럼 일시적인 오류인지 확인합니다."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
 
-        return json_data
+def _retry_after(error: httpx.HTTPError) -> Optional[float]:
+    """응답의 Retry-After 헤더(초)를 읽습니다. 없거나 날짜 형식이면 None입니다."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    try:
+        return float(error.response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
 
-    except requests.exceptions.HTTPError as e:
+def _as_http_exception(error: httpx.HTTPError) -> HTTPException:
+    """httpx 오류를 API 응답용 HTTPException으로 바꿉니다."""
+    if isinstance(error, httpx.HTTPStatusError):
         # 4xx, 5xx 에러
-        raise HTTPException(
-            status_code=e.response.status_code,
-            detail=f"HTTP Error from NEIS server: {e}"
-        )
-    except requests.exceptions.RequestException as e:
-        # 연결 시간 초과, DNS 문제 등
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to NEIS server: {e}"
+        return HTTPException(
+            status_code=error.response.status_code,
+            detail=f"HTTP Error from NEIS server: {error}"
         )
+    # 연결 시간 초과, DNS 문제 등
+    return HTTPException(
+        status_code=503,
+        detail=f"Could not connect to NEIS server: {error}"
+    )
+
+def _circuit_open_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"NEIS server is unavailable (circuit breaker open, retry in {neis_circuit_breaker.retry_in():.0f}s)"
+    )
+
+async def _get_schedule_json(params: dict) -> dict:
+    """
+    요청 속도 제한, 재시도, 차단기를 거쳐 학사일정 API를 호출하고 JSON 응답을 반환합니다.
+    일시적인 오류는 neis_retry_policy에 따라 다시 시도하고, 끝내 실패하면 차단기에 실패로 기록합니다.
+    차단기가 열려 있으면 NEIS에 요청하지 않고 바로 503 HTTPException을 발생시킵니다.
+    """
+    if not neis_circuit_breaker.allow():
+        raise _circuit_open_error()
+
+    attempt = 0
+    while True:
+        await neis_rate_limiter.acquire()
+        try:
+            # 이벤트 루프를 막지 않도록 공유 비동기 클라이언트를 사용합니다.
+            response = await get_client().get(NEIS_SCHEDULE_URL, params=params)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if not _is_transient(e):
+                # 요청이 잘못된 경우이므로 NEIS 자체는 정상입니다.
+                neis_circuit_breaker.record_success()
+                raise _as_http_exception(e)
+            if attempt >= neis_retry_policy.max_retries:
+                neis_retry_policy.exhausted += 1
+                neis_circuit_breaker.record_failure()
+                raise _as_http_exception(e)
+            delay = neis_retry_policy.backoff(attempt, _retry_after(e))
+            attempt += 1
+            print(f"NEIS request failed ({e}). Retrying in {delay:.2f}s ({attempt}/{neis_retry_policy.max_retries})")
+            await asyncio.sleep(delay)
+            if neis_circuit_breaker.state == "open":
+                # 기다리는 사이 다른 요청들의 실패로 차단기가 열렸으면 더 시도하지 않습니다.
+                raise _circuit_open_error()
+            continue
+
+        try:
+            json_data = response.json()
+        except ValueError as e:
+            # 점검 안내 HTML처럼 JSON이 아닌 200 응답은 NEIS 장애로 보고 차단기에 실패로 기록합니다.
+            neis_circuit_breaker.record_failure()
+            raise HTTPException(status_code=503, detail=f"Invalid response from NEIS server: {e}")
+        neis_circuit_breaker.record_success()
+        return json_data
+
+async def _request_schedule(params: dict, allow_empty: bool = False) -> dict:
+    """
+    학사일정 API를 호출하여 JSON 응답을 반환합니다.
+    응답에 실패하거나 NEIS가 에러 코드를 반환하면 HTTPException을 발생시킵니다.
+    allow_empty가 True이면 데이터 없음(INFO-200) 응답을 그대로 반환합니다.
+    """
+    json_data = await _get_schedule_json(params)
+
+    # NEIS API는 200 OK와 함께 에러 코드를 반환할 수 있음
+    if "RESULT" in json_data:
+        result_code = json_data["RESULT"]["CODE"]
+        if result_code != "INFO-000" and not (allow_empty and result_code == "INFO-200"):
+            raise HTTPException(
+                status_code=400, # 클라이언트 요청이 잘못되었을 가능성이 높음 (e.g., 잘못된 학교 코드)
+                detail=f"NEIS API Error: {json_data['RESULT']['MESSAGE']} (Code: {result_code})"
+            )
+
+    return json_data
+
+def _schedule_page(json_data: dict) -> tuple[int, list[dict]]:
+    """학사일정 응답 한 페이지에서 전체 건수(list_total_count)와 행 목록을 꺼냅니다."""
+    total = 0
+    rows = []
+    for item in json_data.get("SchoolSchedule", []):
+        for head in item.get("head", []):
+            if "list_total_count" in head:
+                total = head["list_total_count"]
+        rows.extend(item.get("row", []))
+    return total, rows
+
+async def iter_schedule_pages(params: dict, allow_empty: bool = False) -> AsyncIterator[list[dict]]:
+    """
+    학사일정 조회 결과를 pIndex로 나눠 모든 페이지를 가져오며, 페이지의 행 목록을 순서대로 내보냅니다.
+    첫 페이지의 list_total_count로 전체 페이지 수를 계산하고, 나머지 페이지는 설정의
+    neis_page_concurrency개까지 동시에 요청합니다. 아직 처리하지 않은 페이지를 그 이상 미리 받아 두지 않으므로,
+    호출자가 행을 처리하는 동안 메모리에는 몇 페이지만 남습니다.
+    """
+    page_size = params.get("pSize", NEIS_PAGE_SIZE)
+    first = await _request_schedule({**params, "pIndex": 1}, allow_empty=allow_empty)
+    total, rows = _schedule_page(first)
+    del first
+    yield rows
+    if not rows:
+        return
+
+    last_page = math.ceil(total / page_size)
+    concurrency = max(1, settings.get("neis_page_concurrency", 4))
+
+    async def fetch(page: int) -> list[dict]:
+        return _schedule_page(await _request_schedule({**params, "pIndex": page}, allow_empty=True))[1]
+
+    pending: deque[asyncio.Task] = deque()
+    next_page = 2
+    try:
+        while next_page <= last_page or pending:
+            while next_page <= last_page and len(pending) < concurrency:
+                pending.append(asyncio.create_task(fetch(next_page)))
+                next_page += 1
+            rows = await pending.popleft()
+            if not rows:
+                # 조회하는 사이 데이터가 줄어든 경우
+                break
+            yield rows
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+async def get_school_schedule(ATPT_OFCDC_SC_CODE: str, SD_SCHUL_CODE: int) -> ScheduleRows:
+    """
+    NEIS API를 호출하여 학교 학사일정 정보를 가져옵니다.
+    pSize보다 행이 많으면 모든 페이지를 받으며, 행은 받는 즉시 ScheduleRows에 모아 페이지 응답은 버립니다.
+    데이터가 없으면 빈 ScheduleRows를 반환합니다.
+    API 키가 설정되지 않았거나, 응답에 실패하면 HTTPException을 발생시킵니다.
+    """
+    params = _schedule_params(ATPT_OFCDC_SC_CODE=ATPT_OFCDC_SC_CODE, SD_SCHUL_CODE=SD_SCHUL_CODE)
+
+    print(f"Requesting NEIS API for {ATPT_OFCDC_SC_CODE}/{SD_SCHUL_CODE}")
+
+    schedule = ScheduleRows()
+    async for rows in iter_schedule_pages(params, allow_empty=True):
+        for row in rows:
+            schedule.add(row)
+    return schedule
+
+def iter_region_schedule_pages(ATPT_OFCDC_SC_CODE: str) -> AsyncIterator[list[dict]]:
+    """
+    한 시도교육청에 속한 모든 학교의 학사일정 행을 페이지 단위로 가져옵니다.
+    학교 코드 없이 교육청 코드로만 조회합니다. 데이터가 없으면 빈 페이지 하나를 내보냅니다.
+    """
+    params = _schedule_params(ATPT_OFCDC_SC_CODE=ATPT_OFCDC_SC_CODE)
+    print(f"Requesting NEIS API for region {ATPT_OFCDC_SC_CODE}")
+    return iter_schedule_pages(params, allow_empty=True)
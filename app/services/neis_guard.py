@@ -0,0 +1,179 @@
+import asyncio
+import random
+import time
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+class TokenBucket:
+    """
+    프로세스 전체에서 NEIS 요청 속도를 제한하는 토큰 버킷입니다.
+    초당 rate개의 토큰이 burst개까지 쌓이며, 요청마다 토큰 하나를 씁니다.
+    토큰이 없으면 먼저 예약한 요청부터 순서대로 차례가 올 때까지 기다립니다.
+    """
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate    # 초당 요청 수, 0 이하이면 제한하지 않음
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.acquired = 0
+        self.throttled = 0       # 토큰을 기다려야 했던 요청 수
+        self.wait_seconds = 0.0  # 기다린 시간의 합
+
+    def reserve(self) -> float:
+        """
+        토큰 하나를 예약하고, 그 토큰을 쓸 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다.
+        토큰이 모자라면 빚(음수)으로 남겨 두므로, 뒤에 예약한 요청일수록 오래 기다립니다.
+        """
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        self.acquired += 1
+        if self._tokens >= 0:
+            return 0.0
+        delay = -self._tokens / self.rate
+        self.throttled += 1
+        self.wait_seconds += delay
+        return delay
+
+    async def acquire(self):
+        """요청을 보내도 될 때까지 기다립니다."""
+        if self.rate <= 0:
+            return
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """모니터링을 위한 값을 반환합니다."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+class RetryPolicy:
+    """
+    일시적인 NEIS 오류(연결 실패, 시간 초과, 429/5xx)를 다시 시도하는 횟수와 대기 시간을 정합니다.
+    대기 시간은 지수적으로 늘어나는 상한 안에서 무작위로 고르므로(full jitter),
+    여러 요청이 한꺼번에 실패해도 다시 시도하는 시점이 흩어집니다.
+    """
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0    # 다시 시도한 횟수
+        self.exhausted = 0  # 다시 시도해도 실패하여 포기한 요청 수
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        attempt번째(0부터) 재시도 전에 기다릴 시간(초)을 반환합니다.
+        서버가 Retry-After로 알려준 시간이 있으면 그보다 일찍 다시 시도하지 않습니다. (max_delay 이내)
+        """
+        self.retries += 1
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(self.max_delay, retry_after))
+        return delay
+
+    def stats(self) -> dict:
+        """모니터링을 위한 값을 반환합니다."""
+        return {
+            "max_retries": self.max_retries,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
+
+class CircuitBreaker:
+    """
+    NEIS가 연속으로 실패하면 한동안 요청을 보내지 않고 바로 실패시키는 차단기입니다.
+
+    - closed: 정상 상태. 연속 실패가 failure_threshold번이 되면 open으로 바뀝니다.
+    - open: reset_timeout초 동안 모든 요청을 바로 거절합니다. (호출자는 오래된 캐시로 응답할 수 있습니다.)
+    - half_open: reset_timeout이 지나면 요청 하나만 시험 삼아 보내고, 성공하면 closed, 실패하면 다시 open이 됩니다.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold  # 0 이하이면 차단하지 않음
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.reset()
+
+    def reset(self):
+        """closed 상태로 되돌리고 카운터를 초기화합니다."""
+        self.consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self.opened = 0    # open 상태가 된 횟수
+        self.rejected = 0  # 요청을 보내지 않고 거절한 횟수
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """요청을 보내도 되면 True를 반환합니다. half_open 상태에서는 시험 요청 하나만 허용합니다."""
+        state = self.state
+        if state == "closed":
+            return True
+        now = self._clock()
+        # 시험 요청이 취소되어 결과가 기록되지 않은 경우에도 reset_timeout이 지나면 다시 시험합니다.
+        if state == "half_open" and (self._probe_started is None or now - self._probe_started >= self.reset_timeout):
+            self._probe_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def retry_in(self) -> float:
+        """open 상태가 끝날 때까지 남은 시간(초)입니다."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        """NEIS가 응답했음을 기록합니다. (요청 자체가 잘못된 4xx 응답도 NEIS는 정상이므로 성공입니다.)"""
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        """NEIS가 응답하지 못했음을 기록합니다."""
+        self.consecutive_failures += 1
+        self._probe_started = None
+        if self._opened_at is not None or (0 < self.failure_threshold <= self.consecutive_failures):
+            if self._opened_at is None:
+                print(f"NEIS circuit breaker opened after {self.consecutive_failures} consecutive failures.")
+            self.opened += 1
+            self._opened_at = self._clock()
+
+    def stats(self) -> dict:
+        """모니터링을 위한 값을 반환합니다."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 3),
+        }
+
+# NEIS 요청에 사용하는 프로세스 전역 인스턴스입니다.
+neis_rate_limiter = TokenBucket(
+    rate=settings.get('neis_rate_limit', 10),
+    burst=settings.get('neis_rate_burst', 10),
+)
+neis_retry_policy = RetryPolicy(
+    max_retries=settings.get('neis_max_retries', 2),
+    base_delay=settings.get('neis_retry_base_delay', 0.5),
+    max_delay=settings.get('neis_retry_max_delay', 5),
+)
+neis_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.get('neis_breaker_threshold', 5),
+    reset_timeout=settings.get('neis_breaker_reset', 30),
+)
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+
+class RefreshWorker:
+    """
+    만료된 캐시를 백그라운드에서 다시 생성하는 작업자입니다.
+    stale-while-revalidate 모드에서 오래된 캐시를 먼저 응답한 뒤,
+    이 작업자의 큐에 갱신 작업을 넣어 사용자 요청과 분리하여 처리합니다.
+    """
+    def __init__(self, concurrency: int = 2, max_queue_size: int = 1000):
+        self.concurrency = concurrency
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: set[tuple[str, int]] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._handler: Optional[Callable[[str, int], Awaitable]] = None
+        self.enqueued = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+
+    def start(self, handler: Callable[[str, int], Awaitable]):
+        """갱신 작업을 처리할 handler를 등록하고 작업자 태스크를 시작합니다."""
+        if self._tasks:
+            return
+        self._handler = handler
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        """작업자 태스크를 취소하고 대기 중인 작업을 정리합니다."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    def enqueue(self, atpt_code: str, school_code: int) -> bool:
+        """
+        갱신 작업을 큐에 넣습니다. 같은 학교가 이미 대기 중이거나
+        작업자가 시작되지 않았거나 큐가 가득 찬 경우 False를 반환합니다.
+        """
+        key = (atpt_code, school_code)
+        if key in self._pending:
+            self.deduplicated += 1
+            return False
+        if self._queue is None:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(key)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"Refresh queue is full. Dropping refresh for {atpt_code}/{school_code}.")
+            return False
+        self._pending.add(key)
+        self.enqueued += 1
+        return True
+
+    async def _run(self):
+        """큐에서 작업을 하나씩 꺼내 handler를 실행합니다."""
+        while True:
+            key = await self._queue.get()
+            try:
+                await self._handler(*key)
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 갱신에 실패해도 기존(stale) 캐시는 그대로 남아 있으므로 로그만 남깁니다.
+                self.failed += 1
+                print(f"Background refresh failed for {key[0]}/{key[1]}: {e}")
+            finally:
+                self._pending.discard(key)
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        """모니터링을 위한 카운터 값을 반환합니다."""
+        return {
+            "running": bool(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "enqueued": self.enqueued,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+# 애플리케이션 전역에서 사용할 단일 갱신 작업자 인스턴스입니다.
+refresh_worker = RefreshWorker(
+    concurrency=settings.get('refresh_concurrency', 2)
+)
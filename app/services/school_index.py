@@ -0,0 +1,255 @@
+import re
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional, Sequence
+
+from app.utils.hangul_utils import choseong, decompose
+
+# 역색인에 사용하는 문자 n-gram의 길이
+NGRAM_SIZE = 2
+
+# 검색어에 이 문자가 있으면 정규식으로 취급하여 (pandas str.contains와 같은 의미로) 직접 비교합니다.
+REGEX_META_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+# 검색 방식
+#   contains: 학교명/영문학교명 부분 문자열 (정규식 문자가 있으면 정규식)
+#   choseong: 학교명의 초성 (예: "ㅅㅇㄱ" → 서울고등학교)
+#   jamo: 학교명을 자모로 풀어 쓴 문자열 (입력 중인 음절도 일치, 예: "서울곧" → 서울고등학교)
+MATCH_MODES = ("contains", "choseong", "jamo")
+
+def normalize_school_code(code) -> str:
+    """
+    행정표준코드를 비교 가능한 형태로 정규화합니다.
+    CSV에 섞여 있는 앞뒤 공백을 제거하고, 숫자 코드는 앞의 0을 무시합니다.
+    (예: "  7010057 " → "7010057", 빈 코드 "       " → "")
+    """
+    text = str(code).strip()
+    if text.isdigit():
+        text = text.lstrip("0") or "0"
+    return text
+
+def _grams(text: str) -> set[str]:
+    """문자열의 1-gram과 NGRAM_SIZE-gram 집합을 반환합니다."""
+    grams = set(text)
+    grams.update(text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1))
+    return grams
+
+def _query_grams(query: str) -> set[str]:
+    """검색어를 포함하는 이름이 반드시 가지고 있어야 하는 n-gram 집합을 반환합니다."""
+    if len(query) < NGRAM_SIZE:
+        return set(query)
+    return {query[i:i + NGRAM_SIZE] for i in range(len(query) - NGRAM_SIZE + 1)}
+
+class _PostingIndex:
+    """
+    이름 목록에 대한 n-gram → 위치 목록(postings) 역색인입니다.
+    접두사 검색을 위해 이름을 정렬한 목록도 함께 둡니다.
+    """
+    __slots__ = ("names", "postings", "sorted_names", "sorted_positions")
+
+    def __init__(self, names: list[Optional[str]]):
+        # None은 값이 없는(NaN) 이름으로, 어떤 검색어와도 일치하지 않습니다.
+        self.names = names
+        postings: dict[str, list[int]] = {}
+        for position, name in enumerate(names):
+            if name is None:
+                continue
+            for gram in _grams(name):
+                postings.setdefault(gram, []).append(position)
+        # 위치 목록은 int 객체 대신 array로 보관합니다. 메모리가 적고,
+        # pickle은 int 객체를 공유하지 않으므로 스냅샷을 불러올 때 위치마다 객체가 새로 생기지도 않습니다.
+        self.postings: dict[str, array] = {gram: array("i", positions) for gram, positions in postings.items()}
+
+        ordered = sorted((name, position) for position, name in enumerate(names) if name is not None)
+        self.sorted_names = [name for name, _ in ordered]
+        self.sorted_positions = array("i", (position for _, position in ordered))
+
+    def prefixed(self, prefix: str) -> list[int]:
+        """prefix로 시작하는 이름의 위치 목록을 이름 순서대로 반환합니다. (이분 탐색)"""
+        positions = []
+        start = bisect_left(self.sorted_names, prefix)
+        for i in range(start, len(self.sorted_names)):
+            if not self.sorted_names[i].startswith(prefix):
+                break
+            positions.append(self.sorted_positions[i])
+        return positions
+
+    def candidates(self, query: str) -> Optional[set[int]]:
+        """
+        검색어의 모든 n-gram을 가진 위치 집합을 반환합니다. (실제 포함 여부는 호출자가 확인합니다.)
+        빈 검색어는 후보를 좁힐 수 없으므로 None을 반환합니다.
+        """
+        grams = _query_grams(query)
+        if not grams:
+            return None
+        posting_lists = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        result = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            if not result:
+                break
+            result.intersection_update(posting)
+        return result
+
+class _RegionIndex:
+    """한 시도교육청에 속한 학교들의 색인입니다."""
+    __slots__ = ("rows", "korean", "english", "english_names", "choseong", "jamo")
+
+    def __init__(self, rows: list[int], korean_names: list[Optional[str]], english_names: list[Optional[str]]):
+        self.rows = array("i", rows)  # 전체 레코드 목록에서의 위치 (오름차순)
+        self.korean = _PostingIndex(korean_names)
+        # 영문명은 대소문자를 무시하고 검색하므로 소문자로 색인합니다.
+        self.english = _PostingIndex([name.lower() if name is not None else None for name in english_names])
+        self.english_names = english_names  # 정규식 검색용 원본 영문명
+        # 초성/자모 검색 시 이름마다 분해하지 않도록 분해한 학교명을 미리 색인합니다.
+        self.choseong = _PostingIndex([choseong(name) if name is not None else None for name in korean_names])
+        self.jamo = _PostingIndex([decompose(name) if name is not None else None for name in korean_names])
+
+class SchoolIndex:
+    """
+    학교 레코드를 시도교육청코드별로 나누고, 학교명과 영문학교명에 대한
+    문자 n-gram 역색인을 만들어 두는 검색 색인입니다.
+    부분 문자열 검색 시 전체 행을 훑지 않고 후보 행만 확인합니다.
+    결과는 pandas의 str.contains(학교명) | str.contains(영문학교명, case=False)와 같습니다.
+    """
+    def __init__(self, records: Sequence[dict]):
+        # 행 dict의 리스트나 SchoolRecords처럼 위치로 행 dict를 얻을 수 있는 시퀀스
+        self.records = records
+        self.regions: dict[str, _RegionIndex] = {}
+        # (시도교육청코드, 정규화된 행정표준코드) → 레코드 위치
+        self.by_code: dict[tuple[str, str], int] = {}
+
+        grouped: dict[str, list[int]] = {}
+        for position, record in enumerate(records):
+            atpt_code = record.get('시도교육청코드')
+            grouped.setdefault(atpt_code, []).append(position)
+            school_code = normalize_school_code(record.get('행정표준코드', ''))
+            if school_code:
+                # 코드가 중복되면 CSV에서 먼저 나온 행을 사용합니다.
+                self.by_code.setdefault((atpt_code, school_code), position)
+
+        for atpt_code, rows in grouped.items():
+            self.regions[atpt_code] = _RegionIndex(
+                rows,
+                [self._name(records[row], '학교명') for row in rows],
+                [self._name(records[row], '영문학교명') for row in rows],
+            )
+
+    @staticmethod
+    def _name(record: dict, column: str) -> Optional[str]:
+        """레코드의 이름 값을 반환합니다. 빈 값(원본 CSV의 NaN)은 None으로 취급합니다."""
+        value = record.get(column)
+        if value is None or value == "":
+            return None
+        return str(value)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, atpt_code: str, school_code) -> Optional[dict]:
+        """교육청 코드와 행정표준코드로 학교 하나를 찾습니다. 없으면 None을 반환합니다."""
+        school_code = normalize_school_code(school_code)
+        if not school_code:
+            return None
+        position = self.by_code.get((atpt_code, school_code))
+        if position is None:
+            return None
+        return dict(self.records[position])
+
+    def iter_schools(self, atpt_codes: Optional[Iterable[str]] = None) -> Iterator[tuple[str, str, dict]]:
+        """
+        (교육청 코드, 정규화된 행정표준코드, 레코드)를 CSV 순서대로 반환합니다.
+        atpt_codes를 주면 그 지역의 학교만 반환합니다. 코드가 중복된 학교는 get()과 같이 먼저 나온 행만 반환합니다.
+        """
+        atpt_codes = set(atpt_codes) if atpt_codes else None
+        for (atpt_code, school_code), position in self.by_code.items():
+            if atpt_codes is None or atpt_code in atpt_codes:
+                yield atpt_code, school_code, dict(self.records[position])
+
+    def match_rows(self, atpt_code: str, query: str, match_mode: str = "contains") -> list[int]:
+        """조건에 맞는 레코드 위치 목록을 원본 순서대로 반환합니다. match_mode는 MATCH_MODES 중 하나입니다."""
+        if match_mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {match_mode!r}")
+        region = self.regions.get(atpt_code)
+        if region is None:
+            return []
+
+        if match_mode == "contains" and REGEX_META_CHARS.intersection(query):
+            local_positions = self._match_regex(region, query)
+        else:
+            local_positions = self._match_needles(self._needles(region, query, match_mode))
+        return [region.rows[position] for position in sorted(local_positions)]
+
+    def search(self, atpt_code: str, query: str, match_mode: str = "contains") -> list[dict]:
+        """교육청 코드와 학교명(부분 문자열, 초성 또는 자모)으로 학교를 검색합니다."""
+        # 호출자가 결과를 수정해도 색인이 바뀌지 않도록 복사본을 반환합니다.
+        return [dict(self.records[row]) for row in self.match_rows(atpt_code, query, match_mode)]
+
+    @staticmethod
+    def _needles(region: _RegionIndex, query: str, match_mode: str) -> list[tuple[_PostingIndex, str]]:
+        """검색 방식에 따라 비교할 (색인, 변환한 검색어) 목록을 반환합니다."""
+        if match_mode == "choseong":
+            return [(region.choseong, choseong(query))]
+        if match_mode == "jamo":
+            return [(region.jamo, decompose(query))]
+        return [(region.korean, query), (region.english, query.lower())]
+
+    def autocomplete(self, atpt_code: str, query: str, limit: int, offset: int = 0,
+                     match_mode: str = "contains") -> tuple[list[int], bool]:
+        """
+        자동완성용으로 순위를 매긴 레코드 위치 목록과, 뒤에 결과가 더 있는지 여부를 반환합니다.
+        학교명(대소문자 구분)이나 영문학교명(대소문자 무시)이 검색어와 같은 학교, 검색어로 시작하는 학교,
+        검색어를 포함하는 학교 순서이며, 같은 순위 안에서는 학교명 순서입니다.
+        (choseong, jamo 방식에서는 초성/자모로 풀어 쓴 학교명을 비교합니다.)
+        검색어는 정규식이 아닌 문자열로 취급합니다.
+        요청한 범위가 접두사 일치 결과 안에 있으면 부분 문자열 검색을 하지 않습니다.
+        """
+        if match_mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {match_mode!r}")
+        region = self.regions.get(atpt_code)
+        if region is None or not query:
+            return [], False
+        needles = self._needles(region, query, match_mode)
+
+        def sort_key(position: int):
+            return region.korean.names[position] or region.english_names[position] or ""
+
+        # 위치 → 순위 (0: 일치, 1: 접두사 일치)
+        ranks: dict[int, int] = {}
+        for index, needle in needles:
+            for position in index.prefixed(needle):
+                rank = 0 if index.names[position] == needle else 1
+                ranks[position] = min(ranks.get(position, rank), rank)
+        ranked = sorted(ranks, key=lambda position: (ranks[position], sort_key(position), position))
+
+        end = offset + limit
+        if end >= len(ranked):
+            contained = self._match_needles(needles).difference(ranks)
+            ranked.extend(sorted(contained, key=lambda position: (sort_key(position), position)))
+        return [region.rows[position] for position in ranked[offset:end]], len(ranked) > end
+
+    @staticmethod
+    def _match_names(index: _PostingIndex, needle: str) -> set[int]:
+        """색인한 이름 중 needle을 포함하는 위치 집합을 반환합니다."""
+        candidates = index.candidates(needle)
+        if candidates is None:
+            candidates = range(len(index.names))
+        return {position for position in candidates if index.names[position] is not None and needle in index.names[position]}
+
+    @staticmethod
+    def _match_needles(needles: list[tuple[_PostingIndex, str]]) -> set[int]:
+        """(색인, 검색어) 중 하나라도 포함하는 위치 집합을 반환합니다."""
+        return set().union(*(SchoolIndex._match_names(index, needle) for index, needle in needles))
+
+    @staticmethod
+    def _match_regex(region: _RegionIndex, pattern: str) -> set[int]:
+        # pandas의 str.contains와 같이 정규식으로 해석합니다. (잘못된 정규식이면 re.error가 발생합니다.)
+        korean_pattern = re.compile(pattern)
+        english_pattern = re.compile(pattern, flags=re.IGNORECASE)
+        matched = set()
+        for position, name in enumerate(region.korean.names):
+            if name is not None and korean_pattern.search(name):
+                matched.add(position)
+        for position, name in enumerate(region.english_names):
+            if name is not None and english_pattern.search(name):
+                matched.add(position)
+        return matched
@@ -0,0 +1,88 @@
+import csv
+from pathlib import Path
+from typing import Iterator
+
+# pandas.read_csv가 기본으로 결측값(NaN)으로 취급하는 문자열 목록
+PANDAS_NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+# pandas.read_csv가 기본으로 불리언으로 읽는 문자열
+PANDAS_TRUE_VALUES = frozenset({"True", "TRUE", "true"})
+PANDAS_FALSE_VALUES = frozenset({"False", "FALSE", "false"})
+
+def _parse_int(text: str) -> int:
+    # int()는 "1_000" 같은 값도 허용하지만 pandas는 문자열로 취급합니다.
+    if "_" in text:
+        raise ValueError(text)
+    return int(text)
+
+def _parse_float(text: str) -> float:
+    if "_" in text:
+        raise ValueError(text)
+    return float(text)
+
+def _convert_column(values: list[str]) -> list:
+    """
+    pandas.read_csv(...).fillna("")와 같은 규칙으로 열의 값을 변환합니다.
+    결측값이 아닌 값이 모두 정수면 int(결측값이 있으면 float), 모두 실수면 float,
+    모두 불리언이면 bool, 그 외에는 원본 문자열을 사용합니다. 결측값은 ""가 됩니다.
+    """
+    present = [value for value in values if value not in PANDAS_NA_VALUES]
+    has_missing = len(present) != len(values)
+    if not present:
+        return [""] * len(values)
+
+    if all(value in PANDAS_TRUE_VALUES or value in PANDAS_FALSE_VALUES for value in present):
+        return [value in PANDAS_TRUE_VALUES if value not in PANDAS_NA_VALUES else "" for value in values]
+
+    for parse in (_parse_int, _parse_float):
+        try:
+            parsed = {value: parse(value) for value in set(present)}
+        except ValueError:
+            continue
+        if parse is _parse_int and has_missing:
+            parsed = {value: float(number) for value, number in parsed.items()}
+        return [parsed.get(value, "") for value in values]
+
+    # 같은 문자열(교육청명, 학교종류명 등)이 반복되므로 하나의 객체를 공유합니다.
+    interned: dict[str, str] = {}
+    return [interned.setdefault(value, value) if value not in PANDAS_NA_VALUES else "" for value in values]
+
+class SchoolRecords:
+    """
+    학교 레코드를 열 단위로 저장하는 읽기 전용 시퀀스입니다.
+    행마다 dict를 두지 않으므로 메모리를 적게 쓰며, 인덱싱하면 해당 행의 dict를 새로 만들어 반환합니다.
+    """
+    __slots__ = ("columns", "values")
+
+    def __init__(self, columns: list[str], values: list[list]):
+        self.columns = tuple(columns)
+        self.values = tuple(values)  # 열마다 행 순서대로의 값 목록
+
+    def __len__(self) -> int:
+        return len(self.values[0]) if self.values else 0
+
+    def __getitem__(self, position: int) -> dict:
+        return {column: values[position] for column, values in zip(self.columns, self.values)}
+
+    def __iter__(self) -> Iterator[dict]:
+        for position in range(len(self)):
+            yield self[position]
+
+def load_school_records(path: Path, encoding: str = "cp949") -> SchoolRecords:
+    """
+    pandas 없이 학교 정보 CSV 파일을 읽어 SchoolRecords로 반환합니다.
+    값의 타입과 결측값 처리는 pandas.read_csv(...).fillna("").to_dict(orient='records')와 같습니다.
+    """
+    with Path(path).open("r", encoding=encoding, newline="") as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        raw_columns: list[list[str]] = [[] for _ in columns]
+        for row in reader:
+            if not row:
+                # pandas와 같이 빈 줄은 건너뜁니다.
+                continue
+            for position, values in enumerate(raw_columns):
+                values.append(row[position] if position < len(row) else "")
+    return SchoolRecords(columns, [_convert_column(values) for values in raw_columns])
@@ -0,0 +1,78 @@
+import asyncio
+import os
+from typing import Optional
+
+from app.core.config import settings
+from app.services.school_search import SchoolSearchService, school_search_service
+
+class SchoolDataWatcher:
+    """
+    학교 정보 CSV 파일을 주기적으로 확인하여, 바뀌면 백그라운드 스레드에서 다시 불러오는 작업입니다.
+    여러 워커로 실행할 때 각 워커가 스스로 새 데이터를 가져가도록 합니다.
+    """
+    def __init__(self, service: SchoolSearchService, interval_seconds: float):
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._signature = self._file_signature()
+        self.checks = 0
+        self.last_error: Optional[str] = None
+
+    def _file_signature(self) -> Optional[tuple]:
+        """파일이 바뀌었는지 값싸게 확인하기 위한 (inode, 크기, 수정 시각)입니다. 파일이 없으면 None입니다."""
+        try:
+            stat = os.stat(self.service.data_file_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    async def check(self) -> bool:
+        """파일이 바뀌었으면 다시 불러옵니다. 새 데이터로 교체했으면 True를 반환합니다."""
+        self.checks += 1
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return False
+
+        reloads = self.service.reloads
+        try:
+            # 수정 시각만 바뀐 경우(내용 동일)에는 다시 불러오지 않습니다.
+            await asyncio.to_thread(self.service.reload, False)
+        except Exception as e:
+            # 파일을 쓰는 도중일 수 있으므로 signature를 갱신하지 않고 다음 주기에 다시 시도합니다.
+            self.last_error = str(e)
+            print(f"School data reload failed: {e}")
+            return False
+        self._signature = signature
+        self.last_error = None
+        return self.service.reloads != reloads
+
+    def start(self):
+        """주기적 확인을 시작합니다. interval_seconds가 0 이하이면 시작하지 않습니다."""
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 확인을 중단합니다."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.check()
+
+    def stats(self) -> dict:
+        """모니터링을 위한 값을 반환합니다."""
+        return {
+            "running": self._task is not None,
+            "checks": self.checks,
+            "last_error": self.last_error,
+        }
+
+# 애플리케이션 전역에서 사용할 단일 감시 작업 인스턴스입니다.
+school_data_watcher = SchoolDataWatcher(
+    school_search_service,
+    interval_seconds=settings.get('school_watch_interval', 0),
+)
@@ -1,13 +1,104 @@
-import pandas as pd
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional
+
+from app.core.config import settings
+from app.services.school_index import SchoolIndex
+from app.services.school_records import SchoolRecords, load_school_records
+from app.services.school_snapshot import load_snapshot, source_digest
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 학교 정보 CSV를 읽고 레코드를 보관하는 방식
+#   pandas: pandas.read_csv로 읽고 행마다 dict로 보관합니다.
+#   compact: csv 모듈로 읽고 열 단위(SchoolRecords)로 보관합니다. pandas를 불러오지 않아 메모리와 시작 시간이 줄어듭니다.
+SCHOOL_BACKENDS = ("pandas", "compact")
+
+# 자동완성 결과에 포함하는 열 (웹 화면에서 사용하는 값만)
+AUTOCOMPLETE_FIELDS = ('학교명', '시도교육청코드', '행정표준코드', '도로명주소')
+
+class SchoolDataset(NamedTuple):
+    """검색 색인과 그 색인을 만든 데이터의 버전 정보입니다. 다시 불러올 때 한 번에 교체합니다."""
+    index: SchoolIndex
+    version: dict
 
 class SchoolSearchService:
-    def __init__(self, data_file_path: Path):
-        self.data_file_path = data_file_path
-        self.school_data = self._load_data()
+    def __init__(self, data_file_path: Path, snapshot_path: Optional[Path] = None, backend: str = "pandas"):
+        if backend not in SCHOOL_BACKENDS:
+            raise ValueError(f"Unknown school data backend: {backend!r} (expected one of {', '.join(SCHOOL_BACKENDS)})")
+        self.data_file_path = Path(data_file_path)
+        self.snapshot_path = snapshot_path
+        self.backend = backend
+        self.reloads = 0
+        # 다시 불러오기가 동시에 두 번 실행되지 않도록 합니다. (검색은 이 잠금을 사용하지 않습니다.)
+        self._reload_lock = threading.Lock()
+        self._dataset = self._load_dataset()
+
+    @property
+    def index(self) -> SchoolIndex:
+        return self._dataset.index
+
+    @property
+    def version(self) -> dict:
+        """현재 사용 중인 학교 데이터의 버전 정보 (모니터링용)"""
+        return {**self._dataset.version, "reloads": self.reloads}
+
+    def _load_dataset(self) -> SchoolDataset:
+        """
+        검색 색인을 준비합니다.
+        최신 스냅샷이 있으면 CSV 파싱 없이 그대로 불러오고, 없거나 원본 CSV가 바뀌었으면
+        CSV를 읽어 색인을 새로 만듭니다. (스냅샷은 `python -m app.cli build-snapshot`으로 만듭니다.)
+        """
+        index = None
+        if self.snapshot_path is not None:
+            index = load_snapshot(self.snapshot_path, self.data_file_path, self.backend)
+        loaded_from = "snapshot" if index is not None else "csv"
+
+        if index is None:
+            # 검색 시 매번 전체 행을 훑지 않도록 로드 시점에 한 번 색인을 만듭니다.
+            if self.backend == "compact":
+                index = SchoolIndex(self._load_records())
+            else:
+                school_data = self._load_data()
+                index = SchoolIndex(school_data.fillna(value="").to_dict(orient='records'))
+
+        return SchoolDataset(index, {
+            "source": self.data_file_path.name,
+            "source_sha256": source_digest(self.data_file_path) if self.data_file_path.exists() else None,
+            "backend": self.backend,
+            "loaded_from": loaded_from,
+            "loaded_at": datetime.now(timezone.utc).isoformat(),
+            "schools": len(index),
+        })
+
+    def reload(self, force: bool = True) -> dict:
+        """
+        학교 데이터를 다시 불러와 검색 색인을 교체하고, 새 버전 정보를 반환합니다.
+        새 색인을 모두 만든 뒤 한 번에 교체하므로, 진행 중인 검색은 기다리지 않고
+        이전 색인이나 새 색인 중 하나만 봅니다.
+        force가 False이면 원본 CSV의 내용이 그대로일 때 다시 불러오지 않습니다.
+        불러오기에 실패하면 기존 색인을 유지하고 RuntimeError를 발생시킵니다.
+        """
+        with self._reload_lock:
+            if not force and self.data_file_path.exists():
+                if source_digest(self.data_file_path) == self._dataset.version["source_sha256"]:
+                    return self.version
 
-    def _load_data(self) -> pd.DataFrame:
+            dataset = self._load_dataset()
+            if len(dataset.index) == 0:
+                raise RuntimeError(f"School data could not be loaded from {self.data_file_path}")
+            self._dataset = dataset
+            self.reloads += 1
+            print(f"School data reloaded: {dataset.version['schools']} schools from {dataset.version['loaded_from']}.")
+            return self.version
+
+    def _load_data(self) -> "pd.DataFrame":
         """학교 정보 CSV 파일을 로드합니다."""
+        # 스냅샷으로 시작할 때는 pandas를 불러오지 않도록 여기서 import합니다.
+        import pandas as pd
+
         try:
             # Use pathlib's open method for cleaner path handling
             with self.data_file_path.open("r", encoding='cp949') as f:
@@ -21,27 +112,75 @@ class SchoolSearchService:
             print(f"Error loading school data: {e}")
             return pd.DataFrame()
 
-    def search(self, atpt_ofcdc_sc_code: str, schul_nm: str) -> list[dict]:
+    def _load_records(self) -> SchoolRecords:
+        """pandas 없이 학교 정보 CSV 파일을 열 단위 레코드로 로드합니다."""
+        try:
+            records = load_school_records(self.data_file_path, encoding='cp949')
+            print("School data loaded successfully.")
+            return records
+        except FileNotFoundError:
+            print(f"Error: Data file not found at {self.data_file_path}")
+        except Exception as e:
+            print(f"Error loading school data: {e}")
+        return SchoolRecords([], [])
+
+    def search(self, atpt_ofcdc_sc_code: str, schul_nm: str, match_mode: str = "contains") -> list[dict]:
         """
         교육청 코드와 학교명으로 학교를 검색합니다.
+        match_mode가 contains이면 학교명(대소문자 구분)과 영문학교명(대소문자 무시)의 부분 문자열로,
+        choseong이면 학교명의 초성(예: "ㅅㅇㄱ")으로, jamo이면 자모로 풀어 쓴 학교명(입력 중인 음절 포함)으로
+        검색합니다. 어느 방식이든 n-gram 색인으로 후보 행만 확인합니다.
         """
-        if self.school_data.empty:
+        # 검색 도중 색인이 교체되어도 같은 색인을 사용하도록 한 번만 읽습니다.
+        index = self.index
+        if len(index) == 0:
             return []
 
-        # 검색어에 대한 대소문자 무시를 위해 str.contains에 case=False 추가
-        result = self.school_data[
-            (self.school_data['시도교육청코드'] == atpt_ofcdc_sc_code) &
-            (
-                self.school_data['학교명'].str.contains(schul_nm, na=False) |
-                self.school_data['영문학교명'].str.contains(schul_nm, na=False, case=False)
-            )
-        ].fillna(value="").to_dict(orient='records')
-        return result
+        return index.search(atpt_ofcdc_sc_code, schul_nm, match_mode)
+
+    def autocomplete(self, atpt_ofcdc_sc_code: str, query: str, limit: int = 10, offset: int = 0,
+                     match_mode: str = "contains") -> tuple[list[dict], Optional[int]]:
+        """
+        입력 중인 학교명으로 자동완성 후보를 찾습니다.
+        이름이 같은 학교, 이름이 검색어로 시작하는 학교, 이름에 검색어가 들어간 학교 순서로
+        offset부터 limit개를 AUTOCOMPLETE_FIELDS 열만 담아 반환합니다.
+        두 번째 값은 다음 페이지의 offset이며, 더 이상 결과가 없으면 None입니다.
+        """
+        index = self.index
+        query = query.strip()
+        rows, has_more = index.autocomplete(atpt_ofcdc_sc_code, query, limit, offset, match_mode)
+        items = []
+        for row in rows:
+            record = index.records[row]
+            item = {field: record.get(field, "") for field in AUTOCOMPLETE_FIELDS}
+            # 원본 CSV의 행정표준코드에는 앞뒤 공백이 섞여 있어 URL에 바로 쓸 수 있도록 정리합니다.
+            item['행정표준코드'] = str(item['행정표준코드']).strip()
+            items.append(item)
+        return items, offset + len(rows) if has_more else None
+
+    def get_school(self, atpt_ofcdc_sc_code: str, sd_schul_code) -> Optional[dict]:
+        """
+        교육청 코드와 행정표준코드로 학교 정보를 조회합니다. 없으면 None을 반환합니다.
+        로드 시 만든 조회 테이블을 사용하므로 지역 전체를 훑지 않습니다.
+        """
+        return self.index.get(atpt_ofcdc_sc_code, sd_schul_code)
+
+    def iter_schools(self, atpt_ofcdc_sc_codes: Optional[Iterable[str]] = None) -> Iterator[tuple[str, str, dict]]:
+        """모든 학교(또는 주어진 지역의 학교)를 (교육청 코드, 행정표준코드, 학교 정보)로 반환합니다."""
+        return self.index.iter_schools(atpt_ofcdc_sc_codes)
 
 # 이 파일(school_search.py)은 app/services/에 위치합니다.
 # 프로젝트 루트는 세 단계 위입니다.
-DATA_FILE_PATH = Path(__file__).parent.parent.parent / "data" / "학교기본정보2024_11_30.csv"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+# 설정의 school_data_file로 바꿀 수 있습니다. (상대 경로는 프로젝트 루트 기준)
+DATA_FILE_PATH = PROJECT_ROOT / settings.get('school_data_file', "data/학교기본정보2024_11_30.csv")
+# 미리 만든 검색 색인 스냅샷 (CSV와 같은 위치, 확장자만 다름)
+SNAPSHOT_FILE_PATH = DATA_FILE_PATH.with_suffix(".snapshot")
 
 # SchoolSearchService의 단일 인스턴스를 생성합니다.
 # 이 인스턴스를 다른 모듈에서 가져와 사용합니다.
-school_search_service = SchoolSearchService(DATA_FILE_PATH)
+school_search_service = SchoolSearchService(
+    DATA_FILE_PATH,
+    SNAPSHOT_FILE_PATH,
+    backend=settings.get('school_backend', "pandas"),
+)
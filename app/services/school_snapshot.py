@@ -0,0 +1,85 @@
+import hashlib
+import json
+import mmap
+import pickle
+import struct
+from pathlib import Path
+from typing import Optional
+
+from app.services.school_index import SchoolIndex
+from app.utils.file_utils import atomic_write_bytes
+
+# 스냅샷 파일 형식
+#   MAGIC(8바이트) | 헤더 길이(uint32, little endian) | 헤더(JSON) | 본문(pickle된 SchoolIndex)
+# 헤더에는 형식 버전과 원본 CSV의 해시가 들어 있어, 원본이 바뀌면 스냅샷을 사용하지 않습니다.
+SNAPSHOT_MAGIC = b"NEISSNAP"
+# SchoolIndex의 구조가 바뀌면 이 값을 올려 예전 스냅샷을 무효화합니다.
+SNAPSHOT_VERSION = 4
+
+def source_digest(csv_path: Path) -> str:
+    """원본 CSV 파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with Path(csv_path).open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_snapshot(index: SchoolIndex, snapshot_path: Path, csv_path: Path, backend: str = "pandas"):
+    """색인을 스냅샷 파일로 저장합니다. 여러 워커가 읽는 중에도 안전하도록 원자적으로 교체합니다."""
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "backend": backend,
+        "source": Path(csv_path).name,
+        "source_sha256": source_digest(csv_path),
+        "schools": len(index),
+    }).encode("utf-8")
+    payload = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(snapshot_path, SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header + payload)
+
+def read_snapshot_header(snapshot_path: Path) -> Optional[dict]:
+    """스냅샷의 헤더를 읽어 반환합니다. 형식이 맞지 않으면 None을 반환합니다."""
+    with Path(snapshot_path).open("rb") as f:
+        prefix = f.read(len(SNAPSHOT_MAGIC) + 4)
+        if len(prefix) < len(SNAPSHOT_MAGIC) + 4 or not prefix.startswith(SNAPSHOT_MAGIC):
+            return None
+        (header_length,) = struct.unpack("<I", prefix[len(SNAPSHOT_MAGIC):])
+        return json.loads(f.read(header_length))
+
+def load_snapshot(snapshot_path: Path, csv_path: Path, backend: str = "pandas") -> Optional[SchoolIndex]:
+    """
+    스냅샷에서 색인을 불러옵니다. pandas와 CSV 파싱 없이 미리 만든 색인을 그대로 사용합니다.
+    스냅샷이 없거나, 형식 버전이나 레코드 저장 방식(backend)이 다르거나,
+    원본 CSV가 바뀌었으면(stale) None을 반환합니다.
+    """
+    snapshot_path = Path(snapshot_path)
+    if not snapshot_path.exists():
+        return None
+
+    try:
+        header = read_snapshot_header(snapshot_path)
+        if header is None or header.get("version") != SNAPSHOT_VERSION:
+            print(f"School snapshot '{snapshot_path}' has an unsupported format. Falling back to CSV.")
+            return None
+        if header.get("backend", "pandas") != backend:
+            print(f"School snapshot '{snapshot_path}' was built for the '{header.get('backend')}' backend. Falling back to CSV.")
+            return None
+        if Path(csv_path).exists() and header.get("source_sha256") != source_digest(csv_path):
+            print(f"School snapshot '{snapshot_path}' is stale. Falling back to CSV.")
+            return None
+
+        with snapshot_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = len(SNAPSHOT_MAGIC) + 4 + struct.unpack_from("<I", mm, len(SNAPSHOT_MAGIC))[0]
+            # 스냅샷은 이 프로젝트의 빌드 단계에서 만든 로컬 파일이므로 pickle로 읽습니다.
+            with memoryview(mm)[offset:] as payload:
+                index = pickle.loads(payload)
+    except Exception as e:
+        # 손상되었거나 예전 코드(모듈, 클래스 이름)로 만든 스냅샷은 어떤 예외든 CSV로 대신합니다.
+        print(f"Error loading school snapshot '{snapshot_path}', falling back to CSV: {e}")
+        return None
+
+    if not isinstance(index, SchoolIndex):
+        return None
+    print("School data loaded from snapshot.")
+    return index
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 작업을 하나로 합치는(single-flight) 서비스 클래스입니다.
+    먼저 도착한 요청만 실제 작업을 실행하고, 작업이 끝나기 전에 도착한
+    나머지 요청은 같은 결과(또는 예외)를 공유합니다.
+    """
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0       # do()가 호출된 총 횟수
+        self.executions = 0  # 실제로 작업을 실행한 횟수
+        self.coalesced = 0   # 진행 중인 작업에 합류한 횟수
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key에 대해 진행 중인 작업이 있으면 그 결과를 기다리고,
+        없으면 func를 실행하여 결과를 반환합니다.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            # 작업을 별도 Task로 실행하여, 처음 요청한 클라이언트의 연결이 끊겨도
+            # 기다리는 다른 요청들의 작업이 취소되지 않도록 합니다.
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        """완료된 작업을 진행 목록에서 제거합니다."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 합니다.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """모니터링을 위한 카운터 값을 반환합니다."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+# 학사일정 캘린더 생성에 사용하는 단일 인스턴스입니다.
+# 키는 (ATPT_OFCDC_SC_CODE, SD_SCHUL_CODE) 입니다.
+calendar_single_flight = SingleFlight()
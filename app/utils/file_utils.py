@@ -1,4 +1,20 @@
+import asyncio
 import os
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl이 없는 환경에서는 프로세스 간 잠금 없이 동작합니다.
+    fcntl = None
+
+# mkstemp는 임시 파일을 0600으로 만들므로, 새 파일에는 일반 파일과 같은 권한(0666 & ~umask)을 줍니다.
+# umask는 프로세스 전역 값이라 스레드에서 바꾸지 않도록 모듈을 불러올 때 한 번만 읽습니다.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 def ensure_directory_existence(file_path: str):
     """
@@ -6,4 +22,109 @@ def ensure_directory_existence(file_path: str):
     """
     dirname = os.path.dirname(file_path)
     if not os.path.exists(dirname):
-        os.makedirs(dirname)
+        os.makedirs(dirname, exist_ok=True)
+
+def atomic_write_bytes(file_path: Path, data: bytes):
+    """
+    같은 디렉토리의 임시 파일에 먼저 쓴 뒤 rename으로 교체하여 파일을 원자적으로 저장합니다.
+    다른 프로세스는 항상 이전 내용 전체 또는 새 내용 전체만 보게 되며, 쓰다 만 파일을 읽지 않습니다.
+    기존 파일이 있으면 그 권한을, 없으면 umask를 적용한 기본 권한을 유지합니다.
+    """
+    file_path = Path(file_path)
+    try:
+        mode = stat.S_IMODE(file_path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+class FileLock:
+    """
+    파일 기반 프로세스 간 권고 잠금(advisory lock)입니다.
+    같은 잠금 파일을 사용하는 여러 워커 프로세스 중 하나만 잠금을 얻을 수 있습니다.
+    """
+    def __init__(self, lock_path: Path):
+        self.lock_path = Path(lock_path)
+        self._fd: Optional[int] = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """잠금을 얻습니다. blocking이 False이면 즉시 결과(성공 여부)를 반환합니다."""
+        if self._fd is not None:
+            return True
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    return False
+                if not self._is_current(fd):
+                    # 잠금을 얻는 동안 잠금을 가진 프로세스가 파일을 지웠으므로 새 잠금 파일로 다시 시도합니다.
+                    os.close(fd)
+                    continue
+            self._fd = fd
+            return True
+
+    def _is_current(self, fd: int) -> bool:
+        """열린 파일이 아직 lock_path에 있는 파일인지 확인합니다."""
+        try:
+            return os.path.samestat(os.fstat(fd), os.stat(self.lock_path))
+        except FileNotFoundError:
+            return False
+
+    def unlink(self):
+        """
+        잠금을 가진 상태에서 잠금 파일을 지웁니다. 키를 삭제할 때 잠금 파일이 남지 않도록 사용합니다.
+        지워진 파일에서 기다리던 프로세스는 acquire()에서 이를 알아차리고 새 잠금 파일로 다시 잠급니다.
+        """
+        if self._fd is None:
+            raise RuntimeError("The lock must be held to unlink its file.")
+        self.lock_path.unlink(missing_ok=True)
+
+    async def acquire_async(self, timeout: float, poll_interval: float = 0.1) -> bool:
+        """
+        이벤트 루프를 막지 않고 잠금을 기다립니다.
+        timeout(초) 안에 얻지 못하면 False를 반환합니다.
+        """
+        deadline = time.monotonic() + timeout
+        while not self.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll_interval)
+        return True
+
+    def release(self):
+        """잠금을 해제합니다."""
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
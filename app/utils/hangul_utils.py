@@ -0,0 +1,54 @@
+# 한글 음절을 초성/자모로 분해합니다.
+# 자모는 사용자가 입력하는 한글 호환 자모(U+3131~)로 반환하며, 두벌식 자판에서 두 번 눌러 입력하는
+# 겹모음(ㅘ 등)과 겹받침(ㄳ 등)은 낱자로 풀어 씁니다. (ㄲ, ㅆ 같은 된소리는 한 번에 입력하므로 그대로 둡니다.)
+
+HANGUL_SYLLABLE_BASE = 0xAC00
+HANGUL_SYLLABLE_COUNT = 11172
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = (
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ",
+    "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ",
+)
+JONGSEONG = (
+    "", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+    "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+# 따로 입력된 겹자모 (예: 검색어 "ㄳ", "ㅘ")
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+def choseong(text: str) -> str:
+    """
+    각 한글 음절을 초성으로 바꾼 문자열을 반환합니다. 한글 음절이 아닌 문자는 그대로 둡니다.
+    (예: "서울고등학교" → "ㅅㅇㄱㄷㅎㄱ")
+    """
+    chars = []
+    for char in text:
+        code = ord(char) - HANGUL_SYLLABLE_BASE
+        if 0 <= code < HANGUL_SYLLABLE_COUNT:
+            chars.append(CHOSEONG[code // (JUNGSEONG_COUNT * JONGSEONG_COUNT)])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+def decompose(text: str) -> str:
+    """
+    한글 음절과 겹자모를 낱자 자모 순서로 풀어 쓴 문자열을 반환합니다. 한글이 아닌 문자는 그대로 둡니다.
+    입력 중인 음절도 비교할 수 있습니다. (예: "학굣" → "ㅎㅏㄱㄱㅛㅅ", "괜" → "ㄱㅗㅐㄴ")
+    """
+    chars = []
+    for char in text:
+        code = ord(char) - HANGUL_SYLLABLE_BASE
+        if 0 <= code < HANGUL_SYLLABLE_COUNT:
+            chars.append(CHOSEONG[code // (JUNGSEONG_COUNT * JONGSEONG_COUNT)])
+            chars.append(JUNGSEONG[(code % (JUNGSEONG_COUNT * JONGSEONG_COUNT)) // JONGSEONG_COUNT])
+            chars.append(JONGSEONG[code % JONGSEONG_COUNT])
+        else:
+            chars.append(COMPOUND_JAMO.get(char, char))
+    return "".join(chars)
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+
+def format_http_date(dt: datetime) -> str:
+    """datetime 객체를 HTTP 날짜 형식(RFC 9110, 예: 'Mon, 01 Jan 2024 00:00:00 GMT')으로 변환합니다."""
+    return format_datetime(dt.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+def parse_http_date(value: str) -> Optional[datetime]:
+    """HTTP 날짜 문자열을 aware datetime으로 변환합니다. 형식이 잘못되면 None을 반환합니다."""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더 값이 etag와 일치하는지 약한 비교(weak comparison)로 확인합니다."""
+    def _opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(candidate) == target for candidate in if_none_match.split(","))
+
+def is_not_modified(request_headers, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    조건부 요청 헤더를 확인하여 304 Not Modified로 응답해도 되는지 판단합니다.
+    RFC 9110에 따라 If-None-Match가 있으면 If-Modified-Since는 무시합니다.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        since = parse_http_date(if_modified_since)
+        if since is not None:
+            return last_modified.replace(microsecond=0) <= since
+    return False
+
+def choose_encoding(accept_encoding: Optional[str], supported: Iterable[str]) -> Optional[str]:
+    """
+    Accept-Encoding 헤더를 해석하여 supported(서버 선호 순서) 중 가장 적합한 인코딩을 고릅니다.
+    q 값이 가장 높은 인코딩을 선택하고, 같으면 서버 선호 순서를 따릅니다.
+    적합한 인코딩이 없으면 None(identity)을 반환합니다.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
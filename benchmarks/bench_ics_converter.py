@@ -0,0 +1,105 @@
+"""
+ICS 변환 벤치마크: 기존 icalendar 객체 모델 경로와 직접 줄을 쓰는 경로를 비교합니다.
+한 해 동안 매일 행사가 있는 학교의 학사일정(이틀 이상 이어지는 방학 등 포함)을 변환하며,
+변환 시간, 처리량, 변환 중 최대 메모리 할당량(tracemalloc)을 측정합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.bench_ics_converter [--events-per-day 2] [--repeat 20]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from icalendar import Alarm, Calendar, Event
+
+from app.services.ics_converter import ICS_NAMESPACE, _collect_rows, _group_consecutive_events, convert_to_ics
+
+def icalendar_convert(data: dict, school_name: str, generated_at: datetime) -> str:
+    """직접 쓰는 변환기 도입 전의 icalendar 라이브러리 구현입니다."""
+    cal = Calendar()
+    cal.add('prodid', '-//obtuse.kr//SchoolScheduleToICS//KO')
+    cal.add('version', '2.0')
+    cal.add('calscale', 'GREGORIAN')
+    cal.add('X-WR-CALNAME', f"{school_name} 학사일정")
+    cal.add('X-WR-TIMEZONE', 'Asia/Seoul')
+    cal.add('X-CREATED-TIME', generated_at)
+
+    rows = [event for event in _collect_rows(data) if event.get('EVENT_NM') != '토요휴업일']
+    for merged_event in _group_consecutive_events(rows):
+        event = Event()
+        event_name = merged_event['name']
+        start_date = merged_event['start_date']
+        end_date = merged_event['end_date']
+        uid_name = f"{school_name}-{start_date.strftime('%Y%m%d')}-{event_name}"
+        event.add('uid', uuid.uuid5(ICS_NAMESPACE, uid_name))
+        event.add('summary', event_name)
+        event.add('description', merged_event['description'])
+        event.add('location', merged_event['location'])
+        event.add('dtstart', start_date.date())
+        if start_date != end_date:
+            event.add('dtend', end_date.date() + timedelta(days=1))
+        event.add('dtstamp', generated_at)
+        event.add('transp', 'TRANSPARENT')
+        alarm = Alarm()
+        alarm.add('action', 'DISPLAY')
+        alarm.add('description', event_name)
+        alarm.add('trigger', timedelta(days=-1, hours=-15))
+        event.add_component(alarm)
+        cal.add_component(event)
+    return cal.to_ical().decode('utf-8')
+
+def build_year(events_per_day: int, school_name: str = "벤치마크고등학교") -> dict:
+    """한 해 동안의 NEIS 학사일정 응답을 만듭니다. 방학은 여러 날 이어지는 이벤트가 됩니다."""
+    rows = []
+    day = date(2024, 1, 1)
+    while day.year == 2024:
+        vacation = day.month in (1, 2, 8)
+        for i in range(events_per_day):
+            rows.append({
+                "SCHUL_NM": school_name,
+                "AA_YMD": day.strftime("%Y%m%d"),
+                "EVENT_NM": "겨울방학" if vacation and i == 0 else f"{day.month}월 {day.day}일 행사 {i}, 장소: 강당; 학부모 참석",
+                "EVENT_CNTNT": "" if vacation else "자세한 내용은 가정통신문을 참고하세요.\n준비물: 필기구",
+            })
+        day += timedelta(days=1)
+    return {"SchoolSchedule": [{"row": rows}]}
+
+def measure(name: str, convert, data: dict, generated_at: datetime, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = convert(data, "벤치마크고등학교", generated_at)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    convert(data, "벤치마크고등학교", generated_at)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size_mb = len(output.encode("utf-8")) / 1024 / 1024
+    best = min(samples)
+    print(
+        f"{name:<10} best {best * 1000:8.2f} ms   mean {statistics.mean(samples) * 1000:8.2f} ms   "
+        f"{size_mb / best:7.1f} MB/s   peak alloc {peak / 1024 / 1024:6.2f} MB"
+    )
+    return output
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events-per-day", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = build_year(args.events_per_day)
+    generated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    print(f"rows: {len(data['SchoolSchedule'][0]['row'])}")
+
+    expected = measure("icalendar", icalendar_convert, data, generated_at, args.repeat)
+    actual = measure("writer", convert_to_ics, data, generated_at, args.repeat)
+    print(f"output check: {'identical' if actual == expected else 'DIFFERENT'} ({len(actual.encode('utf-8'))} bytes)")
+
+if __name__ == "__main__":
+    main()
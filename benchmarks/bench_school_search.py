@@ -0,0 +1,80 @@
+"""
+학교 검색 벤치마크: 기존 pandas str.contains 경로와 n-gram 색인 경로를 비교합니다.
+자동완성(상위 10개) 시간도 함께 측정합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.bench_school_search [--repeat 3]
+"""
+import argparse
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from app.services.school_index import SchoolIndex
+from app.services.school_search import DATA_FILE_PATH
+
+def pandas_search(df: pd.DataFrame, atpt_code: str, query: str) -> list[dict]:
+    """색인 도입 전의 검색 구현입니다."""
+    return df[
+        (df['시도교육청코드'] == atpt_code) &
+        (
+            df['학교명'].str.contains(query, na=False) |
+            df['영문학교명'].str.contains(query, na=False, case=False)
+        )
+    ].fillna(value="").to_dict(orient='records')
+
+def build_queries(df: pd.DataFrame, count: int, seed: int = 0) -> list[tuple[str, str]]:
+    """실제 학교명에서 1~4글자 부분 문자열을 뽑아 검색어를 만듭니다."""
+    rng = random.Random(seed)
+    rows = df[['시도교육청코드', '학교명']].dropna().values.tolist()
+    queries = []
+    for _ in range(count):
+        atpt_code, name = rows[rng.randrange(len(rows))]
+        length = rng.randint(1, min(4, len(name)))
+        start = rng.randrange(len(name) - length + 1)
+        queries.append((atpt_code, name[start:start + length]))
+    return queries
+
+def timed(func, queries, repeat: int) -> list[float]:
+    """검색어별 실행 시간(ms)을 repeat번 반복하여 가장 빠른 값 목록을 반환합니다."""
+    results = []
+    for atpt_code, query in queries:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(atpt_code, query)
+            best = min(best, time.perf_counter() - start)
+        results.append(best * 1000)
+    return results
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<8} mean {statistics.mean(samples):8.3f} ms   p50 {statistics.median(samples):8.3f} ms   p95 {p95:8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with DATA_FILE_PATH.open("r", encoding="cp949") as f:
+        df = pd.read_csv(f)
+
+    start = time.perf_counter()
+    index = SchoolIndex(df.fillna(value="").to_dict(orient='records'))
+    print(f"index build: {(time.perf_counter() - start) * 1000:.1f} ms for {len(index)} schools")
+
+    queries = build_queries(df, args.queries)
+    mismatches = [q for q in queries if index.search(*q) != pandas_search(df, *q)]
+    print(f"result check: {len(queries) - len(mismatches)}/{len(queries)} queries identical")
+
+    report("pandas", timed(lambda a, q: pandas_search(df, a, q), queries, args.repeat))
+    report("index", timed(index.search, queries, args.repeat))
+    # 키 입력마다 호출하는 자동완성 (상위 10개)
+    report("autocmp", timed(lambda a, q: index.autocomplete(a, q, 10), queries, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+학교 데이터 시작 시간/메모리 벤치마크
+레코드 저장 방식(pandas, compact)별로 CSV를 파싱해 색인을 만드는 경로와 스냅샷을 불러오는 경로를 비교합니다.
+각 경로를 새 파이썬 프로세스에서 실행하므로 import 시간까지 포함한 콜드 스타트 시간과 프로세스 최대 RSS입니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.bench_school_startup [--repeat 5]
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# 새 프로세스에서 실행할 코드. 서비스 생성에 걸린 시간과 로드 후 RSS, 최대 RSS를 출력합니다.
+# ru_maxrss는 fork한 부모의 값을 물려받으므로 Linux에서는 /proc/self/status의 VmHWM을 사용합니다.
+CHILD_CODE = """
+import json, resource, sys, time
+from pathlib import Path
+
+def rss_mb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+start = time.perf_counter()
+# 워커와 똑같이 모듈 전역 인스턴스가 불러오는 데이터만 메모리에 있도록, import 전에 설정을 바꿉니다.
+from app.core.config import settings
+settings["school_backend"], settings["school_data_file"] = sys.argv[1], sys.argv[2]
+from app.services.school_search import school_search_service
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "ms": elapsed * 1000,
+    "schools": len(school_search_service.index),
+    "loaded_from": school_search_service.version["loaded_from"],
+    "pandas_imported": "pandas" in sys.modules,
+    "rss_mb": rss_mb("VmRSS"),
+    "max_rss_mb": rss_mb("VmHWM"),
+}))
+"""
+
+def run_once(backend: str, csv_path: Path) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, backend, str(csv_path)], capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.services.school_search import DATA_FILE_PATH, SchoolSearchService
+    from app.services.school_snapshot import write_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in ("pandas", "compact"):
+            # 스냅샷은 CSV 옆의 같은 이름(.snapshot)에서 찾으므로, 경로마다 CSV를 다른 디렉토리에 복사합니다.
+            for source in ("csv", "snapshot"):
+                csv_path = Path(tmp_dir) / backend / source / DATA_FILE_PATH.name
+                csv_path.parent.mkdir(parents=True)
+                shutil.copyfile(DATA_FILE_PATH, csv_path)
+                if source == "snapshot":
+                    index = SchoolSearchService(csv_path, backend=backend).index
+                    write_snapshot(index, csv_path.with_suffix(".snapshot"), csv_path, backend)
+
+                runs = [run_once(backend, csv_path) for _ in range(args.repeat)]
+                assert all(run["loaded_from"] == source for run in runs), runs[0]
+                times = [run["ms"] for run in runs]
+                print(
+                    f"{backend:<8} {source:<9} median {statistics.median(times):8.1f} ms   "
+                    f"min {min(times):8.1f} ms   RSS {max(run['rss_mb'] for run in runs):6.1f} MB   "
+                    f"max RSS {max(run['max_rss_mb'] for run in runs):6.1f} MB   "
+                    f"schools {runs[0]['schools']}   pandas imported: {runs[0]['pandas_imported']}"
+                )
+
+if __name__ == "__main__":
+    main()
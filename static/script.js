@@ -4,8 +4,71 @@ document.addEventListener("DOMContentLoaded", () => {
   const schoolTableBody = schoolTable.querySelector("tbody");
   const popup = document.querySelector(".popup1");
 
+  // 자동완성 요청 사이의 대기 시간(ms)과 한 번에 보여줄 후보 수
+  const AUTOCOMPLETE_DELAY = 150;
+  const AUTOCOMPLETE_LIMIT = 20;
+  let autocompleteTimer = null;
+  let autocompleteRequest = 0;
+  const CHOSEONG_ONLY = /^[ㄱ-ㅎ]+$/;
+  const HANGUL = /[ㄱ-ㅣ가-힣]/;
+
+  // 자음만 입력하면 초성으로, 한글을 입력 중이면 조합 중인 음절도 일치하도록 자모로 비교합니다.
+  function autocompleteMatchMode(schoolName) {
+    if (CHOSEONG_ONLY.test(schoolName)) return "choseong";
+    return HANGUL.test(schoolName) ? "jamo" : "contains";
+  }
+
+  function renderSchools(data) {
+    schoolTableBody.innerHTML = ""; // Clear previous results or loading indicator
+    if (data.length === 0) {
+      schoolTableBody.innerHTML = '<tr><td colspan="5">검색 결과가 없습니다.</td></tr>';
+      return;
+    }
+    data.forEach((school) => {
+      const tr = document.createElement("tr");
+      tr.innerHTML = `
+        <td>${school["학교명"]}</td>
+        <td>${school["시도교육청코드"]}</td>
+        <td>${school["행정표준코드"]}</td>
+        <td>${school["도로명주소"]}</td>
+        <td><button class="add-calendar-btn" data-atpt-code="${school["시도교육청코드"]}" data-school-code="${school["행정표준코드"]}">추가</button></td>
+      `;
+      schoolTableBody.appendChild(tr);
+    });
+  }
+
+  // 학교명을 입력하는 동안 자동완성 후보를 보여줍니다.
+  searchForm.SCHUL_NM.addEventListener("input", () => {
+    clearTimeout(autocompleteTimer);
+    const schoolName = searchForm.SCHUL_NM.value.trim();
+    if (!schoolName) {
+      return;
+    }
+    autocompleteTimer = setTimeout(() => {
+      const requestId = ++autocompleteRequest;
+      const params = new URLSearchParams({
+        ATPT_OFCDC_SC_CODE: searchForm.ATPT_OFCDC_SC_CODE.value,
+        q: schoolName,
+        limit: AUTOCOMPLETE_LIMIT,
+        MATCH_MODE: autocompleteMatchMode(schoolName),
+      });
+      fetch(`./search/autocomplete?${params}`)
+        .then((res) => (res.ok ? res.json() : null))
+        .then((data) => {
+          // 늦게 도착한 이전 입력의 응답은 무시합니다.
+          if (data && requestId === autocompleteRequest) {
+            schoolTable.hidden = false;
+            renderSchools(data.items);
+          }
+        })
+        .catch((error) => console.error("Autocomplete error:", error));
+    }, AUTOCOMPLETE_DELAY);
+  });
+
   searchForm.addEventListener("submit", (e) => {
     e.preventDefault();
+    clearTimeout(autocompleteTimer);
+    autocompleteRequest++;
     const atptCode = e.target.ATPT_OFCDC_SC_CODE.value;
     const schoolName = e.target.SCHUL_NM.value;
 
@@ -26,6 +89,8 @@ document.addEventListener("DOMContentLoaded", () => {
       body: JSON.stringify({
         ATPT_OFCDC_SC_CODE: atptCode,
         SCHUL_NM: schoolName,
+        // 자음만 입력하면 초성으로 검색합니다. (예: "ㅅㅇㄱ")
+        MATCH_MODE: CHOSEONG_ONLY.test(schoolName) ? "choseong" : "contains",
       }),
     })
       .then((res) => {
@@ -34,24 +99,7 @@ document.addEventListener("DOMContentLoaded", () => {
         }
         return res.json();
       })
-      .then((data) => {
-        schoolTableBody.innerHTML = ""; // Clear previous results or loading indicator
-        if (data.length === 0) {
-          schoolTableBody.innerHTML = '<tr><td colspan="5">검색 결과가 없습니다.</td></tr>';
-          return;
-        }
-        data.forEach((school) => {
-          const tr = document.createElement("tr");
-          tr.innerHTML = `
-            <td>${school["학교명"]}</td>
-            <td>${school["시도교육청코드"]}</td>
-            <td>${school["행정표준코드"]}</td>
-            <td>${school["도로명주소"]}</td>
-            <td><button class="add-calendar-btn" data-atpt-code="${school["시도교육청코드"]}" data-school-code="${school["행정표준코드"]}">추가</button></td>
-          `;
-          schoolTableBody.appendChild(tr);
-        });
-      })
+      .then((data) => renderSchools(data))
       .catch((error) => {
         schoolTableBody.innerHTML = `<tr><td colspan="5">오류가 발생했습니다: ${error.message}</td></tr>`;
         console.error("Fetch error:", error);
@@ -0,0 +1,81 @@
+"""
+테스트용 로컬 NEIS 학사일정(SchoolSchedule) API 서버입니다.
+실제 API와 같이 KEY, ATPT_OFCDC_SC_CODE, SD_SCHUL_CODE로 행을 거르고 pIndex/pSize로 페이지를 나눠 응답합니다.
+httpx.ASGITransport로 연결하므로 네트워크 없이 프로세스 안에서 동작합니다.
+
+사용 예:
+    server = MockNeisServer(rows)
+    mocker.patch.object(neis, '_client', server.client())
+"""
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+MOCK_API_KEY = "TEST_API_KEY"
+
+def make_rows(atpt_code: str, school_code: str, count: int, school_name: str = "테스트고") -> list[dict]:
+    """학교 하나의 학사일정 행을 count개 만듭니다. (날짜와 행사명이 모두 다름)"""
+    return [
+        {
+            "ATPT_OFCDC_SC_CODE": atpt_code,
+            "SD_SCHUL_CODE": school_code,
+            "SCHUL_NM": school_name,
+            "AA_YMD": f"2024{1 + i // 28 % 12:02d}{1 + i % 28:02d}",
+            "EVENT_NM": f"행사{i}",
+            "EVENT_CNTNT": "",
+            "LOAD_DTM": "20240101",
+        }
+        for i in range(count)
+    ]
+
+class MockNeisServer:
+    def __init__(self, rows: list[dict], delay: float = 0):
+        self.rows = rows
+        self.delay = delay  # 요청마다 응답을 늦추는 시간(초), 동시 요청 수 확인용
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = Starlette(routes=[Route("/hub/SchoolSchedule", self.school_schedule)])
+
+    def client(self) -> httpx.AsyncClient:
+        """이 서버로 요청을 보내는 AsyncClient를 반환합니다."""
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app))
+
+    async def school_schedule(self, request: Request) -> JSONResponse:
+        params = dict(request.query_params)
+        self.requests.append(params)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            return JSONResponse(self._respond(params))
+        finally:
+            self.in_flight -= 1
+
+    def _respond(self, params: dict) -> dict:
+        if params.get("KEY") != MOCK_API_KEY:
+            return {"RESULT": {"CODE": "ERROR-290", "MESSAGE": "인증키가 유효하지 않습니다."}}
+
+        matched = [
+            row for row in self.rows
+            if row["ATPT_OFCDC_SC_CODE"] == params.get("ATPT_OFCDC_SC_CODE")
+            and ("SD_SCHUL_CODE" not in params or row["SD_SCHUL_CODE"] == params["SD_SCHUL_CODE"])
+        ]
+        page_index = int(params.get("pIndex", 1))
+        page_size = int(params.get("pSize", 100))
+        page = matched[(page_index - 1) * page_size:page_index * page_size]
+        if not page:
+            # 실제 API와 같이 데이터가 없거나 범위를 벗어난 페이지는 INFO-200을 반환합니다.
+            return {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+        return {"SchoolSchedule": [
+            {"head": [
+                {"list_total_count": len(matched)},
+                {"RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다."}},
+            ]},
+            {"row": page},
+        ]}
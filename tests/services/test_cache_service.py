@@ -1,6 +1,12 @@
+import asyncio
+import gzip
+import hashlib
+import time
+
 import pytest
 from datetime import datetime, timedelta, timezone
-from app.services.cache_service import CacheService
+from app.services.cache_service import CacheService, brotli, check_cache_key
+from app.services.memory_cache import MemoryCache
 
 # 테스트용 키와 콘텐츠
 TEST_ATPT_CODE = "T10"
@@ -74,3 +80,295 @@ def test_cache_get_invalid_timestamp(cache_service):
 
     retrieved_path = cache_service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
     assert retrieved_path is None
+
+def test_cache_get_stale_within_window(tmp_path):
+    """만료되었지만 max_stale 기간 안에 있는 캐시는 get_stale로 가져올 수 있는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    service = CacheService(base_dir=str(tmp_path), duration_days=7, max_stale_days=3)
+    fake_now = datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
+    content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=8)).isoformat())
+    cache_path = service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    # --- 실행 및 단언 (Act & Assert) ---
+    assert service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now_func=lambda: fake_now) is None
+    assert service.get_stale(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now_func=lambda: fake_now) == cache_path
+
+def test_cache_get_stale_beyond_window(tmp_path):
+    """max_stale 기간마저 지난 캐시는 get_stale에서도 None을 반환하는지 테스트합니다."""
+    service = CacheService(base_dir=str(tmp_path), duration_days=7, max_stale_days=3)
+    fake_now = datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
+    content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=11)).isoformat())
+    service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    assert service.get_stale(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now_func=lambda: fake_now) is None
+
+def test_cache_hit_does_not_read_file(cache_service, mocker):
+    """인덱스에 기록된 캐시는 파일 내용을 읽지 않고 적중 여부를 판단하는지 테스트합니다."""
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    cache_path = cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    mock_read = mocker.patch('pathlib.Path.read_bytes')
+    assert cache_service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) == cache_path
+    mock_read.assert_not_called()
+
+def test_cache_entry_metadata(cache_service):
+    """set 시 크기, 해시, 원본 지문이 인덱스에 기록되는지 테스트합니다."""
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    content = TEST_ICS_CONTENT_TEMPLATE.format(created.isoformat())
+    cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content, fingerprint="abc")
+
+    entry = cache_service.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+    assert entry.created_time == created
+    assert entry.size == len(content.encode("utf8"))
+    assert entry.sha256 == hashlib.sha256(content.encode("utf8")).hexdigest()
+    assert entry.fingerprint == "abc"
+
+def test_cache_index_survives_restart(tmp_path):
+    """새 CacheService 인스턴스(재시작, 다른 워커)에서도 인덱스가 그대로 유지되는지 테스트합니다."""
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    CacheService(base_dir=str(tmp_path), duration_days=7).set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content, fingerprint="abc")
+
+    restarted = CacheService(base_dir=str(tmp_path), duration_days=7)
+    assert restarted.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) is not None
+    assert restarted.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE).fingerprint == "abc"
+
+def test_cache_file_without_index_entry_is_backfilled(cache_service, tmp_path):
+    """인덱스가 없던 시절에 만들어진 캐시 파일도 한 번 읽어서 인덱스에 채우는지 테스트합니다."""
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    legacy_file = tmp_path / TEST_ATPT_CODE / f"{TEST_SCHOOL_CODE}.ics"
+    legacy_file.parent.mkdir(parents=True)
+    legacy_file.write_text(content, encoding="utf8")
+
+    assert cache_service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) == legacy_file
+    assert cache_service.index.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) is not None
+
+def test_cache_file_changed_outside_is_reindexed(cache_service):
+    """인덱스 기록 이후 파일이 외부에서 바뀌면 다시 읽어 인덱스를 고치는지 테스트합니다."""
+    fake_now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    old_content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=8)).isoformat())
+    cache_path = cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, old_content)
+
+    new_content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=1)).isoformat()) + "\n"
+    cache_path.write_text(new_content, encoding="utf8")
+
+    assert cache_service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now_func=lambda: fake_now) == cache_path
+
+def test_cache_touch_extends_freshness_without_rewriting(cache_service):
+    """touch가 파일을 다시 쓰지 않고 유효 기간만 연장하는지 테스트합니다."""
+    fake_now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=8)).isoformat())
+    cache_path = cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+    before = cache_service.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+
+    cache_service.touch(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now_func=lambda: fake_now)
+
+    assert cache_service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now_func=lambda: fake_now) == cache_path
+    after = cache_service.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+    assert after.sha256 == before.sha256
+    assert after.created_time == before.created_time
+    assert cache_service.max_age(after, now_func=lambda: fake_now) == 7 * 24 * 60 * 60
+
+def test_cache_set_writes_precompressed_variants(cache_service):
+    """set 시 압축된 변형 파일을 함께 저장하고, 풀면 원본과 같은지 테스트합니다."""
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    gzip_path = cache_service.get_encoded_path(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "gzip")
+    assert gzip_path is not None
+    assert gzip.decompress(gzip_path.read_bytes()).decode("utf8") == content
+
+    if "br" in cache_service.encodings:
+        br_path = cache_service.get_encoded_path(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "br")
+        assert brotli.decompress(br_path.read_bytes()).decode("utf8") == content
+
+def test_cache_without_compression(tmp_path):
+    """압축 인코딩을 비워 두면 변형 파일을 만들지 않는지 테스트합니다."""
+    service = CacheService(base_dir=str(tmp_path), duration_days=7, encodings=[])
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    assert service.get_encoded_path(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "gzip") is None
+
+def test_memory_tier_serves_hits_without_file_access(tmp_path, mocker):
+    """메모리 계층이 켜져 있으면 적중 시 파일 stat/read 없이 응답하는지 테스트합니다."""
+    service = CacheService(base_dir=str(tmp_path), duration_days=7, memory=MemoryCache(max_bytes=1024 * 1024))
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    cache_path = service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    mock_stat = mocker.patch('pathlib.Path.stat')
+    mock_read = mocker.patch('pathlib.Path.read_bytes')
+
+    assert service.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) == cache_path
+    entry = service.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+    assert service.read_bytes(TEST_ATPT_CODE, TEST_SCHOOL_CODE, entry) == content.encode("utf8")
+    assert gzip.decompress(service.read_bytes(TEST_ATPT_CODE, TEST_SCHOOL_CODE, entry, "gzip")) == content.encode("utf8")
+    mock_stat.assert_not_called()
+    mock_read.assert_not_called()
+
+def test_memory_tier_picks_up_rewrite_from_other_worker(tmp_path):
+    """다른 워커(인스턴스)가 캐시를 다시 쓰면, 검증 기간 이후 새 버전을 제공하는지 테스트합니다."""
+    memory = MemoryCache(max_bytes=1024 * 1024, ttl_seconds=0)
+    worker_a = CacheService(base_dir=str(tmp_path), duration_days=7, memory=memory)
+    worker_b = CacheService(base_dir=str(tmp_path), duration_days=7)
+    now = datetime.now(timezone.utc).isoformat()
+    worker_a.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, TEST_ICS_CONTENT_TEMPLATE.format(now))
+
+    new_content = TEST_ICS_CONTENT_TEMPLATE.format(now) + "\nX-NEW"
+    worker_b.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, new_content)
+
+    entry = worker_a.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+    assert worker_a.read_bytes(TEST_ATPT_CODE, TEST_SCHOOL_CODE, entry) == new_content.encode("utf8")
+
+def test_collect_garbage_removes_expired_entries(cache_service):
+    """유지 기간을 넘은 캐시 파일과 압축 변형, 인덱스 항목을 삭제하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    fake_now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    old_content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=30)).isoformat())
+    new_content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=1)).isoformat())
+    old_path = cache_service.set(TEST_ATPT_CODE, 1, old_content)
+    new_path = cache_service.set(TEST_ATPT_CODE, 2, new_content)
+
+    # --- 실행 (Act) ---
+    report = cache_service.collect_garbage(max_age=timedelta(days=14), now_func=lambda: fake_now)
+
+    # --- 단언 (Assert) ---
+    assert report["scanned"] == 2
+    assert report["removed_expired"] == 1
+    assert report["reclaimed_bytes"] > len(old_content)
+    assert not old_path.exists()
+    assert cache_service.get_encoded_path(TEST_ATPT_CODE, 1, "gzip") is None
+    assert cache_service.index.get(TEST_ATPT_CODE, 1) is None
+    # 삭제한 키의 잠금 파일도 남지 않습니다.
+    assert not (old_path.parent / ".1.lock").exists()
+    assert new_path.exists()
+
+def test_collect_garbage_enforces_size_budget(cache_service):
+    """전체 크기가 예산을 넘으면 가장 오래된 항목부터 삭제하는지 테스트합니다."""
+    fake_now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    paths = {}
+    for days_ago, code in [(3, 1), (2, 2), (1, 3)]:
+        content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=days_ago)).isoformat())
+        paths[code] = cache_service.set(TEST_ATPT_CODE, code, content)
+    per_entry = sum(p.stat().st_size for p in paths[3].parent.glob("3.ics*"))
+
+    report = cache_service.collect_garbage(max_total_bytes=per_entry * 2, now_func=lambda: fake_now)
+
+    assert report["removed_for_budget"] == 1
+    assert not paths[1].exists()
+    assert paths[2].exists() and paths[3].exists()
+    assert report["remaining_bytes"] <= per_entry * 2
+
+def test_collect_garbage_dry_run_keeps_files(cache_service):
+    """dry_run이면 삭제하지 않고 결과만 보고하는지 테스트합니다."""
+    fake_now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=30)).isoformat())
+    path = cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+
+    report = cache_service.collect_garbage(max_age=timedelta(days=14), dry_run=True, now_func=lambda: fake_now)
+
+    assert report["removed_expired"] == 1
+    assert report["reclaimed_bytes"] > 0
+    assert path.exists()
+
+def test_trim_keeps_most_recently_checked_entries(cache_service):
+    """한 교육청 코드의 항목이 max_entries개를 넘으면 가장 오래 확인되지 않은 항목부터 삭제하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    fake_now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    paths = {}
+    for days_ago, code in [(3, 1), (2, 2), (1, 3)]:
+        content = TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=days_ago)).isoformat())
+        paths[code] = cache_service.set("merged", code, content)
+    # 가장 오래 전에 만들어졌지만 최근에 다시 확인된 항목은 남습니다.
+    cache_service.touch("merged", 1, now_func=lambda: fake_now)
+    other = cache_service.set(TEST_ATPT_CODE, 4, TEST_ICS_CONTENT_TEMPLATE.format((fake_now - timedelta(days=9)).isoformat()))
+
+    # --- 실행 (Act) ---
+    removed = cache_service.trim("merged", max_entries=2)
+
+    # --- 단언 (Assert) ---
+    assert removed == 1
+    assert not paths[2].exists()
+    assert cache_service.index.get("merged", 2) is None
+    assert paths[1].exists() and paths[3].exists()
+    assert other.exists()
+    assert cache_service.trim("merged", max_entries=2) == 0
+
+def test_collect_garbage_removes_orphan_index_rows(cache_service):
+    """파일이 사라진 인덱스 항목을 정리하는지 테스트합니다."""
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    path = cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content)
+    path.unlink()
+
+    report = cache_service.collect_garbage()
+
+    assert report["removed_orphans"] == 1
+    assert cache_service.index.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) is None
+
+@pytest.mark.asyncio
+async def test_set_async_writes_off_the_event_loop(cache_service, mocker):
+    """set_async가 압축과 파일 쓰기를 별도 스레드에서 처리하여 이벤트 루프가 그동안 다른 작업을 할 수 있는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    original_set = cache_service.set
+    loop_ticks = []
+
+    def slow_set(*args, **kwargs):
+        # 느린 압축을 흉내 냅니다. 이벤트 루프에서 실행되면 ticker가 그동안 실행되지 못합니다.
+        time.sleep(0.1)
+        return original_set(*args, **kwargs)
+
+    mocker.patch.object(cache_service, 'set', side_effect=slow_set)
+
+    async def ticker():
+        for _ in range(5):
+            loop_ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    # --- 실행 (Act) ---
+    path, _ = await asyncio.gather(
+        cache_service.set_async(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content, fingerprint="abc"),
+        ticker(),
+    )
+
+    # --- 단언 (Assert) ---
+    assert len(loop_ticks) == 5
+    assert loop_ticks[-1] - loop_ticks[0] < 0.1
+    assert path.read_text(encoding="utf8") == content
+    assert cache_service.get_entry(TEST_ATPT_CODE, TEST_SCHOOL_CODE).fingerprint == "abc"
+
+@pytest.mark.parametrize("atpt_code, school_code", [
+    ("../../escape_dir", 123),
+    ("B10/..", 123),
+    ("..", 123),
+    ("", 123),
+    ("B10", "../1"),
+    ("B10", "a\\b"),
+])
+def test_cache_keys_cannot_leave_base_dir(cache_service, atpt_code, school_code):
+    """경로 구분자나 ".."가 들어간 캐시 키로는 파일 경로나 잠금을 만들 수 없는지 테스트합니다."""
+    with pytest.raises(ValueError):
+        check_cache_key(atpt_code, school_code)
+    with pytest.raises(ValueError):
+        cache_service.lock(atpt_code, school_code)
+    with pytest.raises(ValueError):
+        cache_service.set(atpt_code, school_code, "BEGIN:VCALENDAR")
+
+def test_variant_cache_keys_are_allowed(cache_service):
+    """변형 캘린더의 키(예: "1234.noholiday")는 정상적인 캐시 키로 허용되는지 테스트합니다."""
+    check_cache_key("B10", "1234.noholiday-grade2")
+    assert cache_service.lock("B10", "1234.noholiday").lock_path.parent == cache_service.base_dir / "B10"
+
+def test_set_uses_precompressed_bodies(cache_service, mocker):
+    """compress_bodies로 미리 압축한 변형을 set에 넘기면 다시 압축하지 않고 그대로 저장하는지 테스트합니다."""
+    from app.services import cache_service as cache_service_module
+
+    content = TEST_ICS_CONTENT_TEMPLATE.format(datetime.now(timezone.utc).isoformat())
+    compressed = cache_service_module.compress_bodies(content, cache_service.encodings)
+    spy_compress = mocker.spy(cache_service_module, 'compress')
+
+    cache_service.set(TEST_ATPT_CODE, TEST_SCHOOL_CODE, content, compressed=compressed)
+
+    assert spy_compress.call_count == 0
+    gz_path = cache_service.get_encoded_path(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "gzip")
+    assert gz_path.read_bytes() == compressed["gzip"]
+    assert gzip.decompress(gz_path.read_bytes()).decode("utf8") == content
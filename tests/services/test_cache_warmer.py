@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.cache_service import CacheService
+from app.services.cache_warmer import CacheWarmer
+
+pytestmark = pytest.mark.asyncio
+
+ICS_CONTENT_TEMPLATE = """BEGIN:VCALENDAR
+X-CREATED-TIME:{}
+END:VCALENDAR"""
+
+@pytest.fixture
+def cache(tmp_path):
+    """1일짜리 캐시 서비스를 생성하는 픽스처."""
+    return CacheService(base_dir=str(tmp_path), duration_days=1, encodings=())
+
+def cache_with_age(cache: CacheService, atpt_code: str, school_code: int, age: timedelta):
+    """age만큼 전에 만들어진 캘린더를 캐시에 저장합니다."""
+    created = datetime.now(timezone.utc) - age
+    cache.set(atpt_code, school_code, ICS_CONTENT_TEMPLATE.format(created.isoformat()))
+
+async def test_due_schools_warms_only_requested_calendars_close_to_expiry(cache):
+    """요청된 학교 중 만료가 lead 구간 안으로 다가온 캘린더만 갱신 대상이 되는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    warmer = CacheWarmer(cache, interval_seconds=0, lead_minutes=60, mode="all")
+    cache_with_age(cache, "B10", 1, timedelta(hours=23, minutes=50))  # 10분 뒤 만료
+    cache_with_age(cache, "B10", 2, timedelta(hours=1))               # 23시간 뒤 만료
+    cache_with_age(cache, "B10", 3, timedelta(days=2))                # 이미 만료
+    cache_with_age(cache, "B10", 5, timedelta(hours=23, minutes=50))  # 요청된 적 없음
+    for school_code in (1, 2, 3, 4):  # 4는 캐시가 없는 학교
+        warmer.record("B10", school_code)
+
+    # --- 실행 및 단언 (Act & Assert) ---
+    assert sorted(warmer.due_schools()) == [("B10", 1), ("B10", 3)]
+
+async def test_lead_time_is_spread_across_the_second_half_of_the_window(cache):
+    """학교마다 갱신 시점이 lead 구간의 절반에서 전체 사이로 나뉘는지 테스트합니다."""
+    warmer = CacheWarmer(cache, interval_seconds=0, lead_minutes=60)
+    leads = [warmer._lead_seconds(("B10", school_code)) for school_code in range(200)]
+
+    assert all(1800 <= lead <= 3600 for lead in leads)
+    assert len({round(lead) for lead in leads}) > 100
+    assert warmer._lead_seconds(("B10", 7)) == warmer._lead_seconds(("B10", 7))
+
+async def test_top_k_mode_warms_most_requested_schools(cache):
+    """top_k 모드에서는 가장 많이 요청된 학교만 갱신 대상이 되는지 테스트합니다."""
+    warmer = CacheWarmer(cache, interval_seconds=0, mode="top_k", top_k=2)
+    for school_code, hits in ((1, 1), (2, 5), (3, 3)):
+        cache_with_age(cache, "B10", school_code, timedelta(days=2))
+        for _ in range(hits):
+            warmer.record("B10", school_code)
+
+    assert warmer.due_schools() == [("B10", 2), ("B10", 3)]
+
+async def test_forgets_schools_not_requested_recently(cache):
+    """forget_after 동안 요청되지 않은 학교는 추적하지 않는지 테스트합니다."""
+    warmer = CacheWarmer(cache, interval_seconds=0, mode="all", forget_after=timedelta(0))
+    cache_with_age(cache, "B10", 1, timedelta(days=2))
+    warmer.record("B10", 1)
+    await asyncio.sleep(0.01)
+
+    assert warmer.due_schools() == []
+    assert warmer.stats()["tracked"] == 0
+
+async def test_max_tracked_limits_new_schools(cache):
+    """추적 중인 학교가 max_tracked개이면 새 학교는 기록하지 않는지 테스트합니다."""
+    warmer = CacheWarmer(cache, interval_seconds=0, max_tracked=1)
+    warmer.record("B10", 1)
+    warmer.record("B10", 2)
+    warmer.record("B10", 1)
+
+    assert warmer.stats()["tracked"] == 1
+    assert warmer.stats()["untracked"] == 1
+
+async def test_warm_due_respects_concurrency_and_backs_off_failures(cache):
+    """갱신이 concurrency개를 넘지 않고, 실패한 학교는 다음 lead 구간까지 다시 시도하지 않는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    warmer = CacheWarmer(cache, interval_seconds=0, mode="all", concurrency=2, rate=0)
+    for school_code in range(1, 6):
+        cache_with_age(cache, "B10", school_code, timedelta(days=2))
+        warmer.record("B10", school_code)
+    in_flight, max_in_flight, calls = 0, 0, []
+
+    async def handler(atpt_code, school_code):
+        nonlocal in_flight, max_in_flight
+        calls.append(school_code)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if school_code == 5:
+            raise RuntimeError("NEIS down")
+
+    warmer.start(handler)
+
+    # --- 실행 (Act) ---
+    refreshed = await warmer.warm_due()
+    second = await warmer.warm_due()
+
+    # --- 단언 (Assert) ---
+    assert refreshed == 4
+    assert max_in_flight == 2
+    # 핸들러가 캐시를 갱신하지 않았으므로 두 번째 실행에서도 실패하지 않은 학교만 다시 갱신합니다.
+    assert second == 4
+    assert calls.count(5) == 1
+    assert warmer.stats() | {"tracked": None} == {
+        "running": False, "mode": "all", "tracked": None, "untracked": 0,
+        "passes": 2, "refreshed": 8, "failed": 1,
+    }
+
+async def test_warm_due_checks_the_index_off_the_event_loop(cache, mocker):
+    """갱신 대상을 고를 때 인덱스 조회를 이벤트 루프 스레드가 아닌 곳에서 하는지 테스트합니다."""
+    warmer = CacheWarmer(cache, interval_seconds=0, mode="all", rate=0)
+    cache_with_age(cache, "B10", 1, timedelta(days=2))
+    warmer.record("B10", 1)
+    threads = []
+    get_entry = cache.get_entry
+    mocker.patch.object(cache, 'get_entry',
+                        side_effect=lambda *args, **kwargs: threads.append(threading.get_ident()) or get_entry(*args, **kwargs))
+
+    async def handler(atpt_code, school_code):
+        pass
+
+    warmer.start(handler)
+
+    assert await warmer.warm_due() == 1
+    assert threads and threading.get_ident() not in threads
+
+async def test_rejects_unknown_mode(cache):
+    """알 수 없는 mode는 ValueError를 발생시키는지 테스트합니다."""
+    with pytest.raises(ValueError):
+        CacheWarmer(cache, interval_seconds=0, mode="hot")
@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.services.event_store import EventStore
+
+TEST_ATPT_CODE = "T10"
+TEST_SCHOOL_CODE = 12345678
+
+@pytest.fixture
+def event_store(tmp_path):
+    """임시 디렉토리에 이벤트 저장소를 만드는 픽스처."""
+    store = EventStore(tmp_path / "events.sqlite3")
+    yield store
+    store.close()
+
+def make_row(day: str, name: str, **extra) -> dict:
+    return {"AA_YMD": day, "EVENT_NM": name, "EVENT_CNTNT": "", "SCHUL_NM": "테스트고", **extra}
+
+def test_put_and_get_round_trip(event_store):
+    """저장한 행이 열 이름, 수업공제일명, 학년 구분과 함께 그대로 돌아오는지 테스트합니다."""
+    fetched_time = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    rows = [
+        make_row("20240301", "삼일절", SBTR_DD_SC_NM="공휴일"),
+        make_row("20240304", "1학년 수련회", ONE_GRADE_EVENT_YN="Y", TW_GRADE_EVENT_YN="N", THREE_GRADE_EVENT_YN="N"),
+        {"AA_YMD": "20240305", "EVENT_NM": "설명 없는 행사"},
+    ]
+
+    event_store.put(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "테스트고", rows, "abc", fetched_time)
+    stored = event_store.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+
+    assert stored.school_name == "테스트고"
+    assert stored.fingerprint == "abc"
+    assert stored.fetched_time == fetched_time
+    assert [row["EVENT_NM"] for row in stored.rows] == ["삼일절", "1학년 수련회", "설명 없는 행사"]
+    assert stored.rows[0]["SBTR_DD_SC_NM"] == "공휴일"
+    assert stored.rows[1]["ONE_GRADE_EVENT_YN"] == "Y"
+    assert stored.rows[1]["TW_GRADE_EVENT_YN"] == "N"
+    # 원본에 없던 열은 만들지 않습니다.
+    assert "SCHUL_NM" not in stored.rows[2]
+    assert event_store.fetched_time(TEST_ATPT_CODE, TEST_SCHOOL_CODE) == fetched_time
+
+def test_put_replaces_previous_rows(event_store):
+    """다시 저장하면 이전 행이 모두 새 행으로 바뀌는지 테스트합니다."""
+    now = datetime.now(timezone.utc)
+    event_store.put(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "테스트고", [make_row("20240301", "이전")], "old", now)
+    event_store.put(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "테스트고", [make_row("20240302", "새 행사")], "new", now)
+
+    stored = event_store.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE)
+
+    assert [row["EVENT_NM"] for row in stored.rows] == ["새 행사"]
+    assert stored.fingerprint == "new"
+
+def test_touch_and_delete_older_than(event_store):
+    """touch는 확인 시각만 갱신하고, 오래 확인하지 않은 학교는 삭제되는지 테스트합니다."""
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    now = datetime.now(timezone.utc)
+    assert not event_store.touch(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now)
+    event_store.put(TEST_ATPT_CODE, TEST_SCHOOL_CODE, "테스트고", [make_row("20240301", "행사")], "abc", old)
+    event_store.put(TEST_ATPT_CODE, 1, "다른고", [make_row("20240301", "행사")], "def", old)
+
+    assert event_store.touch(TEST_ATPT_CODE, TEST_SCHOOL_CODE, now)
+    assert event_store.delete_older_than(now - timedelta(days=14)) == 1
+
+    assert event_store.get(TEST_ATPT_CODE, 1) is None
+    assert len(event_store.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE).rows) == 1
+
+def test_get_without_database(event_store):
+    """저장한 적이 없으면 DB 파일을 만들지 않고 None을 반환하는지 테스트합니다."""
+    assert event_store.get(TEST_ATPT_CODE, TEST_SCHOOL_CODE) is None
+    assert event_store.fetched_time(TEST_ATPT_CODE, TEST_SCHOOL_CODE) is None
+    assert not event_store.db_path.exists()
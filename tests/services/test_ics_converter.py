@@ -1,5 +1,7 @@
 import pytest
-from app.services.ics_converter import convert_to_ics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from app.services.ics_converter import CalendarVariant, ScheduleRows, convert_to_ics, iter_ics_lines, schedule_fingerprint
 from icalendar import Calendar
 
 @pytest.fixture
@@ -131,3 +133,121 @@ def test_convert_to_ics_empty_data():
     events = list(cal.walk('vevent'))
     assert len(events) == 0
     assert cal['X-WR-CALNAME'] == f"{school_name} 학사일정"
+
+def test_schedule_fingerprint_ignores_row_order_and_load_time(sample_schedule_data):
+    """원본 지문이 행 순서나 적재 시각(LOAD_DTM)에 영향을 받지 않는지 테스트합니다."""
+    rows = sample_schedule_data["SchoolSchedule"][1]["row"]
+    reordered = {"SchoolSchedule": [{"row": [dict(r, LOAD_DTM="20250101") for r in reversed(rows)]}]}
+
+    assert schedule_fingerprint(sample_schedule_data) == schedule_fingerprint(reordered)
+
+    changed = {"SchoolSchedule": [{"row": [dict(rows[0], EVENT_NM="변경됨"), rows[1]]}]}
+    assert schedule_fingerprint(sample_schedule_data) != schedule_fingerprint(changed)
+
+def test_convert_to_ics_is_byte_stable_with_generated_at(sample_schedule_data):
+    """같은 데이터와 같은 generated_at으로 변환하면 항상 같은 결과가 나오는지 테스트합니다."""
+    generated_at = datetime(2024, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+    first = convert_to_ics(sample_schedule_data, "테스트고등학교", generated_at=generated_at)
+    second = convert_to_ics(sample_schedule_data, "테스트고등학교", generated_at=generated_at)
+
+    assert first == second
+    assert "DTSTAMP:20240301T090000Z" in first
+
+def test_schedule_rows_accumulates_pages(sample_schedule_data):
+    """페이지를 나눠 받아 누적한 ScheduleRows가 한 번에 받은 응답과 같은 결과를 만드는지 테스트합니다."""
+    rows = sample_schedule_data["SchoolSchedule"][1]["row"]
+    schedule = ScheduleRows()
+    for row in reversed(rows):
+        schedule.add(dict(row, LOAD_DTM="20240101"))
+
+    assert len(schedule) == len(rows)
+    assert "LOAD_DTM" not in schedule.rows[0]
+    assert schedule.fingerprint() == schedule_fingerprint(sample_schedule_data)
+    generated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert convert_to_ics(schedule, "테스트고등학교", generated_at=generated_at) == \
+        convert_to_ics(sample_schedule_data, "테스트고등학교", generated_at=generated_at)
+
+GOLDEN_FILE = Path(__file__).parent / "golden" / "school_schedule.ics"
+# 골든 파일은 icalendar 라이브러리(Calendar.to_ical)로 변환하던 때의 출력입니다.
+# 이스케이프(쉼표, 세미콜론, 역슬래시, 줄바꿈), 여러 날 이벤트, 긴 줄 접기, null 열을 모두 포함합니다.
+GOLDEN_ROWS = [
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20240301", "EVENT_NM": "입학식", "EVENT_CNTNT": "강당, 10시; 학부모 참석 가능"},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20240302", "EVENT_NM": "토요휴업일", "EVENT_CNTNT": ""},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20240715", "EVENT_NM": "여름방학", "EVENT_CNTNT": "방학식 후 하교\n둘째 줄\r\n셋째 줄"},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20240716", "EVENT_NM": "여름방학", "EVENT_CNTNT": ""},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20240717", "EVENT_NM": "여름방학", "EVENT_CNTNT": ""},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20241009", "EVENT_NM": "한글날 기념 행사와 아주 긴 이름을 가진 학교 행사로서 줄 접기가 여러 번 일어나야 하는 경우", "EVENT_CNTNT": "경로 C:\\학교\\행사 및 \\N 표기"},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20241010", "EVENT_NM": "Mixed ASCII event name long enough to fold right at an escaped comma,,,,, here", "EVENT_CNTNT": "a" * 61 + ";b"},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20241225", "EVENT_NM": "성탄절", "EVENT_CNTNT": "공휴일"},
+    # NEIS가 null로 보낸 열은 빈 값으로 씁니다.
+    {"SCHUL_NM": None, "AA_YMD": "20241230", "EVENT_NM": "종업식", "EVENT_CNTNT": None},
+    {"SCHUL_NM": "골든고등학교", "AA_YMD": "20241231", "EVENT_NM": None, "EVENT_CNTNT": "이름 없는 행사"},
+]
+
+GOLDEN_GENERATED_AT = datetime(2024, 2, 29, 12, 34, 56, 789012, tzinfo=timezone.utc)
+
+def test_convert_to_ics_matches_golden_file():
+    """직접 작성한 ICS 출력이 icalendar 라이브러리로 만들던 출력과 바이트 단위로 같은지 테스트합니다."""
+    data = {"SchoolSchedule": [{"head": []}, {"row": GOLDEN_ROWS}]}
+
+    ics_string = convert_to_ics(data, "골든고등학교", generated_at=GOLDEN_GENERATED_AT)
+
+    assert ics_string == GOLDEN_FILE.read_bytes().decode("utf-8")
+
+def test_calendar_name_is_written_like_icalendar():
+    """X-WR-CALNAME은 icalendar 라이브러리처럼 쉼표, 세미콜론, 역슬래시를 이스케이프하지 않고 그대로 쓰는지 테스트합니다."""
+    data = {"SchoolSchedule": [{"row": GOLDEN_ROWS[:1]}]}
+
+    ics_string = convert_to_ics(data, "쉼표, 세미콜론; 역슬래시\\ 고", generated_at=GOLDEN_GENERATED_AT)
+
+    # icalendar 라이브러리로 만든 출력의 해당 줄과 같은 값입니다.
+    assert "\r\nX-WR-CALNAME:쉼표, 세미콜론; 역슬래시\\ 고 학사일정\r\n" in ics_string
+    # 줄바꿈만은 내용 줄을 깨뜨리지 않도록 바꿔 씁니다.
+    assert "\r\nX-WR-CALNAME:첫 줄\\n둘째 줄 학사일정\r\n" in convert_to_ics(data, "첫 줄\n둘째 줄", generated_at=GOLDEN_GENERATED_AT)
+
+def test_iter_ics_lines_yields_folded_lines_that_icalendar_parses():
+    """한 줄씩 내보낸 출력이 75옥텟 이하의 CRLF 줄이고, icalendar로 파싱하면 원래 값이 나오는지 테스트합니다."""
+    lines = list(iter_ics_lines({"SchoolSchedule": [{"row": GOLDEN_ROWS}]}, "골든고등학교", generated_at=GOLDEN_GENERATED_AT))
+
+    physical_lines = "".join(lines).split("\r\n")
+    assert physical_lines[-1] == ""
+    assert all(len(line.encode("utf-8")) <= 75 for line in physical_lines)
+
+    cal = Calendar.from_ical("".join(lines))
+    events = list(cal.walk('vevent'))
+    assert [str(event['summary']) for event in events] == [
+        "입학식", "여름방학", GOLDEN_ROWS[5]["EVENT_NM"], GOLDEN_ROWS[6]["EVENT_NM"], "성탄절", "종업식", "",
+    ]
+    assert events[0]['description'] == "강당, 10시; 학부모 참석 가능"
+    assert events[1]['description'] == "방학식 후 하교\n둘째 줄\n셋째 줄"
+    assert events[1]['dtend'].to_ical() == b'20240718'
+    assert events[2]['description'] == "경로 C:\\학교\\행사 및 \n 표기"
+    assert events[3]['description'] == "a" * 61 + ";b"
+    assert events[5]['description'] == "" and events[5]['location'] == ""
+    assert events[0].walk('valarm')[0]['trigger'].dt == timedelta(days=-1, hours=-15)
+
+def test_convert_to_ics_variants():
+    """공휴일 제외, 알림 끄기, 학년별 변형이 해당 행만 고르고 나머지는 기본 캘린더와 같은지 테스트합니다."""
+    data = {"SchoolSchedule": [{"row": [
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240301", "EVENT_NM": "삼일절", "SBTR_DD_SC_NM": "공휴일"},
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240304", "EVENT_NM": "1학년 수련회", "ONE_GRADE_EVENT_YN": "Y", "TW_GRADE_EVENT_YN": "N"},
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240305", "EVENT_NM": "2학년 현장체험", "ONE_GRADE_EVENT_YN": "N", "TW_GRADE_EVENT_YN": "Y"},
+    ]}]}
+    generated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def summaries(variant):
+        cal = Calendar.from_ical(convert_to_ics(data, "테스트고", generated_at=generated_at, variant=variant))
+        return [str(event['summary']) for event in cal.walk('vevent')]
+
+    assert CalendarVariant().key == ""
+    assert convert_to_ics(data, "테스트고", generated_at=generated_at, variant=CalendarVariant()) == \
+        convert_to_ics(data, "테스트고", generated_at=generated_at)
+    assert summaries(CalendarVariant(exclude_holidays=True)) == ["1학년 수련회", "2학년 현장체험"]
+    # 학년 구분이 없는 행사(공휴일)는 모든 학년에 들어갑니다.
+    assert summaries(CalendarVariant(grade=2)) == ["삼일절", "2학년 현장체험"]
+    assert CalendarVariant(exclude_holidays=True, alarms=False, grade=2).key == "noholiday-noalarm-grade2"
+
+    no_alarm = convert_to_ics(data, "테스트고", generated_at=generated_at, variant=CalendarVariant(alarms=False))
+    assert "BEGIN:VALARM" not in no_alarm
+    assert no_alarm.count("BEGIN:VEVENT") == 3
@@ -0,0 +1,73 @@
+from app.services.cache_index import CacheEntry
+from app.services.memory_cache import MemoryCache
+
+def make_entry(sha256: str) -> CacheEntry:
+    """테스트용 캐시 메타데이터를 만듭니다."""
+    return CacheEntry(atpt_code="B10", school_code="1", created_time=None, size=0, mtime_ns=0, sha256=sha256)
+
+class FakeClock:
+    """시간을 직접 조절할 수 있는 테스트용 시계입니다."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_put_and_get():
+    """저장한 항목을 그대로 가져오는지 테스트합니다."""
+    cache = MemoryCache(max_bytes=100)
+    cache.put("a", make_entry("x"), {None: b"12345"})
+
+    item = cache.get("a")
+    assert item.bodies[None] == b"12345"
+    assert cache.stats()["bytes"] == 5
+    assert cache.hits == 1
+
+def test_lru_eviction_by_byte_budget():
+    """용량을 넘으면 가장 오래 사용되지 않은 항목부터 내보내는지 테스트합니다."""
+    cache = MemoryCache(max_bytes=10)
+    cache.put("a", make_entry("a"), {None: b"aaaa"})
+    cache.put("b", make_entry("b"), {None: b"bbbb"})
+    cache.get("a")  # a를 최근 사용으로 표시
+    cache.put("c", make_entry("c"), {None: b"cccc"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+    assert cache.current_bytes == 8
+
+def test_item_larger_than_budget_is_not_stored():
+    """예산보다 큰 항목은 메모리에 두지 않는지 테스트합니다."""
+    cache = MemoryCache(max_bytes=3)
+    cache.put("a", make_entry("a"), {None: b"toolarge"})
+
+    assert cache.get("a") is None
+    assert cache.current_bytes == 0
+
+def test_ttl_and_revalidate():
+    """검증 기간이 지나면 항목을 쓰지 않고, 같은 버전으로 재검증하면 다시 쓰는지 테스트합니다."""
+    clock = FakeClock()
+    cache = MemoryCache(max_bytes=100, ttl_seconds=10, clock=clock)
+    cache.put("a", make_entry("v1"), {None: b"body"})
+
+    clock.now = 11
+    assert cache.get("a") is None
+
+    cache.revalidate("a", make_entry("v1"))
+    assert cache.get("a").bodies[None] == b"body"
+
+    clock.now = 22
+    cache.revalidate("a", make_entry("v2"))
+    assert cache.get("a") is None
+    assert cache.current_bytes == 0
+
+def test_add_body_keeps_other_encodings_of_same_version():
+    """같은 버전에 인코딩별 본문을 추가하고, 다른 버전이면 교체하는지 테스트합니다."""
+    cache = MemoryCache(max_bytes=100)
+    cache.add_body("a", make_entry("v1"), None, b"plain")
+    cache.add_body("a", make_entry("v1"), "gzip", b"gz")
+    assert set(cache.get("a").bodies) == {None, "gzip"}
+
+    cache.add_body("a", make_entry("v2"), None, b"new")
+    assert cache.get("a").bodies == {None: b"new"}
@@ -1,9 +1,12 @@
 import pytest
-import requests
+import httpx
+import respx
 from fastapi import HTTPException
 
 from app.services import neis
+from app.services.ics_converter import ScheduleRows
 from app.core.config import settings
+from tests.mock_neis import MockNeisServer, make_rows
 
 # 비동기 테스트를 위해 pytest.mark.asyncio 사용
 pytestmark = pytest.mark.asyncio
@@ -16,32 +19,56 @@ def mock_settings(mocker):
     mocker.patch.dict(settings, {"neisKey": "TEST_API_KEY"})
     return settings
 
-async def test_get_school_schedule_success(mock_settings, mocker):
+@pytest.fixture(autouse=True)
+def fast_guard(mocker):
+    """재시도 대기와 속도 제한 없이 테스트하고, 테스트마다 차단기를 초기화합니다."""
+    mocker.patch.object(neis.neis_retry_policy, 'base_delay', 0)
+    mocker.patch.object(neis.neis_rate_limiter, 'rate', 0)
+    neis.neis_circuit_breaker.reset()
+    yield
+    neis.neis_circuit_breaker.reset()
+
+@pytest.fixture(autouse=True)
+async def fresh_client():
+    """테스트마다 공유 HTTP 클라이언트를 새로 만들고 종료 시 닫습니다."""
+    await neis.close_client()
+    yield
+    await neis.close_client()
+
+@respx.mock
+async def test_get_school_schedule_success(mock_settings):
     """NEIS API 호출이 성공하고, 유효한 JSON 데이터를 반환하는 경우를 테스트합니다."""
     # --- 준비 (Arrange) ---
     mock_response_data = {"SchoolSchedule": [{"row": [{"EVENT_NM": "방학"}]}]}
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = mock_response_data
-    mock_response.raise_for_status = mocker.Mock()
-    mocker.patch('requests.get', return_value=mock_response)
+    route = respx.get(NEIS_API_URL).mock(return_value=httpx.Response(200, json=mock_response_data))
 
     # --- 실행 (Act) ---
     result = await neis.get_school_schedule("C10", 7150658)
 
     # --- 단언 (Assert) ---
-    requests.get.assert_called_once()
-    assert result == mock_response_data
+    assert route.call_count == 1
+    request = route.calls.last.request
+    assert request.url.params["ATPT_OFCDC_SC_CODE"] == "C10"
+    assert request.url.params["SD_SCHUL_CODE"] == "7150658"
+    assert result.rows == [{"EVENT_NM": "방학"}]
 
-async def test_get_school_schedule_api_error_in_json(mock_settings, mocker):
+@respx.mock
+async def test_get_school_schedule_reuses_shared_client(mock_settings):
+    """여러 번 호출해도 같은 커넥션 풀(AsyncClient)을 재사용하는지 테스트합니다."""
+    respx.get(NEIS_API_URL).mock(return_value=httpx.Response(200, json={"SchoolSchedule": []}))
+
+    await neis.get_school_schedule("C10", 7150658)
+    first_client = neis.get_client()
+    await neis.get_school_schedule("C10", 7150658)
+
+    assert neis.get_client() is first_client
+
+@respx.mock
+async def test_get_school_schedule_api_error_in_json(mock_settings):
     """NEIS API가 200 OK와 함께 에러 메시지를 반환하는 경우를 테스트합니다."""
     # --- 준비 (Arrange) ---
     error_response_data = {"RESULT": {"CODE": "ERROR-290", "MESSAGE": "인증키가 유효하지 않습니다."}}
-    mock_response = mocker.Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = error_response_data
-    mock_response.raise_for_status = mocker.Mock()
-    mocker.patch('requests.get', return_value=mock_response)
+    respx.get(NEIS_API_URL).mock(return_value=httpx.Response(200, json=error_response_data))
 
     # --- 실행 및 단언 (Act & Assert) ---
     with pytest.raises(HTTPException) as exc_info:
@@ -50,12 +77,11 @@ async def test_get_school_schedule_api_error_in_json(mock_settings, mocker):
     assert exc_info.value.status_code == 400
     assert "인증키가 유효하지 않습니다." in exc_info.value.detail
 
-async def test_get_school_schedule_http_error(mock_settings, mocker):
+@respx.mock
+async def test_get_school_schedule_http_error(mock_settings):
     """NEIS API가 500 서버 에러를 반환할 때 HTTPException이 발생하는지 테스트합니다."""
     # --- 준비 (Arrange) ---
-    mock_response = mocker.Mock()
-    mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mocker.Mock(status_code=500))
-    mocker.patch('requests.get', return_value=mock_response)
+    respx.get(NEIS_API_URL).mock(return_value=httpx.Response(500))
 
     # --- 실행 및 단언 (Act & Assert) ---
     with pytest.raises(HTTPException) as exc_info:
@@ -64,10 +90,69 @@ async def test_get_school_schedule_http_error(mock_settings, mocker):
     assert exc_info.value.status_code == 500
     assert "HTTP Error from NEIS server" in exc_info.value.detail
 
-async def test_get_school_schedule_connection_timeout(mock_settings, mocker):
+@respx.mock
+async def test_get_school_schedule_retries_transient_errors(mock_settings):
+    """일시적인 오류(연결 실패, 503)는 다시 시도하여 성공하면 결과를 반환하는지 테스트합니다."""
+    route = respx.get(NEIS_API_URL).mock(side_effect=[
+        httpx.ConnectError("connection refused"),
+        httpx.Response(503),
+        httpx.Response(200, json={"SchoolSchedule": [{"row": [{"EVENT_NM": "방학"}]}]}),
+    ])
+
+    result = await neis.get_school_schedule("C10", 7150658)
+
+    assert route.call_count == 3
+    assert len(result) == 1
+    assert neis.neis_circuit_breaker.consecutive_failures == 0
+
+@respx.mock
+async def test_get_school_schedule_does_not_retry_client_errors(mock_settings):
+    """요청이 잘못된 4xx 응답은 다시 시도하지 않는지 테스트합니다."""
+    route = respx.get(NEIS_API_URL).mock(return_value=httpx.Response(404))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await neis.get_school_schedule("C10", 7150658)
+
+    assert exc_info.value.status_code == 404
+    assert route.call_count == 1
+
+@respx.mock
+async def test_circuit_breaker_fails_fast_while_neis_is_down(mock_settings, mocker):
+    """연속 실패로 차단기가 열리면 NEIS를 호출하지 않고 바로 503을 반환하는지 테스트합니다."""
+    mocker.patch.object(neis.neis_circuit_breaker, 'failure_threshold', 2)
+    route = respx.get(NEIS_API_URL).mock(return_value=httpx.Response(502))
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await neis.get_school_schedule("C10", 7150658)
+    calls = route.call_count
+    assert calls == 2 * (neis.neis_retry_policy.max_retries + 1)
+    assert neis.neis_circuit_breaker.state == "open"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await neis.get_school_schedule("C10", 7150658)
+
+    assert exc_info.value.status_code == 503
+    assert "circuit breaker open" in exc_info.value.detail
+    assert route.call_count == calls
+
+@respx.mock
+async def test_get_school_schedule_non_json_response(mock_settings):
+    """NEIS가 JSON이 아닌 200 응답(점검 안내 페이지 등)을 보내면 503을 발생시키고 차단기에 실패로 기록하는지 테스트합니다."""
+    respx.get(NEIS_API_URL).mock(return_value=httpx.Response(200, text="<html>시스템 점검 중입니다</html>"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await neis.get_school_schedule("C10", 7150658)
+
+    assert exc_info.value.status_code == 503
+    assert "Invalid response from NEIS server" in exc_info.value.detail
+    assert neis.neis_circuit_breaker.consecutive_failures == 1
+
+@respx.mock
+async def test_get_school_schedule_connection_timeout(mock_settings):
     """API 서버 연결 시간 초과 시 HTTPException이 발생하는지 테스트합니다."""
     # --- 준비 (Arrange) ---
-    mocker.patch('requests.get', side_effect=requests.exceptions.ConnectTimeout)
+    respx.get(NEIS_API_URL).mock(side_effect=httpx.ConnectTimeout("timed out"))
 
     # --- 실행 및 단언 (Act & Assert) ---
     with pytest.raises(HTTPException) as exc_info:
@@ -86,3 +171,64 @@ async def test_get_school_schedule_no_api_key(mocker):
 
     assert exc_info.value.status_code == 500
     assert "NEIS API key is not configured" in exc_info.value.detail
+
+@pytest.fixture
+def mock_neis_server(mock_settings, mocker):
+    """로컬 모의 NEIS 서버를 만들어 공유 HTTP 클라이언트가 그 서버로 요청하도록 합니다."""
+    def start(rows, delay=0):
+        server = MockNeisServer(rows, delay=delay)
+        mocker.patch.object(neis, '_client', server.client())
+        return server
+    return start
+
+async def test_get_school_schedule_reads_every_page(mock_neis_server):
+    """행이 pSize(1000)보다 많으면 list_total_count만큼 모든 페이지를 받는지 테스트합니다."""
+    rows = make_rows("B10", "7010057", 2500) + make_rows("B10", "7010058", 10)
+    server = mock_neis_server(rows)
+
+    schedule = await neis.get_school_schedule("B10", 7010057)
+
+    assert len(schedule) == 2500
+    assert [request["pIndex"] for request in server.requests] == ["1", "2", "3"]
+    assert schedule.fingerprint() == ScheduleRows.from_response({"SchoolSchedule": [{"row": rows[:2500]}]}).fingerprint()
+    # 변환에 필요한 열만 남깁니다.
+    assert set(schedule.rows[0]) == {"AA_YMD", "EVENT_NM", "EVENT_CNTNT", "SCHUL_NM"}
+
+async def test_page_requests_respect_concurrency_and_order(mock_neis_server, mocker):
+    """나머지 페이지를 설정한 수까지만 동시에 요청하고, 행은 페이지 순서대로 내보내는지 테스트합니다."""
+    mocker.patch.object(neis, 'NEIS_PAGE_SIZE', 10)
+    mocker.patch.dict(settings, {"neis_page_concurrency": 2})
+    rows = make_rows("B10", "7010057", 95)
+    server = mock_neis_server(rows, delay=0.01)
+
+    schedule = await neis.get_school_schedule("B10", 7010057)
+
+    assert len(server.requests) == 10
+    assert server.max_in_flight == 2
+    assert [row["EVENT_NM"] for row in schedule.rows] == [row["EVENT_NM"] for row in rows]
+
+async def test_get_school_schedule_without_data(mock_neis_server):
+    """데이터가 없는(INFO-200) 학교는 빈 결과를 반환하는지 테스트합니다."""
+    mock_neis_server(make_rows("B10", "7010057", 3))
+
+    schedule = await neis.get_school_schedule("B10", 1234)
+
+    assert len(schedule) == 0
+
+async def test_region_pages_cover_every_school(mock_neis_server, mocker):
+    """교육청 단위 조회가 학교 코드 없이 모든 페이지를 받는지 테스트합니다."""
+    mocker.patch.object(neis, 'NEIS_PAGE_SIZE', 4)
+    rows = make_rows("B10", "1", 5) + make_rows("B10", "2", 6) + make_rows("C10", "3", 2)
+    server = mock_neis_server(rows)
+
+    pages = [page async for page in neis.iter_region_schedule_pages("B10")]
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    assert [row for page in pages for row in page] == rows[:11]
+    assert all("SD_SCHUL_CODE" not in request for request in server.requests)
+
+async def test_region_without_data(mock_neis_server):
+    """데이터가 없는 지역은 에러 없이 빈 페이지 하나를 내보내는지 테스트합니다."""
+    mock_neis_server([])
+
+    assert [page async for page in neis.iter_region_schedule_pages("B10")] == [[]]
@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.neis_guard import CircuitBreaker, RetryPolicy, TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    """버스트만큼은 바로 보내고, 그 뒤 요청은 예약한 순서대로 1/rate초씩 기다리는지 테스트합니다."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.5, 1.0, 1.5])
+    assert bucket.throttled == 3
+
+    # 충분히 기다리면 다시 버스트만큼 쌓이지만 그 이상은 쌓이지 않습니다.
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+def test_retry_policy_backoff_is_jittered_and_capped():
+    """재시도 대기 시간이 지수적인 상한 안에서 무작위로 정해지고 max_delay를 넘지 않는지 테스트합니다."""
+    policy = RetryPolicy(max_retries=5, base_delay=0.5, max_delay=3)
+
+    for attempt, ceiling in [(0, 0.5), (1, 1.0), (2, 2.0), (3, 3), (6, 3)]:
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1
+
+    # Retry-After가 있으면 그보다 일찍 다시 시도하지 않습니다.
+    assert policy.backoff(0, retry_after=2) == 2
+    assert policy.backoff(0, retry_after=60) == 3
+
+def test_circuit_breaker_opens_and_recovers():
+    """연속 실패로 열리고, reset_timeout 뒤 시험 요청 하나의 결과에 따라 닫히거나 다시 열리는지 테스트합니다."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # 시험 요청이 진행 중이면 다른 요청은 거절합니다.
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 2
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    assert breaker.stats()["rejected"] == 2
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.services.refresh_worker import RefreshWorker
+
+pytestmark = pytest.mark.asyncio
+
+async def test_enqueue_runs_handler_in_background():
+    """큐에 넣은 갱신 작업이 백그라운드에서 실행되는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    worker = RefreshWorker(concurrency=1)
+    refreshed = []
+
+    async def handler(atpt_code, school_code):
+        refreshed.append((atpt_code, school_code))
+
+    worker.start(handler)
+
+    # --- 실행 (Act) ---
+    assert worker.enqueue("B10", 1234) is True
+    await worker._queue.join()
+    await worker.stop()
+
+    # --- 단언 (Assert) ---
+    assert refreshed == [("B10", 1234)]
+    assert worker.completed == 1
+
+async def test_duplicate_keys_are_deduplicated():
+    """같은 학교가 이미 대기 중이면 중복으로 큐에 넣지 않는지 테스트합니다."""
+    worker = RefreshWorker(concurrency=1)
+    release = asyncio.Event()
+    calls = 0
+
+    async def handler(atpt_code, school_code):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+
+    worker.start(handler)
+    assert worker.enqueue("B10", 1234) is True
+    assert worker.enqueue("B10", 1234) is False
+    release.set()
+    await worker._queue.join()
+    await worker.stop()
+
+    assert calls == 1
+    assert worker.deduplicated == 1
+
+async def test_handler_failure_is_counted_and_worker_keeps_running():
+    """갱신이 실패해도 작업자가 멈추지 않고 다음 작업을 처리하는지 테스트합니다."""
+    worker = RefreshWorker(concurrency=1)
+
+    async def handler(atpt_code, school_code):
+        if school_code == 1:
+            raise RuntimeError("NEIS timeout")
+
+    worker.start(handler)
+    worker.enqueue("B10", 1)
+    worker.enqueue("B10", 2)
+    await worker._queue.join()
+    await worker.stop()
+
+    assert worker.failed == 1
+    assert worker.completed == 1
+
+async def test_enqueue_before_start_is_dropped():
+    """작업자가 시작되지 않았을 때는 작업을 버리고 False를 반환하는지 테스트합니다."""
+    worker = RefreshWorker()
+    assert worker.enqueue("B10", 1234) is False
+    assert worker.dropped == 1
@@ -0,0 +1,212 @@
+import random
+
+import pandas as pd
+import pytest
+
+from app.services.school_index import SchoolIndex
+from app.services.school_search import DATA_FILE_PATH
+
+def pandas_reference_search(df: pd.DataFrame, atpt_code: str, query: str) -> list[dict]:
+    """색인 도입 전의 pandas 검색 구현입니다. 색인 결과가 이것과 정확히 같아야 합니다."""
+    return df[
+        (df['시도교육청코드'] == atpt_code) &
+        (
+            df['학교명'].str.contains(query, na=False) |
+            df['영문학교명'].str.contains(query, na=False, case=False)
+        )
+    ].fillna(value="").to_dict(orient='records')
+
+@pytest.fixture(scope="module")
+def school_df():
+    """저장소에 포함된 실제 학교 기본정보 CSV를 로드합니다."""
+    with DATA_FILE_PATH.open("r", encoding="cp949") as f:
+        return pd.read_csv(f)
+
+@pytest.fixture(scope="module")
+def school_index(school_df):
+    return SchoolIndex(school_df.fillna(value="").to_dict(orient='records'))
+
+def sample_queries(df: pd.DataFrame) -> list[tuple[str, str]]:
+    """실제 학교명에서 다양한 길이의 부분 문자열을 뽑아 검색어 목록을 만듭니다."""
+    rng = random.Random(20241130)
+    queries = []
+    regions = sorted(df['시도교육청코드'].unique())
+    for atpt_code in regions:
+        region = df[df['시도교육청코드'] == atpt_code]
+        for _ in range(6):
+            row = region.iloc[rng.randrange(len(region))]
+            name = row['학교명']
+            length = rng.randint(1, min(4, len(name)))
+            start = rng.randrange(len(name) - length + 1)
+            queries.append((atpt_code, name[start:start + length]))
+            english = row['영문학교명']
+            if isinstance(english, str) and len(english) > 3:
+                start = rng.randrange(len(english) - 3)
+                fragment = english[start:start + rng.randint(1, 6)]
+                queries.append((atpt_code, rng.choice([fragment.lower(), fragment.upper(), fragment])))
+        queries += [(atpt_code, ""), (atpt_code, "고"), (atpt_code, "High"), (atpt_code, "존재하지않는학교")]
+    # 정규식 메타 문자가 포함된 검색어 (pandas와 같이 정규식으로 해석)
+    queries += [("B10", "고등학교$"), ("B10", "^서울"), ("J10", "(?:초|중)학교"), ("B10", "school.*seoul")]
+    queries += [("Z99", "고")]
+    return queries
+
+def test_index_matches_pandas_search_exactly(school_df, school_index):
+    """색인 검색 결과가 기존 pandas 검색 결과와 순서까지 정확히 같은지 테스트합니다."""
+    for atpt_code, query in sample_queries(school_df):
+        expected = pandas_reference_search(school_df, atpt_code, query)
+        assert school_index.search(atpt_code, query) == expected, (atpt_code, query)
+
+def test_index_results_are_copies(school_index):
+    """반환된 결과를 수정해도 색인의 원본 레코드가 바뀌지 않는지 테스트합니다."""
+    result = school_index.search("B10", "가락고")
+    result[0]['학교명'] = "변경"
+    assert school_index.search("B10", "가락고")[0]['학교명'] == "가락고등학교"
+
+def test_index_ignores_missing_names():
+    """이름이 빈 값인 행은 빈 검색어와도 일치하지 않는지 테스트합니다. (pandas의 na=False와 같음)"""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': '가학교', '영문학교명': ''},
+        {'시도교육청코드': 'B10', '학교명': '', '영문학교명': ''},
+    ])
+    assert [r['학교명'] for r in index.search('B10', '')] == ['가학교']
+    assert index.search('B10', 'a') == []
+
+def test_get_normalizes_padded_codes():
+    """CSV의 앞뒤 공백이나 빈 코드("       ")가 있어도 조회가 올바른지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': '코드없는학교', '영문학교명': '', '행정표준코드': '       '},
+        {'시도교육청코드': 'B10', '학교명': '가학교', '영문학교명': '', '행정표준코드': ' 7010057 '},
+    ])
+
+    assert index.get('B10', 7010057)['학교명'] == '가학교'
+    assert index.get('B10', '7010057')['학교명'] == '가학교'
+    assert index.get('B10', '') is None
+    assert index.get('B10', '       ') is None
+    assert index.get('C10', 7010057) is None
+
+def test_get_matches_every_school_in_dataset(school_df, school_index):
+    """실제 데이터의 모든 학교를 코드로 조회할 수 있는지 테스트합니다."""
+    for record in school_df.fillna(value="").to_dict(orient='records')[:500]:
+        code = str(record['행정표준코드']).strip()
+        if not code:
+            continue
+        assert school_index.get(record['시도교육청코드'], int(code))['학교명'] == record['학교명']
+
+def _autocomplete_names(index: SchoolIndex, atpt_code: str, query: str, limit: int = 50, offset: int = 0,
+                        match_mode: str = "contains") -> list[str]:
+    rows, _ = index.autocomplete(atpt_code, query, limit, offset, match_mode)
+    return [index.records[row]['학교명'] for row in rows]
+
+def test_autocomplete_ranks_exact_then_prefix_then_substring():
+    """자동완성이 일치, 접두사 일치, 부분 문자열 일치 순서로 결과를 반환하는지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': '서울한빛고등학교', '영문학교명': ''},
+        {'시도교육청코드': 'B10', '학교명': '한빛중학교', '영문학교명': ''},
+        {'시도교육청코드': 'B10', '학교명': '한빛', '영문학교명': ''},
+        {'시도교육청코드': 'B10', '학교명': '가온초등학교', '영문학교명': 'Hanbit Elementary'},
+        {'시도교육청코드': 'B10', '학교명': '한빛고등학교', '영문학교명': ''},
+        {'시도교육청코드': 'C10', '학교명': '한빛', '영문학교명': ''},
+    ])
+
+    assert _autocomplete_names(index, 'B10', '한빛') == ['한빛', '한빛고등학교', '한빛중학교', '서울한빛고등학교']
+    # 영문학교명은 대소문자를 무시하고 접두사로 비교합니다.
+    assert _autocomplete_names(index, 'B10', 'HANBIT') == ['가온초등학교']
+    assert _autocomplete_names(index, 'B10', '') == []
+    assert _autocomplete_names(index, 'Z99', '한빛') == []
+
+def test_autocomplete_pages_without_gaps():
+    """limit/offset으로 나눠 가져온 결과가 한 번에 가져온 결과와 같은지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': name, '영문학교명': ''}
+        for name in ['고운초', '고양고', '서울고', '부산고', '고등학교', '대구고', '고']
+    ])
+    expected = _autocomplete_names(index, 'B10', '고')
+
+    pages, offset, has_more = [], 0, True
+    while has_more:
+        rows, has_more = index.autocomplete('B10', '고', 2, offset)
+        pages.extend(index.records[row]['학교명'] for row in rows)
+        offset += len(rows)
+
+    assert pages == expected
+    assert expected[:4] == ['고', '고등학교', '고양고', '고운초']
+    assert sorted(expected[4:]) == expected[4:]
+
+def test_autocomplete_skips_substring_scan_when_prefix_page_is_full(mocker):
+    """요청한 범위를 접두사 일치 결과로 채울 수 있으면 부분 문자열 검색을 하지 않는지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': f'고등학교{i}', '영문학교명': ''} for i in range(5)
+    ] + [{'시도교육청코드': 'B10', '학교명': '서울고', '영문학교명': ''}])
+    spy = mocker.spy(SchoolIndex, '_match_names')
+
+    rows, has_more = index.autocomplete('B10', '고', 3)
+
+    assert len(rows) == 3 and has_more
+    spy.assert_not_called()
+
+def test_autocomplete_finds_every_school_by_its_full_name(school_df, school_index):
+    """실제 데이터에서 학교명 전체를 입력하면 그 학교가 첫 순위로 나오는지 테스트합니다."""
+    for record in school_df.fillna(value="").to_dict(orient='records')[:300]:
+        names = _autocomplete_names(school_index, record['시도교육청코드'], record['학교명'], limit=1)
+        assert names == [record['학교명']]
+
+def test_choseong_and_jamo_match_modes():
+    """초성과 자모 검색 방식이 학교명을 분해한 값으로 일치 여부를 판단하는지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': '서울고등학교', '영문학교명': 'Seoul High School'},
+        {'시도교육청코드': 'B10', '학교명': '서울과학고등학교', '영문학교명': ''},
+        {'시도교육청코드': 'B10', '학교명': '상일고', '영문학교명': ''},
+        {'시도교육청코드': 'B10', '학교명': '', '영문학교명': 'No Korean Name'},
+    ])
+
+    def names(query, match_mode):
+        return [record['학교명'] for record in index.search('B10', query, match_mode)]
+
+    assert names('ㅅㅇㄱ', 'choseong') == ['서울고등학교', '서울과학고등학교', '상일고']
+    assert names('ㄱㄷㅎ', 'choseong') == ['서울고등학교', '서울과학고등학교']
+    # 음절이 섞여 있으면 초성으로 바꿔 비교합니다.
+    assert names('서ㅇㄱ', 'choseong') == names('ㅅㅇㄱ', 'choseong')
+    # 조합 중인 음절
+    assert names('서울곧', 'jamo') == ['서울고등학교']
+    assert names('서울ㄱ', 'jamo') == ['서울고등학교', '서울과학고등학교']
+    assert names('서울괗', 'jamo') == ['서울과학고등학교']
+    # 초성/자모 방식은 영문학교명과 정규식을 사용하지 않습니다.
+    assert names('seoul', 'jamo') == []
+    assert names('(ㅅ)', 'choseong') == []
+    with pytest.raises(ValueError):
+        index.search('B10', '서울', 'fuzzy')
+
+def test_jamo_mode_agrees_with_brute_force(school_df, school_index):
+    """실제 데이터에서 자모/초성 검색 결과가 모든 행을 분해해 비교한 결과와 같은지 테스트합니다."""
+    from app.utils.hangul_utils import choseong, decompose
+
+    records = school_df.fillna(value="").to_dict(orient='records')
+    for atpt_code, query in sample_queries(school_df)[:40]:
+        for match_mode, transform in (('jamo', decompose), ('choseong', choseong)):
+            needle = transform(query)
+            expected = [r for r in records if r['시도교육청코드'] == atpt_code and r['학교명'] and needle in transform(r['학교명'])]
+            assert school_index.search(atpt_code, query, match_mode) == expected
+
+def test_autocomplete_with_partial_syllable():
+    """자동완성도 자모 방식으로 조합 중인 음절을 처리하는지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': name, '영문학교명': ''} for name in ['동서울고', '서울고', '서울과학고']
+    ])
+
+    assert _autocomplete_names(index, 'B10', '서울ㄱ', match_mode='jamo') == ['서울고', '서울과학고', '동서울고']
+    assert _autocomplete_names(index, 'B10', '서울고', match_mode='jamo') == ['서울고', '서울과학고', '동서울고']
+    assert _autocomplete_names(index, 'B10', 'ㅅㅇㄱ', match_mode='choseong') == ['서울고', '서울과학고', '동서울고']
+
+def test_iter_schools_lists_each_code_once_by_region():
+    """iter_schools가 지역별로, 중복 코드는 get()과 같은 행 하나만 반환하는지 테스트합니다."""
+    index = SchoolIndex([
+        {'시도교육청코드': 'B10', '학교명': '가초', '행정표준코드': ' 1111 '},
+        {'시도교육청코드': 'C10', '학교명': '나초', '행정표준코드': 2222},
+        {'시도교육청코드': 'B10', '학교명': '가초(중복)', '행정표준코드': 1111},
+        {'시도교육청코드': 'B10', '학교명': '코드없음', '행정표준코드': ''},
+    ])
+
+    assert [(atpt, code, school['학교명']) for atpt, code, school in index.iter_schools()] == [
+        ('B10', '1111', '가초'), ('C10', '2222', '나초'),
+    ]
+    assert [code for _, code, _ in index.iter_schools(['C10'])] == ['2222']
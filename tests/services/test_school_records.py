@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from app.services.school_records import SchoolRecords, load_school_records
+from app.services.school_search import DATA_FILE_PATH, SchoolSearchService
+
+def _pandas_records(path):
+    """pandas 경로에서 만드는 레코드 목록입니다."""
+    return pd.read_csv(path, encoding='cp949').fillna(value="").to_dict(orient='records')
+
+def _assert_same_records(actual, expected):
+    assert len(actual) == len(expected)
+    for row, expected_row in zip(actual, expected):
+        assert row == expected_row
+        # 1 == 1.0 이므로 타입까지 비교합니다. (JSON 응답에서 4764와 4764.0은 다르게 직렬화됩니다.)
+        assert [type(value) for value in row.values()] == [type(value) for value in expected_row.values()]
+
+@pytest.mark.skipif(not DATA_FILE_PATH.exists(), reason="학교 정보 CSV 파일이 없습니다.")
+def test_records_match_pandas_on_real_data():
+    """실제 학교 정보 CSV에서 pandas 경로와 같은 레코드를 만드는지 테스트합니다."""
+    _assert_same_records(list(load_school_records(DATA_FILE_PATH)), _pandas_records(DATA_FILE_PATH))
+
+def test_type_inference_matches_pandas(tmp_path):
+    """열 타입 추론과 결측값 처리가 pandas와 같은지 테스트합니다."""
+    csv_path = tmp_path / "schools.csv"
+    csv_path.write_bytes((
+        "코드,우편번호,비율,여부,이름,공백코드,빈열\n"
+        "B10,4764,1.5,True,가나초,  7010057 ,\n"
+        "B10,,2,false,NA,       ,\n"
+        "C10,123,NaN,TRUE,N/A학교,1_000,\n"
+    ).encode('cp949'))
+
+    records = load_school_records(csv_path)
+
+    _assert_same_records(list(records), _pandas_records(csv_path))
+    assert records[0]['우편번호'] == 4764.0
+    assert records[1]['이름'] == ""
+
+def test_records_are_fresh_dicts(tmp_path):
+    """행을 꺼낼 때마다 새 dict를 반환하여 저장된 값이 바뀌지 않는지 테스트합니다."""
+    records = SchoolRecords(['학교명'], [['가나초']])
+
+    records[0]['학교명'] = '변경'
+
+    assert records[0] == {'학교명': '가나초'}
+    assert len(SchoolRecords([], [])) == 0
+
+def test_compact_backend_searches_like_pandas_backend(tmp_path):
+    """compact 백엔드가 pandas 백엔드와 같은 검색 결과를 내는지 테스트합니다."""
+    csv_path = tmp_path / "schools.csv"
+    pd.DataFrame({
+        '시도교육청코드': ['B10', 'B10', 'C10'],
+        '학교명': ['서울테스트초등학교', '서울소프트웨어마이스터고', '부산소프트웨어마이스터고'],
+        '영문학교명': ['Seoul Test Elementary', None, 'Busan Software Meister High'],
+        '행정표준코드': [1111, 2222, 3333],
+    }).to_csv(csv_path, index=False, encoding='cp949')
+
+    compact = SchoolSearchService(csv_path, backend="compact")
+    reference = SchoolSearchService(csv_path, backend="pandas")
+
+    assert isinstance(compact.index.records, SchoolRecords)
+    for query in ['소프트웨어', 'MEISTER', '서울', '(초|고)$']:
+        assert compact.search('B10', query) == reference.search('B10', query)
+    assert compact.get_school('C10', '3333') == reference.get_school('C10', '3333')
+
+def test_compact_backend_missing_file(tmp_path):
+    """CSV 파일이 없으면 빈 결과를 반환하는지 테스트합니다."""
+    service = SchoolSearchService(tmp_path / "missing.csv", backend="compact")
+
+    assert service.search('B10', '서울') == []
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        SchoolSearchService("dummy.csv", backend="polars")
@@ -0,0 +1,101 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from app.services.school_reloader import SchoolDataWatcher
+from app.services.school_search import SchoolSearchService
+
+def _write_csv(path, names):
+    pd.DataFrame({
+        '시도교육청코드': ['B10'] * len(names),
+        '학교명': names,
+        '영문학교명': [None] * len(names),
+        '행정표준코드': list(range(1000, 1000 + len(names))),
+    }).to_csv(path, index=False, encoding='cp949')
+
+@pytest.fixture
+def school_csv(tmp_path):
+    csv_path = tmp_path / "schools.csv"
+    _write_csv(csv_path, ['서울가나초등학교'])
+    return csv_path
+
+def test_reload_swaps_in_new_dataset(school_csv):
+    """다시 불러오면 새 데이터로 검색하고 버전 정보가 바뀌는지 테스트합니다."""
+    service = SchoolSearchService(school_csv)
+    old_version = service.version
+    _write_csv(school_csv, ['서울가나초등학교', '서울다라중학교'])
+
+    version = service.reload()
+
+    assert service.search('B10', '다라')[0]['학교명'] == '서울다라중학교'
+    assert version['schools'] == 2
+    assert version['reloads'] == 1
+    assert version['source_sha256'] != old_version['source_sha256']
+
+def test_reload_without_changes_is_skipped_unless_forced(school_csv):
+    """내용이 그대로면 force=False일 때 다시 불러오지 않는지 테스트합니다."""
+    service = SchoolSearchService(school_csv)
+    index = service.index
+
+    service.reload(force=False)
+    assert service.index is index
+
+    service.reload()
+    assert service.index is not index
+
+def test_failed_reload_keeps_previous_dataset(school_csv):
+    """불러오기에 실패하면 기존 색인을 유지하는지 테스트합니다."""
+    service = SchoolSearchService(school_csv)
+    school_csv.unlink()
+
+    with pytest.raises(RuntimeError):
+        service.reload()
+
+    assert service.search('B10', '가나')[0]['학교명'] == '서울가나초등학교'
+    assert service.version['reloads'] == 0
+
+def test_search_during_reload_uses_one_complete_index(mocker, school_csv):
+    """새 색인을 만드는 동안에도 검색이 기다리지 않고 이전 색인으로 처리되는지 테스트합니다."""
+    service = SchoolSearchService(school_csv)
+    _write_csv(school_csv, ['서울다라중학교'])
+    building = threading.Event()
+    release = threading.Event()
+    original_load = service._load_data
+
+    def slow_load():
+        building.set()
+        release.wait(timeout=5)
+        return original_load()
+
+    mocker.patch.object(service, '_load_data', side_effect=slow_load)
+    reloader = threading.Thread(target=service.reload)
+    reloader.start()
+    assert building.wait(timeout=5)
+
+    assert service.search('B10', '가나')[0]['학교명'] == '서울가나초등학교'
+
+    release.set()
+    reloader.join(timeout=5)
+    assert service.search('B10', '가나') == []
+    assert service.search('B10', '다라')[0]['학교명'] == '서울다라중학교'
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_when_file_changes(school_csv):
+    """파일이 바뀌었을 때만 감시 작업이 데이터를 다시 불러오는지 테스트합니다."""
+    service = SchoolSearchService(school_csv)
+    watcher = SchoolDataWatcher(service, interval_seconds=0)
+
+    assert await watcher.check() is False
+
+    # 수정 시각만 바뀐 경우에는 다시 불러오지 않습니다.
+    stat = school_csv.stat()
+    os.utime(school_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert await watcher.check() is False
+
+    _write_csv(school_csv, ['서울다라중학교'])
+    os.utime(school_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert await watcher.check() is True
+    assert service.search('B10', '다라')[0]['학교명'] == '서울다라중학교'
+    assert watcher.stats()['checks'] == 3
@@ -75,3 +75,30 @@ def test_search_returns_multiple_results(mocked_school_search_service):
 
     # 만약 시도교육청코드 필터가 없다면 여러개가 나올 수 있음을 가정 (이 테스트는 현재 로직에선 불필요)
     # 여기서는 현재 로직이 시도교육청코드로 잘 필터링하는지 확인하는 것이 더 중요.
+
+def test_get_school_by_code(mocked_school_search_service):
+    """교육청 코드와 행정표준코드로 학교 하나를 조회하는지 테스트합니다."""
+    service = mocked_school_search_service
+
+    school = service.get_school('B10', 2222)
+    assert school['학교명'] == '서울소프트웨어마이스터고'
+    assert service.get_school('B10', '2222') == school
+
+def test_get_school_wrong_region_or_code(mocked_school_search_service):
+    """다른 지역이나 없는 코드로 조회하면 None을 반환하는지 테스트합니다."""
+    service = mocked_school_search_service
+
+    assert service.get_school('C10', 2222) is None
+    assert service.get_school('B10', 9999) is None
+
+def test_autocomplete_returns_minimal_fields(mocked_school_search_service):
+    """자동완성 결과가 화면에 필요한 열만 담고, 마지막 페이지에서 다음 offset이 None인지 테스트합니다."""
+    service = mocked_school_search_service
+
+    items, next_offset = service.autocomplete('B10', ' 서울 ', limit=1)
+    assert items == [{'학교명': '서울소프트웨어마이스터고', '시도교육청코드': 'B10', '행정표준코드': '2222', '도로명주소': '서울 마이스터로 10'}]
+    assert next_offset == 1
+
+    items, next_offset = service.autocomplete('B10', '서울', limit=1, offset=1)
+    assert [item['학교명'] for item in items] == ['서울테스트초등학교']
+    assert next_offset is None
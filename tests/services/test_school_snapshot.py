@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from app.services import school_snapshot
+from app.services.school_index import SchoolIndex
+from app.services.school_search import SchoolSearchService
+
+@pytest.fixture
+def school_csv(tmp_path):
+    """cp949로 인코딩된 작은 학교 정보 CSV 파일을 만듭니다."""
+    csv_path = tmp_path / "schools.csv"
+    pd.DataFrame({
+        '시도교육청코드': ['B10', 'B10', 'C10'],
+        '학교명': ['서울테스트초등학교', '서울소프트웨어마이스터고', '부산소프트웨어마이스터고'],
+        '영문학교명': ['Seoul Test Elementary', None, 'Busan Software Meister High'],
+        '행정표준코드': [1111, 2222, 3333],
+    }).to_csv(csv_path, index=False, encoding='cp949')
+    return csv_path
+
+@pytest.fixture
+def snapshot_path(tmp_path, school_csv):
+    """CSV로 만든 색인의 스냅샷 파일 경로를 반환합니다."""
+    path = tmp_path / "schools.snapshot"
+    school_snapshot.write_snapshot(SchoolSearchService(school_csv).index, path, school_csv)
+    return path
+
+def test_snapshot_round_trip_matches_csv_index(school_csv, snapshot_path):
+    """스냅샷에서 불러온 색인이 CSV로 만든 색인과 같은 결과를 내는지 테스트합니다."""
+    from_csv = SchoolSearchService(school_csv).index
+    loaded = school_snapshot.load_snapshot(snapshot_path, school_csv)
+
+    assert isinstance(loaded, SchoolIndex)
+    assert len(loaded) == len(from_csv)
+    for query in ['소프트웨어', 'meister', '서울', '없는학교']:
+        for atpt in ['B10', 'C10']:
+            assert loaded.search(atpt, query) == from_csv.search(atpt, query)
+    assert loaded.get('B10', '2222') == from_csv.get('B10', '2222')
+
+def test_service_uses_snapshot_without_parsing_csv(mocker, school_csv, snapshot_path):
+    """최신 스냅샷이 있으면 CSV를 읽지 않는지 테스트합니다."""
+    mock_load_data = mocker.patch.object(SchoolSearchService, '_load_data')
+
+    service = SchoolSearchService(school_csv, snapshot_path)
+
+    mock_load_data.assert_not_called()
+    assert service.search('C10', '부산')[0]['행정표준코드'] == 3333
+
+def test_stale_snapshot_falls_back_to_csv(school_csv, snapshot_path):
+    """원본 CSV가 바뀌면 스냅샷 대신 CSV를 다시 읽는지 테스트합니다."""
+    df = pd.read_csv(school_csv, encoding='cp949')
+    df.loc[0, '학교명'] = '서울새이름초등학교'
+    df.to_csv(school_csv, index=False, encoding='cp949')
+
+    assert school_snapshot.load_snapshot(snapshot_path, school_csv) is None
+    service = SchoolSearchService(school_csv, snapshot_path)
+    assert service.search('B10', '새이름')[0]['학교명'] == '서울새이름초등학교'
+
+@pytest.mark.parametrize("content", [b"", b"not a snapshot", school_snapshot.SNAPSHOT_MAGIC + b"\x02\x00\x00\x00{}"])
+def test_invalid_snapshot_falls_back_to_csv(tmp_path, school_csv, content):
+    """형식이 맞지 않는 스냅샷은 무시하고 CSV를 사용하는지 테스트합니다."""
+    path = tmp_path / "broken.snapshot"
+    path.write_bytes(content)
+
+    assert school_snapshot.load_snapshot(path, school_csv) is None
+    assert len(SchoolSearchService(school_csv, path).index) == 3
+
+@pytest.mark.parametrize("error", [ModuleNotFoundError("No module named 'app.services.old_index'"), TypeError("bad state")])
+def test_unloadable_snapshot_payload_falls_back_to_csv(mocker, school_csv, snapshot_path, error):
+    """헤더는 맞지만 내용을 불러올 수 없는 스냅샷(예: 사라진 모듈을 가리키는 pickle)은 CSV를 사용하는지 테스트합니다."""
+    mocker.patch.object(school_snapshot.pickle, 'loads', side_effect=error)
+
+    assert school_snapshot.load_snapshot(snapshot_path, school_csv) is None
+    assert len(SchoolSearchService(school_csv, snapshot_path).index) == 3
+
+def test_outdated_snapshot_version_is_ignored(mocker, school_csv, snapshot_path):
+    """형식 버전이 바뀌면 예전 스냅샷을 사용하지 않는지 테스트합니다."""
+    mocker.patch.object(school_snapshot, 'SNAPSHOT_VERSION', school_snapshot.SNAPSHOT_VERSION + 1)
+
+    assert school_snapshot.load_snapshot(snapshot_path, school_csv) is None
+
+def test_snapshot_for_other_backend_is_ignored(school_csv, snapshot_path):
+    """다른 레코드 저장 방식(backend)으로 만든 스냅샷은 사용하지 않는지 테스트합니다."""
+    assert school_snapshot.load_snapshot(snapshot_path, school_csv, backend="compact") is None
+
+    compact_path = snapshot_path.with_name("compact.snapshot")
+    school_snapshot.write_snapshot(SchoolSearchService(school_csv, backend="compact").index, compact_path, school_csv, "compact")
+    loaded = school_snapshot.load_snapshot(compact_path, school_csv, backend="compact")
+    assert loaded.search('C10', '부산') == SchoolSearchService(school_csv).search('C10', '부산')
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+pytestmark = pytest.mark.asyncio
+
+async def test_concurrent_calls_share_one_execution():
+    """같은 키로 동시에 호출하면 작업은 한 번만 실행되고 결과를 공유하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    flight = SingleFlight()
+    executions = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal executions
+        executions += 1
+        await release.wait()
+        return "calendar.ics"
+
+    # --- 실행 (Act) ---
+    tasks = [asyncio.create_task(flight.do(("B10", 1234), work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    # --- 단언 (Assert) ---
+    assert executions == 1
+    assert results == ["calendar.ics"] * 5
+    assert flight.stats() == {"calls": 5, "executions": 1, "coalesced": 4, "inflight": 0}
+
+async def test_different_keys_run_independently():
+    """서로 다른 키는 각각 실행되는지 테스트합니다."""
+    flight = SingleFlight()
+
+    async def work(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        flight.do(("B10", 1), lambda: work("a")),
+        flight.do(("B10", 2), lambda: work("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert flight.executions == 2
+    assert flight.coalesced == 0
+
+async def test_exception_is_shared_and_key_is_released():
+    """작업이 실패하면 모든 대기자가 같은 예외를 받고, 다음 호출은 다시 실행되는지 테스트합니다."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise ValueError("NEIS down")
+
+    tasks = [asyncio.create_task(flight.do("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.executions == 1
+
+    async def ok():
+        return "recovered"
+
+    assert await flight.do("key", ok) == "recovered"
+    assert flight.executions == 2
+
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    """먼저 요청한 호출자가 취소되어도 다른 대기자는 결과를 받는지 테스트합니다."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "done"
+
+    leader = asyncio.create_task(flight.do("key", work))
+    follower = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
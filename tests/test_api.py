@@ -1,12 +1,19 @@
+import asyncio
+import json
+from datetime import timedelta
+
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from pathlib import Path
+from icalendar import Calendar
 
 # 테스트 대상 FastAPI 앱 임포트
 from app.main import app
 
 # 서비스 모킹을 위해 각 서비스 인스턴스를 임포트
-from app.services import school_search, cache_service, neis, ics_converter
+from app.services import school_search, cache_service, cache_warmer, neis, ics_converter, refresh_worker
+from app.controllers import school_controller
 
 @pytest.fixture
 def client():
@@ -67,11 +74,11 @@ def test_get_school_calendar_cache_miss_and_create(client, mocker, tmp_path):
         "SchoolSchedule": [{}, {"row": [{"SCHUL_NM": "서울소프트웨어마이스터고", "AA_YMD": "20241225", "EVENT_NM": "크리스마스", "EVENT_CNTNT": "공휴일"}]}]
     }
     # school_controller에서 get_school_schedule를 직접 참조하므로, 해당 위치에서 패치해야 합니다.
-    mocker.patch('app.controllers.school_controller.get_school_schedule', new_callable=mocker.AsyncMock, return_value=mock_neis_data)
+    mocker.patch('app.controllers.school_controller.get_school_schedule', new_callable=mocker.AsyncMock, return_value=ics_converter.ScheduleRows.from_response(mock_neis_data))
 
     # school_search_service는 실제 CSV 대신 모의 데이터를 사용하도록 모킹
-    mock_school_info = [{"학교명": "서울소프트웨어마이스터고", "행정표준코드": "1234"}]
-    mocker.patch.object(school_search.school_search_service, 'search', return_value=mock_school_info)
+    mock_school_info = {"학교명": "서울소프트웨어마이스터고", "행정표준코드": "1234"}
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value=mock_school_info)
 
     # cache_service의 base_dir을 임시 디렉토리로 변경하여 실제 'cache' 폴더에 쓰지 않도록 함
     mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
@@ -97,3 +104,521 @@ def test_get_school_calendar_cache_miss_and_create(client, mocker, tmp_path):
     expected_cache_file = tmp_path / "B10" / "1234.ics"
     assert expected_cache_file.exists()
     assert "SUMMARY:크리스마스" in expected_cache_file.read_text(encoding='utf-8')
+
+def test_get_school_calendar_serves_stale_and_queues_refresh(client, mocker, tmp_path):
+    """stale-while-revalidate 모드에서 만료된 캐시를 즉시 반환하고 갱신을 예약하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    stale_file = tmp_path / "stale.ics"
+    stale_file.write_text("BEGIN:VCALENDAR\nEND:VCALENDAR")
+    mocker.patch.dict(school_controller.settings, {"stale_while_revalidate": True})
+    mocker.patch.object(cache_service.cache_service, 'get', return_value=None)
+    mocker.patch.object(cache_service.cache_service, 'get_stale', return_value=stale_file)
+    mock_enqueue = mocker.patch.object(refresh_worker.refresh_worker, 'enqueue')
+    mock_fetch = mocker.patch('app.controllers.school_controller.get_school_schedule', new_callable=mocker.AsyncMock)
+
+    # --- 실행 (Act) ---
+    response = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    # --- 단언 (Assert) ---
+    assert response.status_code == 200
+    assert response.text == "BEGIN:VCALENDAR\nEND:VCALENDAR"
+    mock_enqueue.assert_called_once_with("B10", 1234)
+    mock_fetch.assert_not_called()
+
+def test_get_school_calendar_falls_back_to_stale_on_neis_error(client, mocker, tmp_path):
+    """NEIS 장애 시 503 대신 오래된 캐시를 반환하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    stale_file = tmp_path / "stale.ics"
+    stale_file.write_text("BEGIN:VCALENDAR\nEND:VCALENDAR")
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mocker.patch.object(cache_service.cache_service, 'get', return_value=None)
+    mocker.patch.object(cache_service.cache_service, 'get_stale', return_value=stale_file)
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "테스트고", "행정표준코드": "1234"})
+    mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        new_callable=mocker.AsyncMock,
+        side_effect=HTTPException(status_code=503, detail="Could not connect to NEIS server"),
+    )
+
+    # --- 실행 (Act) ---
+    response = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    # --- 단언 (Assert) ---
+    assert response.status_code == 200
+    assert response.text == "BEGIN:VCALENDAR\nEND:VCALENDAR"
+
+def test_calendar_variants_render_from_event_store(client, mocker, tmp_path):
+    """변형 캘린더는 이벤트 저장소의 학사일정으로 만들어 NEIS를 다시 호출하지 않는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mock_neis_data = {"SchoolSchedule": [{"row": [
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240301", "EVENT_NM": "삼일절", "SBTR_DD_SC_NM": "공휴일"},
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240304", "EVENT_NM": "1학년 수련회", "ONE_GRADE_EVENT_YN": "Y", "TW_GRADE_EVENT_YN": "N"},
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240305", "EVENT_NM": "2학년 현장체험", "ONE_GRADE_EVENT_YN": "N", "TW_GRADE_EVENT_YN": "Y"},
+    ]}]}
+    mock_fetch = mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        new_callable=mocker.AsyncMock,
+        return_value=ics_converter.ScheduleRows.from_response(mock_neis_data),
+    )
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "테스트고", "행정표준코드": "1234"})
+
+    # --- 실행 (Act) ---
+    # 저장된 학사일정이 없으므로 처음 한 번만 NEIS를 조회합니다.
+    grade_one = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234&GRADE=1&ALARM=false")
+    no_holidays = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234&EXCLUDE_HOLIDAYS=true")
+    default = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    # --- 단언 (Assert) ---
+    assert mock_fetch.await_count == 1
+    assert grade_one.status_code == 200
+    assert "SUMMARY:1학년 수련회" in grade_one.text
+    assert "2학년 현장체험" not in grade_one.text
+    assert "BEGIN:VALARM" not in grade_one.text
+    assert "삼일절" not in no_holidays.text
+    assert "BEGIN:VALARM" in no_holidays.text
+    assert default.text.count("BEGIN:VEVENT") == 3
+    # 변형마다 따로 캐시됩니다.
+    assert (tmp_path / "B10" / "1234.noalarm-grade1.ics").exists()
+    assert (tmp_path / "B10" / "1234.noholiday.ics").exists()
+
+def test_calendar_variant_keeps_etag_when_schedule_is_unchanged(client, mocker, tmp_path):
+    """원본 학사일정이 바뀌지 않았으면 만료된 변형 캘린더를 다시 만들지 않고 ETag를 유지하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mocker.patch.object(cache_service.cache_service, 'memory', None)
+    mock_neis_data = {"SchoolSchedule": [{"row": [
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240301", "EVENT_NM": "삼일절", "SBTR_DD_SC_NM": "공휴일"},
+        {"SCHUL_NM": "테스트고", "AA_YMD": "20240304", "EVENT_NM": "입학식"},
+    ]}]}
+    mock_fetch = mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        new_callable=mocker.AsyncMock,
+        return_value=ics_converter.ScheduleRows.from_response(mock_neis_data),
+    )
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "테스트고", "행정표준코드": "1234"})
+    url = "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234&EXCLUDE_HOLIDAYS=true"
+    first = client.get(url)
+
+    # --- 실행 (Act) ---
+    # 모든 캐시가 만료된 상황: 원본을 다시 받지만 내용은 같습니다.
+    mocker.patch.object(cache_service.cache_service, 'duration', timedelta(0))
+    second = client.get(url)
+
+    # --- 단언 (Assert) ---
+    assert mock_fetch.await_count == 2
+    assert second.status_code == 200
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.content == first.content
+
+def test_calendar_uses_fallback_name_for_blank_school_name(client, mocker, tmp_path):
+    """학교 정보의 학교명이 비어 있으면 일괄 생성과 같은 대체 이름으로 캘린더를 만드는지 테스트합니다."""
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mocker.patch.object(cache_service.cache_service, 'memory', None)
+    mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        new_callable=mocker.AsyncMock,
+        return_value=ics_converter.ScheduleRows.from_response(
+            {"SchoolSchedule": [{"row": [{"AA_YMD": "20240304", "EVENT_NM": "입학식"}]}]}
+        ),
+    )
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "", "행정표준코드": "1234"})
+
+    response = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    assert response.status_code == 200
+    assert "X-WR-CALNAME:Unknown School" in response.text
+
+def test_calendar_variant_rejects_invalid_grade(client):
+    """GRADE가 1~6이 아니면 422를 반환하는지 테스트합니다."""
+    response = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234&GRADE=7")
+
+    assert response.status_code == 422
+
+def test_merged_calendar_combines_schools(client, mocker, tmp_path):
+    """여러 학교를 합친 캘린더가 학교별로 구분된 UID를 갖고, 학교 순서와 관계없이 같은 키로 캐시되는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mocker.patch.dict(school_controller.settings, {"merged_calendar_concurrency": 1})
+    in_flight, max_in_flight = 0, 0
+
+    async def fetch(atpt_code, school_code):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        # 이름이 같은 두 학교에 같은 날 같은 행사가 있는 경우
+        return ics_converter.ScheduleRows.from_response({"SchoolSchedule": [{"row": [
+            {"SCHUL_NM": "중앙고", "AA_YMD": "20240301", "EVENT_NM": "입학식"},
+        ]}]})
+
+    mock_fetch = mocker.patch('app.controllers.school_controller.get_school_schedule', side_effect=fetch)
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "중앙고"})
+
+    # --- 실행 (Act) ---
+    response = client.get("/school/merged?SCHOOLS=C10:2222,B10:1111")
+    reordered = client.get("/school/merged?SCHOOLS=B10:1111,C10:2222,B10:1111")
+
+    # --- 단언 (Assert) ---
+    assert response.status_code == 200
+    assert reordered.text == response.text
+    assert mock_fetch.call_count == 2
+    assert max_in_flight == 1
+    cal = Calendar.from_ical(response.text)
+    events = list(cal.walk('vevent'))
+    assert [str(event['summary']) for event in events] == ["[중앙고] 입학식", "[중앙고] 입학식"]
+    assert len({str(event['uid']) for event in events}) == 2
+    assert len(list((tmp_path / "merged").glob("*.ics"))) == 1
+
+def test_merged_calendar_rejects_invalid_school_list(client):
+    """학교 목록 형식이 잘못되었으면 400을 반환하는지 테스트합니다."""
+    assert client.get("/school/merged?SCHOOLS=B10-1111").status_code == 400
+    assert client.get("/school/merged?SCHOOLS=,").status_code == 400
+
+def test_schedule_batch_returns_grouped_events(client, mocker, tmp_path):
+    """여러 학교의 학사일정을 묶인 이벤트 JSON으로 반환하고, 실패한 학교는 오류 객체로 표시하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    rows = {"SchoolSchedule": [{"row": [
+        {"SCHUL_NM": "중앙고", "AA_YMD": "20240722", "EVENT_NM": "여름방학"},
+        {"SCHUL_NM": "중앙고", "AA_YMD": "20240723", "EVENT_NM": "여름방학"},
+        {"SCHUL_NM": "중앙고", "AA_YMD": "20240727", "EVENT_NM": "토요휴업일"},
+    ]}]}
+    mock_fetch = mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        side_effect=lambda atpt, code: ics_converter.ScheduleRows.from_response(rows),
+    )
+    mocker.patch.object(
+        school_search.school_search_service, 'get_school',
+        side_effect=lambda atpt, code: {"학교명": "중앙고"} if code == 1111 else None,
+    )
+
+    # --- 실행 (Act) ---
+    response = client.post("/school/schedules", json={"SCHOOLS": ["B10:1111", "B10:9999"]})
+    again = client.post("/school/schedules", json={"SCHOOLS": ["B10:1111"]})
+
+    # --- 단언 (Assert) ---
+    assert response.status_code == 200
+    found, missing = response.json()["schools"]
+    assert found["SCHUL_NM"] == "중앙고"
+    assert found["events"] == [{
+        "name": "여름방학", "start_date": "2024-07-22", "end_date": "2024-07-23",
+        "description": "", "location": "중앙고",
+    }]
+    assert missing["SD_SCHUL_CODE"] == "9999"
+    assert missing["error"]["status_code"] == 404
+    # 두 번째 요청은 이벤트 저장소에서 읽으므로 NEIS를 다시 호출하지 않습니다.
+    assert again.json()["schools"][0]["events"] == found["events"]
+    assert mock_fetch.call_count == 1
+
+def test_schedule_batch_streams_ndjson(client, mocker, tmp_path):
+    """FORMAT이 ndjson이면 학교별 결과를 한 줄씩 반환하는지 테스트합니다."""
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        side_effect=lambda atpt, code: ics_converter.ScheduleRows.from_response({"SchoolSchedule": [{"row": [
+            {"SCHUL_NM": f"{code}고", "AA_YMD": "20240301", "EVENT_NM": "입학식"},
+        ]}]}),
+    )
+    mocker.patch.object(
+        school_search.school_search_service, 'get_school',
+        side_effect=lambda atpt, code: {"학교명": f"{code}고"},
+    )
+
+    response = client.post("/school/schedules", json={"SCHOOLS": ["B10:1111", "C10:2222"], "FORMAT": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["SCHUL_NM"] for line in lines) == ["1111고", "2222고"]
+    assert all(line["events"][0]["name"] == "입학식" for line in lines)
+
+def test_schedule_batch_rejects_too_many_schools(client, mocker):
+    """요청한 학교 수가 schedule_batch_max_schools를 넘으면 400을 반환하는지 테스트합니다."""
+    mocker.patch.dict(school_controller.settings, {"schedule_batch_max_schools": 1})
+    response = client.post("/school/schedules", json={"SCHOOLS": ["B10:1111", "B10:2222"]})
+    assert response.status_code == 400
+
+def test_requested_schools_are_warmed_before_expiry(client, mocker, tmp_path):
+    """요청된 학교가 캐시 예열 대상으로 기록되고, 예열하면 유효한 캐시도 NEIS에서 다시 받는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mocker.patch.object(cache_service.cache_service, 'memory', None)
+    # 방금 만든 캐시도 바로 예열 대상이 되도록 lead 구간을 유지 기간의 두 배로 둡니다.
+    warmer = cache_warmer.CacheWarmer(
+        cache_service.cache_service, interval_seconds=0, mode="all", rate=0,
+        lead_minutes=cache_service.cache_service.duration.total_seconds() / 60 * 2,
+    )
+    mocker.patch.object(school_controller, 'cache_warmer', warmer)
+    mock_fetch = mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        new_callable=mocker.AsyncMock,
+        return_value=ics_converter.ScheduleRows.from_response({"SchoolSchedule": [{"row": [
+            {"SCHUL_NM": "테스트고", "AA_YMD": "20240301", "EVENT_NM": "입학식"},
+        ]}]}),
+    )
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "테스트고"})
+
+    # --- 실행 (Act) ---
+    first = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+    client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234&ALARM=false")
+    warmer.start(school_controller.warm_school_calendar)
+    refreshed = asyncio.run(warmer.warm_due())
+    after = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    # --- 단언 (Assert) ---
+    assert warmer.due_schools() == [("B10", 1234)]
+    assert refreshed == 1
+    assert mock_fetch.await_count == 2
+    # 학사일정이 바뀌지 않았으므로 같은 파일(ETag)의 유효 기간만 연장됩니다.
+    assert after.headers["etag"] == first.headers["etag"]
+
+def test_unknown_or_invalid_school_leaves_no_files(client, mocker, tmp_path):
+    """알 수 없는 학교나 경로 조작 코드 요청이 캐시 디렉토리 안팎에 잠금 파일 등을 남기지 않는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    cache_dir = tmp_path / "cache"
+    mocker.patch.object(cache_service.cache_service, 'base_dir', cache_dir)
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value=None)
+    mock_fetch = mocker.patch('app.controllers.school_controller.get_school_schedule')
+
+    # --- 실행 (Act) ---
+    traversal = client.get("/school?ATPT_OFCDC_SC_CODE=../../escape_dir&SD_SCHUL_CODE=123")
+    unknown = client.get("/school?ATPT_OFCDC_SC_CODE=ZZZ&SD_SCHUL_CODE=999")
+    unknown_variant = client.get("/school?ATPT_OFCDC_SC_CODE=ZZZ&SD_SCHUL_CODE=999&ALARM=false")
+
+    # --- 단언 (Assert) ---
+    assert traversal.status_code == 400
+    assert unknown.status_code == 404
+    assert unknown_variant.status_code == 404
+    mock_fetch.assert_not_called()
+    assert list(tmp_path.rglob("*.lock")) == []
+    assert not (cache_dir / "ZZZ").exists()
+
+def test_only_successful_requests_count_as_warming_demand(client, mocker, tmp_path):
+    """없는 학교 요청은 캐시 예열 대상으로 기록되지 않아, 추적 목록이 차서 실제 학교가 빠지는 일이 없는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    warmer = cache_warmer.CacheWarmer(cache_service.cache_service, interval_seconds=0, max_tracked=1)
+    mocker.patch.object(school_controller, 'cache_warmer', warmer)
+    mocker.patch(
+        'app.controllers.school_controller.get_school_schedule',
+        new_callable=mocker.AsyncMock,
+        return_value=ics_converter.ScheduleRows.from_response({"SchoolSchedule": [{"row": [
+            {"SCHUL_NM": "테스트고", "AA_YMD": "20240301", "EVENT_NM": "입학식"},
+        ]}]}),
+    )
+    mocker.patch.object(
+        school_search.school_search_service, 'get_school',
+        side_effect=lambda atpt, code: {"학교명": "테스트고"} if int(code) == 1234 else None,
+    )
+
+    # --- 실행 (Act) ---
+    statuses = [client.get(f"/school?ATPT_OFCDC_SC_CODE=ZZZ&SD_SCHUL_CODE={code}").status_code for code in range(1, 4)]
+    batch = client.post("/school/schedules", json={"SCHOOLS": ["B10:9999"]})
+    merged = client.get("/school/merged?SCHOOLS=B10:9999,B10:8888")
+    found = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    # --- 단언 (Assert) ---
+    assert statuses == [404, 404, 404]
+    assert batch.json()["schools"][0]["error"]["status_code"] == 404
+    assert merged.status_code == 404
+    assert found.status_code == 200
+    assert warmer.stats()["tracked"] == 1
+    assert warmer.stats()["untracked"] == 0
+
+@pytest.fixture
+def cached_calendar(mocker, tmp_path):
+    """실제 캐시 서비스(임시 디렉토리)에 유효한 캘린더를 하나 저장해 두는 픽스처."""
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    content = ics_converter.convert_to_ics(
+        {"SchoolSchedule": [{"row": [{"SCHUL_NM": "테스트고", "AA_YMD": "20241225", "EVENT_NM": "크리스마스"}]}]},
+        "테스트고",
+    )
+    cache_service.cache_service.set("B10", 1234, content)
+    return content
+
+def test_get_school_calendar_sets_validators(client, cached_calendar):
+    """캐시된 캘린더 응답에 ETag, Last-Modified, Cache-Control 헤더가 포함되는지 테스트합니다."""
+    response = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    assert response.status_code == 200
+    assert response.text == cached_calendar
+    assert response.headers['etag'].startswith('"')
+    assert 'last-modified' in response.headers
+    max_age = int(response.headers['cache-control'].split("max-age=")[1])
+    assert 0 < max_age <= 7 * 24 * 60 * 60
+
+def test_get_school_calendar_if_none_match_returns_304(client, cached_calendar):
+    """If-None-Match가 현재 ETag와 같으면 본문 없이 304를 반환하는지 테스트합니다."""
+    etag = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234").headers['etag']
+
+    response = client.get(
+        "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234",
+        headers={"If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers['etag'] == etag
+
+    changed = client.get(
+        "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234",
+        headers={"If-None-Match": '"something-else"'},
+    )
+    assert changed.status_code == 200
+
+def test_get_school_calendar_if_modified_since_returns_304(client, cached_calendar):
+    """If-Modified-Since가 Last-Modified 이후이면 304를 반환하는지 테스트합니다."""
+    last_modified = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234").headers['last-modified']
+
+    response = client.get(
+        "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234",
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 304
+
+    older = client.get(
+        "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234",
+        headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"},
+    )
+    assert older.status_code == 200
+
+def test_refresh_with_unchanged_data_keeps_file_bytes(client, mocker, tmp_path):
+    """NEIS 데이터가 바뀌지 않았으면 캐시 파일을 다시 쓰지 않아 ETag가 유지되는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    mocker.patch.object(cache_service.cache_service, 'base_dir', tmp_path)
+    mock_neis_data = {"SchoolSchedule": [{"row": [{"SCHUL_NM": "테스트고", "AA_YMD": "20241225", "EVENT_NM": "크리스마스"}]}]}
+    mocker.patch('app.controllers.school_controller.get_school_schedule', new_callable=mocker.AsyncMock, return_value=ics_converter.ScheduleRows.from_response(mock_neis_data))
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "테스트고", "행정표준코드": "1234"})
+
+    first = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+    # 캐시가 만료된 상황을 만들어 다시 NEIS를 조회하게 합니다.
+    mocker.patch.object(cache_service.cache_service, 'get', return_value=None)
+    spy_convert = mocker.spy(school_controller, 'convert_to_ics')
+
+    # --- 실행 (Act) ---
+    second = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+
+    # --- 단언 (Assert) ---
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers['etag'] == first.headers['etag']
+    spy_convert.assert_not_called()
+
+def test_get_school_calendar_serves_precompressed_gzip(client, cached_calendar):
+    """Accept-Encoding: gzip 요청에 미리 압축된 변형을 그대로 보내는지 테스트합니다."""
+    response = client.get(
+        "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.headers['etag'].endswith('-gzip"')
+    # httpx가 자동으로 압축을 풀어 주므로 원본과 같아야 합니다.
+    assert response.text == cached_calendar
+
+def test_get_school_calendar_identity_encoding(client, cached_calendar):
+    """압축을 요청하지 않으면 원본 파일을 보내는지 테스트합니다."""
+    response = client.get(
+        "/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234",
+        headers={"Accept-Encoding": "identity"},
+    )
+
+    assert response.status_code == 200
+    assert 'content-encoding' not in response.headers
+    assert response.text == cached_calendar
+
+def test_calendar_being_built_by_other_worker_serves_previous_version(client, mocker, cached_calendar):
+    """다른 워커가 같은 캘린더를 생성 중(잠금 보유)이면 NEIS를 호출하지 않고 이전 버전을 반환하는지 테스트합니다."""
+    # --- 준비 (Arrange) ---
+    other_worker_lock = cache_service.cache_service.lock("B10", 1234)
+    assert other_worker_lock.acquire(blocking=False)
+    mocker.patch.object(cache_service.cache_service, 'get', return_value=None)
+    mock_fetch = mocker.patch('app.controllers.school_controller.get_school_schedule', new_callable=mocker.AsyncMock)
+    mocker.patch.object(school_search.school_search_service, 'get_school', return_value={"학교명": "테스트고", "행정표준코드": "1234"})
+
+    # --- 실행 (Act) ---
+    try:
+        response = client.get("/school?ATPT_OFCDC_SC_CODE=B10&SD_SCHUL_CODE=1234")
+    finally:
+        other_worker_lock.release()
+
+    # --- 단언 (Assert) ---
+    assert response.status_code == 200
+    assert response.text == cached_calendar
+    mock_fetch.assert_not_called()
+
+def test_reload_schools_requires_configured_token(client, mocker):
+    """관리 토큰이 설정되지 않았거나 틀리면 학교 데이터를 다시 불러오지 않는지 테스트합니다."""
+    from app.controllers import admin_controller
+    mock_reload = mocker.patch.object(school_search.school_search_service, 'reload')
+
+    settings_without_token = {k: v for k, v in admin_controller.settings.items() if k != 'admin_token'}
+    mocker.patch.dict(admin_controller.settings, settings_without_token, clear=True)
+    assert client.post("/admin/reload-schools", headers={"X-Admin-Token": "x"}).status_code == 404
+
+    mocker.patch.dict(admin_controller.settings, {'admin_token': 'secret'})
+    assert client.post("/admin/reload-schools").status_code == 403
+    assert client.post("/admin/reload-schools", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    mock_reload.assert_not_called()
+
+def test_reload_schools_returns_new_version(client, mocker):
+    """관리 엔드포인트가 학교 데이터를 다시 불러오고 새 버전을 반환하는지 테스트합니다."""
+    from app.controllers import admin_controller
+    mocker.patch.dict(admin_controller.settings, {'admin_token': 'secret'})
+    mocker.patch.object(school_search.school_search_service, 'reload', return_value={"schools": 3, "reloads": 1})
+
+    response = client.post("/admin/reload-schools", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert response.json() == {"schools": 3, "reloads": 1}
+
+def test_metrics_include_school_data_version(client):
+    """/metrics가 현재 학교 데이터 버전을 보여주는지 테스트합니다."""
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    school_data = response.json()["school_data"]
+    assert school_data["schools"] == len(school_search.school_search_service.index)
+    assert {"source", "source_sha256", "loaded_at", "reloads"} <= school_data.keys()
+
+def test_metrics_include_neis_guard_state(client):
+    """/metrics가 NEIS 요청 속도 제한, 재시도, 차단기 상태를 보여주는지 테스트합니다."""
+    metrics = client.get("/metrics").json()
+
+    assert metrics["neis_circuit_breaker"]["state"] == "closed"
+    assert {"rate", "burst", "throttled"} <= metrics["neis_rate_limiter"].keys()
+    assert {"retries", "exhausted"} <= metrics["neis_retry"].keys()
+
+def test_autocomplete_school(client, mocker):
+    """자동완성 API가 결과와 다음 페이지 cursor를 반환하는지 테스트합니다."""
+    items = [{"학교명": "테스트고", "시도교육청코드": "B10", "행정표준코드": "1234", "도로명주소": "서울"}]
+    mock_autocomplete = mocker.patch.object(
+        school_search.school_search_service, 'autocomplete', return_value=(items, 20)
+    )
+
+    response = client.get("/search/autocomplete", params={"ATPT_OFCDC_SC_CODE": "B10", "q": "테스트", "limit": 10, "cursor": "10"})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": items, "next_cursor": "20"}
+    mock_autocomplete.assert_called_once_with("B10", "테스트", limit=10, offset=10, match_mode="contains")
+
+def test_autocomplete_school_rejects_bad_paging(client):
+    """잘못된 cursor나 너무 큰 limit은 거부하는지 테스트합니다."""
+    params = {"ATPT_OFCDC_SC_CODE": "B10", "q": "고"}
+    assert client.get("/search/autocomplete", params={**params, "cursor": "abc"}).status_code == 400
+    assert client.get("/search/autocomplete", params={**params, "limit": 500}).status_code == 422
+
+def test_search_school_match_mode(client, mocker):
+    """학교 검색 API가 MATCH_MODE를 서비스에 전달하고, 잘못된 값은 거부하는지 테스트합니다."""
+    mock_search = mocker.patch.object(school_search.school_search_service, 'search', return_value=[])
+
+    response = client.post("/search", json={"ATPT_OFCDC_SC_CODE": "B10", "SCHUL_NM": "ㅅㅇㄱ", "MATCH_MODE": "choseong"})
+    assert response.status_code == 200
+    mock_search.assert_called_once_with(atpt_ofcdc_sc_code="B10", schul_nm="ㅅㅇㄱ", match_mode="choseong")
+
+    response = client.post("/search", json={"ATPT_OFCDC_SC_CODE": "B10", "SCHUL_NM": "서울", "MATCH_MODE": "fuzzy"})
+    assert response.status_code == 422
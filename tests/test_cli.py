@@ -0,0 +1,161 @@
+import asyncio
+import gzip
+import json
+import threading
+
+from app import cli
+from app.services.cache_gc import cache_gc
+
+def test_cli_gc_prints_report(mocker, capsys):
+    """gc 명령이 옵션을 적용해 가비지 컬렉션을 실행하고 결과를 출력하는지 테스트합니다."""
+    mocker.patch.object(cache_gc, 'max_age_days', None)
+    mocker.patch.object(cache_gc, 'max_total_mb', None)
+    mock_collect = mocker.patch.object(cache_gc.cache, 'collect_garbage', return_value={"reclaimed_bytes": 42})
+
+    cli.main(["gc", "--max-age-days", "14", "--max-mb", "1", "--dry-run"])
+
+    _, kwargs = mock_collect.call_args
+    assert kwargs["max_age"].days == 14
+    assert kwargs["max_total_bytes"] == 1024 * 1024
+    assert kwargs["dry_run"] is True
+    assert json.loads(capsys.readouterr().out) == {"reclaimed_bytes": 42}
+
+def test_cli_build_snapshot_writes_loadable_snapshot(tmp_path, capsys):
+    """build-snapshot 명령이 불러올 수 있는 스냅샷을 만드는지 테스트합니다."""
+    from app.services.school_snapshot import load_snapshot
+
+    csv_path = tmp_path / "schools.csv"
+    csv_path.write_bytes("시도교육청코드,학교명,영문학교명,행정표준코드\nB10,서울테스트초등학교,Seoul Test,1111\n".encode('cp949'))
+    output = tmp_path / "schools.snapshot"
+
+    cli.main(["build-snapshot", "--csv", str(csv_path), "--output", str(output)])
+
+    out = capsys.readouterr().out
+    # 색인 로드 메시지 뒤에 결과 JSON이 출력됩니다.
+    report = json.loads(out[out.index("{"):])
+    assert report["schools"] == 1
+    assert load_snapshot(output, csv_path).search('B10', '테스트')[0]['행정표준코드'] == 1111
+
+def test_cli_prefetch_fills_cache_for_every_school(mocker, tmp_path, capsys):
+    """prefetch 명령이 교육청 단위로 받은 일정을 학교별로 나눠 캐시에 저장하는지 테스트합니다."""
+    from app.controllers import school_controller
+    from app.services.cache_service import cache_service
+    from app.services.ics_converter import ScheduleRows
+    from app.services.school_search import school_search_service
+
+    rows = [
+        {"SD_SCHUL_CODE": "1111", "SCHUL_NM": "가나초", "AA_YMD": "20240301", "EVENT_NM": "입학식", "LOAD_DTM": "1"},
+        {"SD_SCHUL_CODE": "2222", "SCHUL_NM": "다라중", "AA_YMD": "20240302", "EVENT_NM": "개학식", "LOAD_DTM": "1"},
+        {"SD_SCHUL_CODE": "1111", "SCHUL_NM": "가나초", "AA_YMD": "20240725", "EVENT_NM": "방학식", "LOAD_DTM": "1"},
+        {"SD_SCHUL_CODE": "9999", "SCHUL_NM": "없는학교", "AA_YMD": "20240301", "EVENT_NM": "입학식", "LOAD_DTM": "1"},
+    ]
+    async def region_pages(atpt_code):
+        yield rows
+
+    mocker.patch.object(school_controller, 'iter_region_schedule_pages', side_effect=region_pages)
+    schools = {"1111": {"학교명": "가나초"}, "2222": {"학교명": "다라중"}}
+    mocker.patch.object(school_search_service, 'get_school', side_effect=lambda atpt, code: schools.get(str(code)))
+    mocker.patch.object(cache_service, 'base_dir', tmp_path)
+    mocker.patch.object(cache_service, 'memory', None)
+
+    cli.main(["prefetch", "B10"])
+
+    out = capsys.readouterr().out
+    # 캐시 저장 메시지 뒤에 결과 JSON이 출력됩니다.
+    report = json.loads(out[out.index("["):])[0]
+    assert report == {
+        "region": "B10", "requests": 1, "rows": 4, "schools": 3,
+        "written": 2, "unchanged": 0, "unknown": 1, "locked": 0,
+    }
+    ics = (tmp_path / "B10" / "1111.ics").read_text(encoding='utf-8')
+    assert "SUMMARY:입학식" in ics and "SUMMARY:방학식" in ics and "개학식" not in ics
+    assert (tmp_path / "B10" / "2222.ics").exists()
+    assert not (tmp_path / "B10" / "9999.ics").exists()
+
+    # 학교 하나를 개별 조회한 결과와 같은 데이터이므로 다시 변환하지 않습니다.
+    single = ScheduleRows.from_response({"SchoolSchedule": [{"head": [{"list_total_count": 2}]}, {"row": [rows[0], rows[2]]}]})
+    # 이벤트 저장소와 인덱스(SQLite) 작업은 이벤트 루프 스레드가 아닌 곳에서 실행되어야 합니다.
+    threads = []
+    save_events, touch = school_controller.save_school_events, cache_service.touch
+    mocker.patch.object(school_controller, 'save_school_events',
+                        side_effect=lambda *args: threads.append(threading.get_ident()) or save_events(*args))
+    mocker.patch.object(cache_service, 'touch',
+                        side_effect=lambda *args: threads.append(threading.get_ident()) or touch(*args))
+    _, changed = asyncio.run(school_controller.store_school_calendar("B10", 1111, "가나초", single))
+    assert changed is False
+    assert len(threads) == 2 and threading.get_ident() not in threads
+
+def test_cli_pregen_renders_every_school_and_resumes(mocker, tmp_path, capsys):
+    """pregen 명령이 로컬 NEIS 서버에서 받은 일정을 프로세스 풀로 변환해 캐시에 쓰고, 다시 실행하면 이어서 진행하는지 테스트합니다."""
+    from app.core.config import settings
+    from app.services import neis
+    from app.services import cache_service as cache_service_module
+    from app.services.cache_service import cache_service
+    from app.services.school_search import school_search_service
+    from tests.mock_neis import MOCK_API_KEY, MockNeisServer, make_rows
+
+    server = MockNeisServer(make_rows("B10", "1111", 30, "가나초") + make_rows("C10", "2222", 5, "다라중"))
+    mocker.patch.object(neis, '_client', server.client())
+    mocker.patch.dict(settings, {"neisKey": MOCK_API_KEY})
+    mocker.patch.object(neis.neis_rate_limiter, 'rate', 0)
+    mocker.patch.object(cache_service, 'memory', None)
+    schools = [
+        ("B10", "1111", {"학교명": "가나초"}),
+        ("C10", "2222", {"학교명": "다라중"}),
+        ("C10", "3333", {"학교명": "일정없는고"}),
+    ]
+    mocker.patch.object(school_search_service, 'iter_schools', side_effect=lambda regions: iter(schools))
+
+    # 압축은 작업 프로세스에서 하므로 이 프로세스의 compress는 호출되지 않아야 합니다.
+    spy_compress = mocker.spy(cache_service_module, 'compress')
+
+    cli.main(["pregen", "--cache-dir", str(tmp_path), "--processes", "2"])
+
+    out = capsys.readouterr().out
+    report = json.loads(out[out.index("{\n"):])
+    assert {key: report[key] for key in ("schools", "written", "skipped", "empty", "failed")} == {
+        "schools": 3, "written": 2, "skipped": 0, "empty": 1, "failed": 0,
+    }
+    assert report["schools_per_second"] is not None
+    ics = (tmp_path / "B10" / "1111.ics").read_text(encoding='utf-8')
+    assert ics.count("BEGIN:VEVENT") == 30 and "가나초 학사일정" in ics
+    assert spy_compress.call_count == 0
+    assert gzip.decompress((tmp_path / "B10" / "1111.ics.gz").read_bytes()) == (tmp_path / "B10" / "1111.ics").read_bytes()
+    assert (tmp_path / "C10" / "2222.ics").exists()
+    assert cache_service.events.get("C10", 2222).school_name == "다라중"
+
+    # 중단 후 다시 실행하면 이미 만든 캘린더는 NEIS를 호출하지 않고 건너뜁니다.
+    requests = len(server.requests)
+    mocker.patch.object(neis, '_client', server.client())
+    cli.main(["pregen", "--cache-dir", str(tmp_path), "--processes", "1"])
+
+    out = capsys.readouterr().out
+    report = json.loads(out[out.index("{\n"):])
+    assert report["skipped"] == 2 and report["empty"] == 1
+    assert len(server.requests) == requests + 1
+
+def test_cli_pregen_reads_local_dump(mocker, tmp_path, capsys):
+    """--dump로 준 로컬 학사일정 파일로 NEIS 없이 캘린더를 만드는지 테스트합니다."""
+    from app.services.cache_service import cache_service
+    from app.services.school_search import school_search_service
+    from tests.mock_neis import make_rows
+
+    rows = make_rows("B10", "1111", 3, "가나초")
+    dump = tmp_path / "schedule.ndjson"
+    dump.write_text(
+        json.dumps({"SchoolSchedule": [{"head": [{"list_total_count": 2}]}, {"row": rows[:2]}]}, ensure_ascii=False)
+        + "\n" + json.dumps(rows[2], ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    mocker.patch.object(cache_service, 'memory', None)
+    mocker.patch.object(
+        school_search_service, 'iter_schools', side_effect=lambda regions: iter([("B10", "1111", {"학교명": "가나초"})])
+    )
+    mock_fetch = mocker.patch('app.controllers.school_controller.get_school_schedule')
+
+    cli.main(["pregen", "B10", "--cache-dir", str(tmp_path / "cache"), "--dump", str(dump), "--processes", "1"])
+
+    out = capsys.readouterr().out
+    assert json.loads(out[out.index("{\n"):])["written"] == 1
+    assert (tmp_path / "cache" / "B10" / "1111.ics").read_text(encoding='utf-8').count("BEGIN:VEVENT") == 3
+    mock_fetch.assert_not_called()
@@ -0,0 +1,88 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from app.utils import file_utils
+from app.utils.file_utils import FileLock, atomic_write_bytes, fcntl
+
+def test_atomic_write_bytes_replaces_without_leftovers(tmp_path):
+    """원자적 쓰기가 기존 파일을 교체하고 임시 파일을 남기지 않는지 테스트합니다."""
+    target = tmp_path / "1234.ics"
+    target.write_bytes(b"old")
+
+    atomic_write_bytes(target, b"new content")
+
+    assert target.read_bytes() == b"new content"
+    assert [p.name for p in tmp_path.iterdir()] == ["1234.ics"]
+
+def test_atomic_write_bytes_keeps_old_file_on_failure(tmp_path, mocker):
+    """쓰기 도중 실패하면 기존 파일이 그대로 남고 임시 파일은 지워지는지 테스트합니다."""
+    target = tmp_path / "1234.ics"
+    target.write_bytes(b"old")
+    mocker.patch('os.replace', side_effect=OSError("disk full"))
+
+    with pytest.raises(OSError):
+        atomic_write_bytes(target, b"new")
+
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["1234.ics"]
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX 파일 권한을 확인합니다.")
+def test_atomic_write_bytes_applies_umask_or_keeps_existing_mode(tmp_path):
+    """새 파일은 0666 & ~umask 권한으로, 기존 파일은 원래 권한 그대로 저장되는지 테스트합니다. (mkstemp의 0600이 남지 않아야 합니다.)"""
+    new_file = tmp_path / "1234.ics"
+    existing = tmp_path / "5678.ics"
+    existing.write_bytes(b"old")
+    existing.chmod(0o640)
+
+    atomic_write_bytes(new_file, b"new")
+    atomic_write_bytes(existing, b"new")
+
+    assert stat.S_IMODE(new_file.stat().st_mode) == 0o666 & ~file_utils._UMASK
+    assert stat.S_IMODE(existing.stat().st_mode) == 0o640
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl이 없는 환경에서는 프로세스 간 잠금을 사용하지 않습니다.")
+def test_file_lock_is_exclusive(tmp_path):
+    """같은 잠금 파일은 한 번에 하나만 잠글 수 있는지 테스트합니다. (flock은 열린 파일 단위로 동작합니다.)"""
+    first = FileLock(tmp_path / "key.lock")
+    second = FileLock(tmp_path / "key.lock")
+
+    assert first.acquire(blocking=False)
+    assert not second.acquire(blocking=False)
+    first.release()
+    assert second.acquire(blocking=False)
+    second.release()
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl이 없는 환경에서는 프로세스 간 잠금을 사용하지 않습니다.")
+def test_file_lock_unlink_does_not_let_two_holders_in(tmp_path):
+    """잠금 파일이 지워지는 동안 기다리던 쪽은 새 잠금 파일로 다시 잠가, 나중에 온 쪽과 동시에 잠금을 얻지 않는지 테스트합니다."""
+    holder = FileLock(tmp_path / "key.lock")
+    waiter = FileLock(tmp_path / "key.lock")
+    holder.acquire()
+    thread = threading.Thread(target=waiter.acquire, daemon=True)
+    thread.start()
+    time.sleep(0.1)  # waiter가 지워질 파일에서 잠금을 기다리도록 합니다.
+
+    holder.unlink()
+    holder.release()
+    thread.join(timeout=5)
+
+    assert waiter.locked
+    assert (tmp_path / "key.lock").exists()
+    assert not FileLock(tmp_path / "key.lock").acquire(blocking=False)
+    waiter.release()
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl이 없는 환경에서는 프로세스 간 잠금을 사용하지 않습니다.")
+async def test_file_lock_acquire_async_times_out(tmp_path):
+    """잠금을 얻지 못하면 timeout 후 False를 반환하는지 테스트합니다."""
+    holder = FileLock(tmp_path / "key.lock")
+    holder.acquire()
+    waiter = FileLock(tmp_path / "key.lock")
+
+    assert await waiter.acquire_async(timeout=0.05, poll_interval=0.01) is False
+    holder.release()
+    assert await waiter.acquire_async(timeout=0.05, poll_interval=0.01) is True
+    waiter.release()
@@ -0,0 +1,24 @@
+from app.utils.hangul_utils import choseong, decompose
+
+def test_choseong():
+    """한글 음절을 초성으로 바꾸고 나머지 문자는 그대로 두는지 테스트합니다."""
+    assert choseong("서울고등학교") == "ㅅㅇㄱㄷㅎㄱ"
+    assert choseong("까치산초(분교)") == "ㄲㅊㅅㅊ(ㅂㄱ)"
+    assert choseong("KAIST 부설") == "KAIST ㅂㅅ"
+
+def test_decompose_splits_compound_jamo():
+    """겹모음과 겹받침을 낱자로 풀어 쓰고 된소리는 그대로 두는지 테스트합니다."""
+    assert decompose("괜") == "ㄱㅗㅐㄴ"
+    assert decompose("닭") == "ㄷㅏㄹㄱ"
+    assert decompose("의쌍") == "ㅇㅡㅣㅆㅏㅇ"
+    # 따로 입력된 겹자모도 같은 방식으로 풉니다.
+    assert decompose("ㅘㄳ") == "ㅗㅏㄱㅅ"
+    assert decompose("A1 ") == "A1 "
+
+def test_decompose_matches_syllables_being_composed():
+    """입력 중인 음절(받침이 다음 글자의 초성이 될 수 있음)도 완성된 이름의 자모에 포함되는지 테스트합니다."""
+    assert decompose("서울곧") in decompose("서울고등학교")
+    assert decompose("학굑") in decompose("학교기본")
+    assert decompose("서울과") in decompose("서울과학고")
+    assert decompose("서울괗") in decompose("서울과학고")
+    assert decompose("서울곤") not in decompose("서울고등학교")
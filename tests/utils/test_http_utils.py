@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from app.utils.http_utils import choose_encoding, etag_matches, format_http_date, is_not_modified
+
+def test_format_http_date():
+    """datetime을 HTTP 날짜 형식으로 변환하는지 테스트합니다."""
+    dt = datetime(2024, 1, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    assert format_http_date(dt) == "Mon, 01 Jan 2024 09:30:15 GMT"
+
+def test_etag_matches_weak_comparison_and_lists():
+    """If-None-Match의 목록, 약한 ETag(W/), '*'를 올바르게 비교하는지 테스트합니다."""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches('*', '"b"')
+    assert not etag_matches('"a"', '"b"')
+
+def test_is_not_modified_prefers_if_none_match():
+    """If-None-Match가 있으면 If-Modified-Since를 무시하는지 테스트합니다."""
+    last_modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    headers = {
+        "if-none-match": '"other"',
+        "if-modified-since": "Tue, 02 Jan 2024 00:00:00 GMT",
+    }
+    assert not is_not_modified(headers, '"current"', last_modified)
+    assert is_not_modified({"if-modified-since": "Tue, 02 Jan 2024 00:00:00 GMT"}, '"current"', last_modified)
+    assert not is_not_modified({"if-modified-since": "not a date"}, '"current"', last_modified)
+
+def test_choose_encoding():
+    """Accept-Encoding의 q 값과 서버 선호 순서에 따라 인코딩을 고르는지 테스트합니다."""
+    supported = ("br", "gzip")
+    assert choose_encoding("gzip, deflate, br", supported) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert choose_encoding("br;q=0, gzip", supported) == "gzip"
+    assert choose_encoding("*", supported) == "br"
+    assert choose_encoding("identity", supported) is None
+    assert choose_encoding(None, supported) is None